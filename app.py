@@ -1,51 +1,216 @@
 import streamlit as st
 import os
-from pdf_summary_converter import convert_pdf_to_txt
-import tempfile
+import uuid
+from conversion_profile import ConversionProfile
+from job_queue import CANCELLED, DONE, FAILED, FINISHED, QUEUED, JobQueue, convert_job, convert_uploads_job
+from metrics import REGISTRY, start_http_server
+from pdf_summary_converter import PREVIEW_TABLE_PAGES
+from preload import preload_in_background
 
 st.set_page_config(page_title="PDF 작업환경측정 요약 프로그램", layout="wide")
 
 st.title("📄 작업환경측정 결과 PDF 요약 변환기")
 st.markdown("""
 PDF 파일을 업로드하면 **분포실태 조사용 텍스트 파일**형식으로 요약 변환해줍니다.
+여러 파일을 한 번에 올리면 동시에 변환해 ZIP 하나로 내려받을 수 있습니다.
 """)
 
-uploaded_file = st.file_uploader("PDF 파일을 선택하세요", type=["pdf"])
+uploaded_files = st.file_uploader("PDF 파일을 선택하세요 (여러 개 선택 가능)", type=["pdf"],
+                                  accept_multiple_files=True) or []
+uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+
+# 수백 페이지 보고서에서 메모리 부족으로 종료되는 경우 사용 (조금 느려짐)
+LOW_MEMORY_LABEL = "저메모리 모드 (수백 페이지 PDF)"
+# 진행 중인 작업이 있을 때 상태를 다시 읽는 주기(초)
+POLL_SECONDS = 1.0
+STATUS_LABELS = {QUEUED: "대기 중", "running": "변환 중", DONE: "완료", FAILED: "실패", CANCELLED: "취소됨"}
+
+@st.cache_resource
+def _job_queue():
+    # 변환은 서버 프로세스 전체가 공유하는 큐에서 실행 (다시 실행/다른 세션과 무관하게 계속 진행)
+    # PDF 모듈은 첫 화면을 그리는 동안 백그라운드에서 미리 읽어 첫 변환이 import를 기다리지 않게 함
+    preload_in_background()
+    queue = JobQueue()
+    # 변환 수/실패/시간 지표: PDF_SUMMARY_METRICS_PORT를 지정하면 http://127.0.0.1:<포트>/metrics
+    REGISTRY.add_collector(queue.metric_families)
+    start_http_server()
+    return queue
+
+job_queue = _job_queue()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "job_ids" not in st.session_state:
+    st.session_state.job_ids = []  # 이 세션이 넣은 작업 ID (결과를 내려받을 때까지 유지)
+
+def _submit(label, target, *args, **kwargs):
+    job_id = job_queue.submit(st.session_state.session_id, label, target, *args, **kwargs)
+    st.session_state.job_ids.append(job_id)
+
+def _forget(job_id):
+    # 결과를 내려받았거나 닫은 작업은 큐에서도 지움 (실행 중이면 취소)
+    job_queue.release(job_id)
+    if job_id in st.session_state.job_ids:
+        st.session_state.job_ids.remove(job_id)
+
+def _zip_names(files):
+    """ZIP 안의 결과 파일 이름 (<PDF 이름>_분포실태_결과.txt, 같은 이름은 번호를 붙여 구분)."""
+    names, used = [], set()
+    for f in files:
+        stem = os.path.splitext(os.path.basename(f.name))[0]
+        name = f"{stem}_분포실태_결과.txt"
+        n = 2
+        while name in used:
+            name = f"{stem}_{n}_분포실태_결과.txt"
+            n += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+if len(uploaded_files) > 1:
+    st.info(f"파일 {len(uploaded_files)}개가 업로드되었습니다. 동시에 변환합니다.")
+
+    force_refresh = st.checkbox("캐시 사용 안 함 (강제 재변환)", value=False)
+    low_memory = st.checkbox(LOW_MEMORY_LABEL, value=False)
+    cpu_count = os.cpu_count() or 1
+    workers = st.slider("동시 변환 수", min_value=1, max_value=max(cpu_count, 2),
+                        value=min(4, cpu_count))
+
+    if st.button("전체 변환 시작"):
+        # 업로드 객체는 다음 실행에서 사라질 수 있으므로 바이트를 복사해 작업에 넘김
+        _submit(f"파일 {len(uploaded_files)}개", convert_uploads_job,
+                [f.getvalue() for f in uploaded_files], [f.name for f in uploaded_files],
+                _zip_names(uploaded_files), workers=workers, use_cache=not force_refresh, low_memory=low_memory)
 
 if uploaded_file is not None:
     st.info("파일이 업로드되었습니다. 변환을 준비합니다.")
     
-    # 임시 파일로 저장 (pdfplumber가 경로를 요구하는 경우가 많음, 혹은 객체 직접 지원 확인)
-    # pdfplumber.open()은 file-like object도 지원하므로 바로 넘겨도 되지만, 
-    # 로직상 path를 썼다면 임시파일 생성 필요.
-    # 여기서는 pdf_summary_converter.py가 path를 받도록 되어있으므로 임시파일 생성.
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_path = tmp_file.name
-
-    try:
-        if st.button("변환 시작"):
-            with st.spinner("PDF 분석 및 변환 중..."):
-                result_text = convert_pdf_to_txt(tmp_path)
-            
-            st.success("변환이 완료되었습니다!")
-            
-            # 결과 미리보기
-            st.subheader("📝 변환 결과 미리보기")
-            st.text_area("결과 내용", result_text, height=400)
-            
-            # 다운로드 버튼
-            st.download_button(
-                label="📥 텍스트 파일 다운로드",
-                data=result_text,
-                file_name="분포실태_결과.txt",
-                mime="text/plain"
-            )
-            
-    except Exception as e:
-        st.error(f"오류가 발생했습니다: {e}")
-    finally:
-        # 임시 파일 삭제
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+    # 업로드된 파일 내용을 그대로 넘김 (임시 파일 없이 메모리에서 바로 변환)
+
+    # 같은 PDF(내용 기준)는 디스크 캐시에서 바로 결과를 가져옴
+    force_refresh = st.checkbox("캐시 사용 안 함 (강제 재변환)", value=False)
+    # 느린 변환의 원인 분석용 (끄면 측정 코드가 실행되지 않음)
+    show_profile = st.checkbox("단계별 소요 시간 측정", value=False)
+    low_memory = st.checkbox(LOW_MEMORY_LABEL, value=False)
+    # 올바른 보고서인지 먼저 확인: 앞쪽 표 페이지만 분석한 부분 결과를 보여주고 전체 변환은 계속 진행
+    quick_preview = st.checkbox(f"빠른 미리보기 (앞 {PREVIEW_TABLE_PAGES}개 표 페이지 먼저 보기)", value=True)
+
+    if st.button("변환 시작"):
+        profile = ConversionProfile(cprofile=True) if show_profile else None
+        _submit(uploaded_file.name, convert_job, uploaded_file.getvalue(),
+                use_cache=not force_refresh, low_memory=low_memory, profile=profile, preview=quick_preview)
+
+def _show_profile(profile, cached):
+    with st.expander("⏱ 단계별 소요 시간", expanded=True):
+        if cached:
+            st.caption("캐시된 결과라 측정값이 없습니다. '캐시 사용 안 함'을 켜고 다시 변환하세요.")
+            return
+        report = profile.to_dict()
+        st.write(f"전체 {report['total']:.3f}초")
+        st.table([{"단계": name, "초": sec,
+                   "비율": f"{sec / report['total']:.0%}" if report["total"] else ""}
+                  for name, sec in report["stages"].items()])
+        st.table([{"항목": k, "값": v} for k, v in sorted(report["counters"].items())])
+        st.markdown("**페이지별**")
+        st.dataframe(report["pages"], hide_index=True)
+        if profile.cprofile_error:
+            st.caption(f"cProfile을 켤 수 없어 단계별 시간만 측정했습니다: {profile.cprofile_error}")
+            return
+        st.markdown("**cProfile 상위 함수 (누적 시간순)**")
+        st.dataframe([{"함수": f, "호출": nc, "자체(초)": round(tt, 4), "누적(초)": round(ct, 4)}
+                      for f, nc, tt, ct in profile.top_functions()], hide_index=True)
+        st.download_button(
+            label="cProfile 결과 다운로드 (.pstats)",
+            data=profile.stats_bytes(),
+            file_name="pdf_summary.pstats",
+            mime="application/octet-stream",
+        )
+
+def _show_result(job):
+    result = job.result
+    if "zip" in result:
+        # 여러 파일 변환: 파일별 상태와 ZIP 하나
+        if result["failed"]:
+            st.warning(f"{len(result['rows']) - result['failed']}개 변환, {result['failed']}개 실패")
+        else:
+            st.success(f"{len(result['rows'])}개 파일 변환이 완료되었습니다! ({job.elapsed():.1f}초)")
+        st.dataframe(result["rows"], hide_index=True)
+        st.download_button(
+            label="📦 전체 결과 ZIP 다운로드",
+            data=result["zip"],
+            file_name="분포실태_결과.zip",
+            mime="application/zip",
+            key=f"download-{job.id}",
+            on_click=_forget,
+            args=(job.id,),
+        )
+        return
+
+    st.success("변환이 완료되었습니다!")
+    if result["reused_pages"]:
+        st.caption(f"내용이 바뀌지 않은 페이지 {result['reused_pages']}개는 이전 변환 결과를 재사용했습니다.")
+    if result["peak_rss_mb"] is not None:
+        st.caption(f"최대 메모리 사용량(RSS): {result['peak_rss_mb']} MB")
+    if result["profile"] is not None:
+        _show_profile(result["profile"], result["cached"])
+
+    # 결과 미리보기
+    st.subheader("📝 변환 결과 미리보기")
+    st.text_area("결과 내용", result["text"], height=400, key=f"preview-{job.id}")
+
+    # 다운로드 버튼 (내려받으면 서버에 보관하던 결과를 지움)
+    st.download_button(
+        label="📥 텍스트 파일 다운로드",
+        data=result["text"],
+        file_name="분포실태_결과.txt",
+        mime="text/plain",
+        key=f"download-{job.id}",
+        on_click=_forget,
+        args=(job.id,),
+    )
+
+def _show_job(job):
+    with st.container(border=True):
+        st.markdown(f"**{job.label}** · {STATUS_LABELS[job.status]}")
+        if job.status not in FINISHED:
+            st.progress(job.progress, text=job.message)
+            if isinstance(job.preview, list):
+                st.dataframe(job.preview, hide_index=True)
+            elif job.preview:
+                st.text(job.preview)
+            st.button("취소", key=f"cancel-{job.id}", on_click=job_queue.cancel, args=(job.id,))
+        elif job.status == DONE:
+            _show_result(job)
+        else:
+            if job.status == FAILED:
+                st.error(f"오류가 발생했습니다: {job.error}")
+            else:
+                st.warning("변환을 취소했습니다.")
+            st.button("닫기", key=f"close-{job.id}", on_click=_forget, args=(job.id,))
+
+def _session_jobs():
+    jobs = []
+    for job_id in list(st.session_state.job_ids):
+        job = job_queue.get(job_id)
+        if job is None:
+            st.session_state.job_ids.remove(job_id)  # 보관 시간이 지나 지워진 작업
+        else:
+            jobs.append(job)
+    return jobs
+
+# 진행 중인 작업이 있으면 이 영역만 주기적으로 다시 그려 진행률을 보여줌 (버튼 실행을 막지 않음)
+active = any(job.status not in FINISHED for job in _session_jobs())
+
+@st.fragment(run_every=POLL_SECONDS if active else None)
+def _jobs_panel():
+    jobs = _session_jobs()
+    if not jobs:
+        return
+    st.subheader("변환 작업")
+    stats = job_queue.stats()
+    st.caption(f"서버 전체: 실행 중 {stats['running']}/{stats['max_running']}개, 대기 {stats['queued']}개")
+    for job in reversed(jobs):
+        _show_job(job)
+    if active and all(job.status in FINISHED for job in jobs):
+        st.rerun()  # 모두 끝났으면 전체를 다시 그려 주기적 갱신을 멈춤
+
+_jobs_panel()
@@ -0,0 +1,309 @@
+"""작업환경측정 결과 PDF 여러 개를 한 번에 변환하는 배치 명령.
+
+    python batch_convert.py 입력폴더 -o 출력폴더 [-j 4]
+    python batch_convert.py "reports/**/*.pdf" -o out
+
+입력마다 <파일명>.txt를 만들고, 출력 폴더의 manifest.json에 파일별 해시/상태/
+소요시간/페이지 수를 기록합니다. 중간에 끊겨도 다시 실행하면 이미 변환된
+파일(해시가 같고 결과 파일이 있는 경우)은 건너뜁니다.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from metrics import REGISTRY, record_conversion
+from pdf_summary_converter import PAGE_FILTERS, TABLE_ENGINES, fix_console_encoding, iter_convert_pdf
+from preload import START_METHODS, mp_context
+from result_cache import PageCache, ResultCache, pdf_digest
+
+MANIFEST_NAME = "manifest.json"
+# iter_convert_uploads()가 변환을 기다리는 동안 cancel을 부르는 간격(초)
+CANCEL_POLL_SECONDS = 0.2
+
+def find_pdfs(inputs):
+    """폴더/글롭/파일 경로 목록을 PDF 파일 목록으로 펼칩니다 (중복 제거, 정렬)."""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                found.extend(os.path.join(root, f) for f in files if f.lower().endswith(".pdf"))
+        elif os.path.isfile(item):
+            found.append(item)
+        else:
+            found.extend(p for p in glob.glob(item, recursive=True)
+                         if os.path.isfile(p) and p.lower().endswith(".pdf"))
+    return sorted(set(os.path.abspath(p) for p in found))
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(out_dir, manifest):
+    _write_atomic(os.path.join(out_dir, MANIFEST_NAME),
+                  json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True))
+
+def convert_one(pdf_path, out_path, page_filter="content", low_memory=False, engine="tables", page_cache=None):
+    """(프로세스 풀 워커) PDF 하나를 변환해 out_path에 쓰고 manifest 항목을 돌려줍니다.
+
+    page_cache(PageCache)를 넘기면 개정판처럼 일부 페이지만 바뀐 PDF는 바뀐 페이지만 표를 추출합니다.
+    """
+    start = time.perf_counter()
+    entry = {"output": out_path}
+    try:
+        for event in iter_convert_pdf(pdf_path, page_filter=page_filter, low_memory=low_memory, engine=engine,
+                                      page_cache=page_cache):
+            if event["type"] == "done":
+                _write_atomic(out_path, event["text"])
+                entry["pages"] = event["pages"]
+                entry["skipped_pages"] = event["skipped_pages"]
+                entry["reused_pages"] = event["reused_pages"]
+                entry["tier_pages"] = event["tier_pages"]
+                entry["peak_rss_mb"] = event["peak_rss_mb"]
+        entry["status"] = "ok"
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["duration"] = round(time.perf_counter() - start, 3)
+    return entry
+
+def convert_data(data, page_filter="content", low_memory=False, engine="tables", page_cache=None):
+    """(프로세스 풀 워커) 메모리의 PDF 바이트 하나를 변환해 결과 dict를 돌려줍니다.
+
+    report는 Report.to_bytes()로 압축해서 돌려주므로 프로세스 간 전송량이 작습니다.
+    """
+    start = time.perf_counter()
+    entry = {}
+    try:
+        for event in iter_convert_pdf(data, page_filter=page_filter, low_memory=low_memory, engine=engine,
+                                      page_cache=page_cache):
+            if event["type"] == "done":
+                entry["text"] = event["text"]
+                entry["report"] = event["report"].to_bytes()
+                entry["pages"] = event["pages"]
+                entry["skipped_pages"] = event["skipped_pages"]
+                entry["reused_pages"] = event["reused_pages"]
+                entry["peak_rss_mb"] = event["peak_rss_mb"]
+        entry["status"] = "ok"
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["duration"] = round(time.perf_counter() - start, 3)
+    return entry
+
+def record_entry(source, entry, use_cache=True):
+    """convert_one()/convert_data()/iter_convert_uploads()의 entry 하나를 metrics에 기록합니다.
+
+    use_cache=False이면 캐시를 조회하지 않았으므로 캐시 적중/실패로 세지 않습니다.
+    """
+    error = entry["error"].split(":", 1)[0] if entry["status"] != "ok" else None
+    record_conversion(source, entry["status"], entry["duration"], pages=entry.get("pages"),
+                      cached=entry.get("cached") if use_cache else None, error=error)
+
+def iter_convert_uploads(files, workers=None, use_cache=True, cache=None, page_filter="content", low_memory=False,
+                         engine="tables", cancel=None):
+    """PDF 바이트(또는 파일 객체) 목록을 프로세스 풀에서 동시에 변환해 끝나는 순서대로 (index, entry)를 돌려줍니다.
+
+    풀에는 한 번에 workers * 2개까지만 보내므로 업로드 전체를 한꺼번에 복사하지 않습니다.
+    캐시에 있는 파일은 풀에 보내지 않고 바로 돌려주고(entry["cached"] = True),
+    새로 변환한 결과는 캐시에 저장합니다. entry는 convert_data()와 같은 형식입니다.
+    use_cache=True 이면 페이지 캐시(PageCache)도 사용해 개정판 PDF는 바뀐 페이지만 추출합니다.
+    cancel은 변환을 기다리는 동안 CANCEL_POLL_SECONDS마다 부르는 함수입니다 (예외를 내면 멈춤).
+    끝까지 돌기 전에 멈추거나 닫으면(close) 아직 시작하지 않은 변환은 버리고, 실행 중인 변환이
+    끝나기를 기다리지 않고 바로 돌아갑니다.
+    """
+    cache = cache or ResultCache()
+    page_cache = PageCache() if use_cache else None
+    workers = workers or os.cpu_count() or 1
+    todo = []
+    for index, source in enumerate(files):
+        key = pdf_digest(source)
+        entry = cache.get(key) if use_cache else None
+        if entry is not None:
+            yield index, {"status": "ok", "cached": True, "duration": 0.0, "text": entry["text"],
+                          "pages": entry.get("pages", 0)}
+            continue
+        todo.append((index, source, key))
+    if not todo:
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=mp_context())
+    finished = False
+    try:
+        pending = {}
+        queue = iter(todo)
+        while True:
+            while len(pending) < workers * 2:
+                item = next(queue, None)
+                if item is None:
+                    break
+                index, source, key = item
+                data = source if isinstance(source, bytes) else source.getvalue()
+                pending[executor.submit(convert_data, data, page_filter, low_memory, engine,
+                                        page_cache)] = (index, key)
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=CANCEL_POLL_SECONDS if cancel is not None else None,
+                           return_when=FIRST_COMPLETED)
+            if cancel is not None:
+                cancel()
+            for future in done:
+                index, key = pending.pop(future)
+                entry = future.result()
+                if entry["status"] == "ok":
+                    cache.put(key, {"report": entry["report"], "text": entry["text"], "pages": entry["pages"]})
+                entry["cached"] = False
+                yield index, entry
+        finished = True
+    finally:
+        # 취소/close로 중간에 끝나면 대기 중인 변환은 버리고 실행 중인 변환을 기다리지 않음
+        executor.shutdown(wait=finished, cancel_futures=not finished)
+
+def _output_path(pdf_path, out_dir, used_names, digest):
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    name = stem + ".txt"
+    if name in used_names:
+        # 다른 폴더의 같은 파일명은 해시 앞부분으로 구분 (내용까지 같은 사본이면 번호를 더 붙임)
+        name = f"{stem}_{digest[:8]}.txt"
+        n = 2
+        while name in used_names:
+            name = f"{stem}_{digest[:8]}_{n}.txt"
+            n += 1
+    used_names.add(name)
+    return os.path.join(out_dir, name)
+
+def run_batch(inputs, out_dir, workers=None, force=False, page_filter="content", low_memory=False, engine="tables",
+              page_cache=None, log=print, start_method=None):
+    """배치 변환을 실행하고 요약 통계 dict를 돌려줍니다.
+
+    page_cache(PageCache)를 넘기면 이전에 변환한 보고서와 내용이 같은 페이지는 표 추출을 건너뜁니다.
+    start_method는 워커 프로세스 시작 방식입니다 (preload.START_METHODS, 기본은 환경변수/플랫폼 기본값).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    pdfs = find_pdfs(inputs)
+    manifest = load_manifest(out_dir)
+
+    todo = []
+    skipped = 0
+    used_names = set()
+    for pdf_path in pdfs:
+        digest = pdf_digest(pdf_path)
+        prev = manifest.get(pdf_path)
+        if (not force and prev and prev.get("status") == "ok" and prev.get("sha256") == digest
+                and os.path.exists(prev.get("output", ""))):
+            used_names.add(os.path.basename(prev["output"]))
+            skipped += 1
+            continue
+        todo.append((pdf_path, digest))
+
+    log(f"입력 {len(pdfs)}개 중 {skipped}개는 이미 변환됨, {len(todo)}개 변환 시작")
+
+    stats = {"files": len(pdfs), "skipped": skipped, "converted": 0, "failed": 0, "pages": 0,
+             "skipped_pages": 0, "reused_pages": 0, "tier_pages": {}, "peak_rss_mb": None}
+    started = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context(start_method)) as executor:
+            futures = {}
+            for pdf_path, digest in todo:
+                out_path = _output_path(pdf_path, out_dir, used_names, digest)
+                futures[executor.submit(convert_one, pdf_path, out_path, page_filter, low_memory,
+                                        engine, page_cache)] = (pdf_path, digest)
+
+            for done_count, future in enumerate(as_completed(futures), 1):
+                pdf_path, digest = futures[future]
+                entry = future.result()
+                entry["sha256"] = digest
+                manifest[pdf_path] = entry
+                record_entry("batch", entry)
+                # 완료될 때마다 manifest를 저장해 중단 후 재개할 수 있게 함
+                save_manifest(out_dir, manifest)
+
+                if entry["status"] == "ok":
+                    stats["converted"] += 1
+                    stats["pages"] += entry.get("pages", 0)
+                    stats["skipped_pages"] += entry.get("skipped_pages", 0)
+                    stats["reused_pages"] += entry.get("reused_pages", 0)
+                    for tier, n in entry.get("tier_pages", {}).items():
+                        stats["tier_pages"][tier] = stats["tier_pages"].get(tier, 0) + n
+                    if entry.get("peak_rss_mb") is not None:
+                        # 워커 프로세스별 최대 RSS 중 가장 큰 값
+                        stats["peak_rss_mb"] = max(stats["peak_rss_mb"] or 0, entry["peak_rss_mb"])
+                    log(f"[{done_count}/{len(todo)}] OK   {pdf_path} "
+                        f"({entry.get('pages', 0)}p, 재사용 {entry.get('reused_pages', 0)}p, {entry['duration']:.2f}s, "
+                        f"peak RSS {entry.get('peak_rss_mb')} MB)")
+                else:
+                    stats["failed"] += 1
+                    log(f"[{done_count}/{len(todo)}] FAIL {pdf_path}: {entry['error']}")
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed"] = round(elapsed, 3)
+    stats["files_per_sec"] = round(stats["converted"] / elapsed, 3) if elapsed > 0 else 0.0
+    stats["pages_per_sec"] = round(stats["pages"] / elapsed, 3) if elapsed > 0 else 0.0
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="작업환경측정 결과 PDF 일괄 변환")
+    parser.add_argument("inputs", nargs="+", help="PDF 파일, 폴더 또는 글롭 패턴 (예: 'reports/**/*.pdf')")
+    parser.add_argument("-o", "--out-dir", default="분포실태_결과", help="결과 .txt와 manifest.json을 쓸 폴더")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="동시 변환 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="manifest를 무시하고 모두 다시 변환")
+    parser.add_argument("--page-filter", choices=PAGE_FILTERS, default="content",
+                        help="표 없는 페이지 사전 필터 (기본: content)")
+    parser.add_argument("--strict", action="store_true", help="사전 필터 없이 모든 페이지 검사 (--page-filter off)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="수백 페이지 PDF용 저메모리 모드 (페이지 창 단위로 처리, 조금 느림)")
+    parser.add_argument("--engine", choices=TABLE_ENGINES, default="tables",
+                        help="표 추출 엔진 (rows: 격자 표를 직접 행으로 나누는 빠른 엔진, 결과는 같음 / "
+                             "tiered: 괘선만으로 먼저 추출하고 확인에 실패한 페이지만 rows로 다시 추출)")
+    parser.add_argument("--no-page-cache", action="store_true",
+                        help="페이지 캐시를 쓰지 않음 (기본: 내용이 같은 페이지는 이전 추출 결과 재사용)")
+    parser.add_argument("--start-method", choices=START_METHODS, default=None,
+                        help="워커 프로세스 시작 방식 (forkserver: PDF 모듈을 읽어 둔 서버에서 워커를 fork, "
+                             "기본: 환경변수 PDF_SUMMARY_START_METHOD 또는 auto)")
+    parser.add_argument("--metrics-textfile", default=REGISTRY.textfile,
+                        help="파일마다 Prometheus 지표를 이 파일에 갱신 (node_exporter textfile collector용, "
+                             "기본: 환경변수 PDF_SUMMARY_METRICS_TEXTFILE)")
+    args = parser.parse_args(argv)
+    fix_console_encoding()
+    REGISTRY.textfile = args.metrics_textfile
+
+    page_filter = "off" if args.strict else args.page_filter
+    page_cache = None if args.no_page_cache else PageCache()
+    stats = run_batch(args.inputs, args.out_dir, workers=args.workers, force=args.force,
+                      page_filter=page_filter, low_memory=args.low_memory, engine=args.engine,
+                      page_cache=page_cache, start_method=args.start_method)
+
+    print("-" * 60)
+    print(f"변환 {stats['converted']}개 / 실패 {stats['failed']}개 / 건너뜀 {stats['skipped']}개 "
+          f"(전체 {stats['files']}개)")
+    print(f"소요 {stats['elapsed']:.2f}s, {stats['files_per_sec']:.2f} files/s, "
+          f"{stats['pages']} pages ({stats['pages_per_sec']:.1f} pages/s), "
+          f"표 없는 페이지 {stats['skipped_pages']}개 건너뜀, 페이지 캐시 재사용 {stats['reused_pages']}개")
+    if stats["tier_pages"]:
+        tiered = sum(stats["tier_pages"].values())
+        print("추출 단계 적중률: " + ", ".join(f"{tier} {n}p ({n / tiered:.0%})"
+                                          for tier, n in sorted(stats["tier_pages"].items())))
+    print(f"워커 최대 RSS {stats['peak_rss_mb']} MB")
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""classify_factor 마이크로벤치마크.
+
+키워드 목록을 순서대로 검사하던 이전 구현과, 규칙 표를 Aho-Corasick
+오토마톤으로 컴파일한 현재 구현(메모 없음/있음)을 같은 토큰 목록으로 비교합니다.
+
+    python benchmarks/bench_classify_factor.py [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_summary_converter import FACTOR_RULES, classify_factor
+
+def legacy_classify_factor(factor_name):
+    """최적화 이전의 classify_factor (키워드 목록을 순서대로 부분 문자열 검색)."""
+    factor_name = factor_name.replace("\n", "").strip()
+    if not factor_name or factor_name == "유해인자":
+        return None
+    
+    # 0. 물리적 인자
+    if "소음" in factor_name or "고열" in factor_name:
+        return "물리적인자"
+
+    # 1. 금속가공유 (미네랄오일 등) - 별표 12 기준
+    if any(x in factor_name for x in ["미네랄오일", "오일미스트", "금속가공유"]):
+        return "금속가공유"
+
+    # 2. 유기화합물 (가장 많음, 우선순위 높여서 산성 오분류 방지)
+    # 아세톤, 톨루엔, 크실렌(자일렌), 메탄올, 에탄올, 이소프로필알코올, 
+    # 초산메틸/에틸/부틸, 디메틸..., 벤젠, 헥산, 신너, 가솔린, 나프타 등
+    organic_keywords = [
+        "아세톤", "톨루엔", "크실렌", "자일렌", "부틸", "에탄올", "메탄올", "이소프로필", "알코올",
+        "초산메틸", "초산에틸", "초산부틸", "초산이소", "초산(아세트산)", "아세트산", # 아세트산은 사실 산류일수도 있지만 유기용제로 주로 분류됨 (별표12 유기화합물 108호 초산 등)
+        "디메틸", "벤젠", "헥산", "신너", "가솔린", "나프타", "와이어", "유기화합물", "트리클로로",
+        "디클로로", "메틸", "에틸", "스티렌", "포름알데히드", "에테르", "케톤", "솔벤트", "세척제", "유기용제"
+    ]
+    # '초산' 단독은 산류로 분류될 수 있으나, '초산XX'는 유기화합물
+    if any(x in factor_name for x in organic_keywords):
+        # 예외: 무기산이 섞여있어서 유기화합물로 분류되면 안되는 경우? (거의 없음)
+        return "유기화합물"
+
+    # 3. 산 및 알칼리류
+    acid_alkali_keywords = [
+        "황산", "염산", "질산", "불산", "불소", "수산화", "암모니아", "과산화", "산 및 알칼리", "포르말린" # 포르말린은 알데히드지만 관리상.. 별표12에선 유기화합물(포름알데히드). 여기선 키워드 주의
+    ]
+    # 별표12에 포름알데히드는 유기화합물임. 위에서 처리됨.
+    if any(x in factor_name for x in acid_alkali_keywords):
+        return "산 및 알칼리류"
+    
+    # '산'이 들어가지만 유기가 아닌것 (위에서 유기 다 걸러짐)
+    if "산" in factor_name and not any(x in factor_name for x in ["산화", "탄산", "규산", "초산", "유산", "젖산"]): 
+        # 산화철(금속), 규산(분진), 탄산(가스/분진) 등 제외
+        # 초산은 위에서 유기화합물로 처리 (아세트산)
+        # 하지만 그냥 '산' 글자만으로는 위험. 구체적 산 이름 위주로.
+        pass
+
+    if "알칼리" in factor_name:
+        return "산 및 알칼리류"
+
+    # 4. 금속류
+    metal_keywords = [
+        "산화철", "망간", "티타늄", "용접흄", "구리", "납", "니켈", "크롬", "아연", "알루미늄", 
+        "카드뮴", "코발트", "주석", "안티몬", "비소", "수은", "금속", "스테인리스", "철분"
+    ]
+    if any(x in factor_name for x in metal_keywords):
+        return "금속류"
+
+    # 5. 분진류
+    dust_keywords = [
+        "분진", "석영", "규소", "시멘트", "광물", "곡물", "목재", "면", "활석", "카본", "유리"
+    ]
+    if any(x in factor_name for x in dust_keywords):
+        return "분진류"
+
+    return "기타"
+
+def build_tokens(n_tokens=20000, n_distinct=300, seed=0):
+    """보고서처럼 적은 수의 유해인자 이름이 반복되는 토큰 목록을 만듭니다."""
+    rnd = random.Random(seed)
+    keywords = [kw for _, kws in FACTOR_RULES for kw in kws]
+    fillers = ["성", "분", "(총)", "(호흡성)", "류", "함유", "증기", "가스", "기타"]
+    distinct = set()
+    while len(distinct) < n_distinct:
+        name = rnd.choice(keywords)
+        if rnd.random() < 0.5:
+            name += rnd.choice(fillers)
+        if rnd.random() < 0.2:
+            name = rnd.choice(fillers) + name
+        if rnd.random() < 0.1:
+            name = "미분류인자" + str(len(distinct))  # 기타로 떨어지는 이름
+        distinct.add(name)
+    distinct = sorted(distinct)
+    return [rnd.choice(distinct) for _ in range(n_tokens)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=20000)
+    parser.add_argument("--distinct", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = build_tokens(args.tokens, args.distinct)
+    uncached = classify_factor.__wrapped__
+
+    mismatches = [t for t in set(tokens) if legacy_classify_factor(t) != uncached(t)]
+    if mismatches:
+        print(f"분류 결과 불일치: {mismatches[:10]}")
+        sys.exit(1)
+
+    def run(fn):
+        return min(timeit.repeat(lambda: [fn(t) for t in tokens], number=1, repeat=args.repeat))
+
+    def run_memo():
+        # 매 반복마다 메모를 비워 보고서 1건을 처음 처리하는 상황을 측정
+        def once():
+            classify_factor.cache_clear()
+            for t in tokens:
+                classify_factor(t)
+        return min(timeit.repeat(once, number=1, repeat=args.repeat))
+
+    results = [
+        ("legacy (substring scans)", run(legacy_classify_factor)),
+        ("automaton", run(uncached)),
+        ("automaton + memo", run_memo()),
+    ]
+    base = results[0][1]
+    print(f"{len(tokens)} tokens, {len(set(tokens))} distinct")
+    for name, sec in results:
+        print(f"{name:<26} {sec * 1000:8.2f} ms  {len(tokens) / sec:12,.0f} tokens/s  x{base / sec:5.1f}")
+
+if __name__ == "__main__":
+    main()
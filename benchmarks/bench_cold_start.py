@@ -0,0 +1,98 @@
+"""콜드 스타트 벤치마크.
+
+매번 새 파이썬 프로세스를 띄워 다음 시간을 잽니다 (반복 중 최솟값, 벽시계 기준).
+
+- import          : pdf_summary_converter만 import (지연 import 후)
+- import (eager)  : pdfplumber까지 함께 import (지연 import 이전과 같은 비용)
+- batch --help    : batch_convert.py --help
+- 첫 변환         : import + 작은 PDF 한 건 변환
+- 첫 변환 (preload): preload()로 미리 읽은 뒤 같은 변환 (백그라운드 preload가 끝난 앱/서비스 워커)
+- workers=N <방식>: 새 프로세스에서 workers=N으로 변환 (preload.START_METHODS별 워커 시작 비용)
+
+측정 전에 저장소의 .pyc를 만들어 두므로(compileall) 바이트코드 컴파일 시간은 빠집니다.
+
+    python benchmarks/bench_cold_start.py [--repeat 5] [--workers 2] [--pdf 파일.pdf]
+"""
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _run(code, repeat, args=()):
+    """새 프로세스에서 code(또는 args)를 실행하는 데 걸린 가장 짧은 시간(초)."""
+    cmd = [sys.executable] + (list(args) if args else ["-c", code])
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        sec = time.perf_counter() - start
+        best = sec if best is None else min(best, sec)
+    return best
+
+def _default_pdfs(work_dir):
+    import synthetic_report
+
+    os.makedirs(work_dir, exist_ok=True)
+    small = os.path.join(work_dir, "cold_small.pdf")
+    medium = os.path.join(work_dir, "cold_medium.pdf")
+    if not os.path.exists(small):
+        synthetic_report.generate(small, pages=2, rows=10, seed=11)
+    if not os.path.exists(medium):
+        synthetic_report.generate(medium, pages=24, rows=14, seed=12)
+    return small, medium
+
+def main(argv=None):
+    from preload import START_METHODS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="workers=N 측정의 N")
+    parser.add_argument("--pdf", help="첫 변환에 쓸 PDF (기본: 합성 2페이지)")
+    parser.add_argument("--parallel-pdf", help="workers=N 측정에 쓸 PDF (기본: 합성 24페이지)")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "pdf_summary_bench"))
+    args = parser.parse_args(argv)
+
+    small, medium = _default_pdfs(args.work_dir)
+    small = os.path.abspath(args.pdf or small)
+    medium = os.path.abspath(args.parallel_pdf or medium)
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)
+
+    convert = f"from pdf_summary_converter import convert_pdf_to_txt; convert_pdf_to_txt({small!r})"
+    results = [
+        ("python (빈 프로세스)", _run("pass", args.repeat)),
+        ("import", _run("import pdf_summary_converter", args.repeat)),
+        ("import (eager)", _run("import pdfplumber, pdfplumber.table, pdf_summary_converter", args.repeat)),
+        ("batch --help", _run(None, args.repeat, ["batch_convert.py", "--help"])),
+        ("첫 변환", _run(convert, args.repeat)),
+    ]
+    # preload를 뺀 변환 시간 = 앱/서비스 워커가 미리 읽어 둔 뒤 첫 요청이 기다리는 시간
+    code = ("import time, preload; preload.preload(); "
+            f"t = time.perf_counter(); {convert}; print(time.perf_counter() - t)")
+    warm = min(float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True,
+                                    text=True).stdout) for _ in range(args.repeat))
+    results.append(("첫 변환 (preload 후)", warm))
+
+    for method in START_METHODS:
+        code = (f"import preload; preload.DEFAULT_START_METHOD = {method!r}; "
+                f"from pdf_summary_converter import convert_pdf_to_txt; "
+                f"convert_pdf_to_txt({medium!r}, workers={args.workers})")
+        try:
+            results.append((f"workers={args.workers} {method}", _run(code, args.repeat)))
+        except subprocess.CalledProcessError:
+            results.append((f"workers={args.workers} {method}", None))  # 이 플랫폼에서 쓸 수 없는 방식
+
+    print(f"반복 {args.repeat}회 중 최솟값, 첫 변환 {os.path.basename(small)}, "
+          f"workers 측정 {os.path.basename(medium)}")
+    for name, sec in results:
+        print(f"{name:<24} " + ("지원 안 함" if sec is None else f"{sec * 1000:8.1f} ms"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""_parse_table 행 처리 벤치마크 (rows/s).
+
+합성 보고서(run_benchmarks.SCENARIOS)의 표를 한 번 추출해 두고, 행마다 필터를 검사하던 이전
+구현(legacy_parse_table)과 열 단위로 한꺼번에 거르는 현재 구현(_filter_rows + 상태 머신)으로
+같은 표 목록을 처리합니다. 두 구현의 결과(jobs, 공정명, profile 카운터)가 다르면 종료 코드 1.
+유해인자 분류(classify_factor)는 메모를 채운 상태로 재므로 행 처리 비용만 비교됩니다.
+
+    python benchmarks/bench_parse_table.py [--repeat 5] [--scenario large ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdf_summary_converter as conv
+from conversion_profile import ConversionProfile
+
+COL_MAP = {"group": 0, "unit": 3, "factor": 4, "worker": 5, "form": 6}
+
+def legacy_parse_table(table, col_map, jobs, profile=None):
+    """행 필터를 도입하기 이전의 _parse_table (행마다 문자열 합치기, get_col 클로저, 필터 검사)."""
+    # 1. Detect Header
+    header_found = False
+    for row in table[:5]:
+        if not row: continue
+        row_str = "".join([str(x) for x in row if x])
+        if "공정" in row_str and ("작업" in row_str or "장소" in row_str):
+            for cb_idx, cell in enumerate(row):
+                if not cell: continue
+                txt = str(cell).replace(" ", "")
+                if "공정" in txt or "부서" in txt: col_map["group"] = cb_idx
+                elif "작업" in txt or "장소" in txt or "단위" in txt: col_map["unit"] = cb_idx
+                elif "유해" in txt or "인자" in txt: col_map["factor"] = cb_idx
+                elif "근로" in txt or "자수" in txt or "측정치" in txt:
+                    if "치" not in txt: col_map["worker"] = cb_idx
+                elif "형태" in txt or "근무" in txt: col_map["form"] = cb_idx
+            header_found = True
+            break
+    
+    current_group = None
+    current_unit = None
+    
+    # Flag to track if the current unit 'row' seems complete (has workers/form)
+    # If complete, next text implies new unit.
+    unit_row_completed = False
+
+    for row in table:
+        if not row or len(row) < 3:
+            if profile is not None: profile.count("rows_dropped_short")
+            continue
+        
+        row_full = "".join([str(x) for x in row if x])
+        if "공정" in row_full and "작업" in row_full or "측정시각" in row_full: # Header / Time header
+            if profile is not None: profile.count("rows_dropped_header")
+            continue
+        if "측정방법" in row_full or "비고" in row_full or "평균치" in row_full:
+            if profile is not None: profile.count("rows_dropped_footer")
+            continue
+
+        def get_col(idx):
+            if idx < len(row) and row[idx]:
+                return str(row[idx]).replace("\n", " ").strip()
+            return ""
+        
+        g_text = get_col(col_map["group"])
+        u_text = get_col(col_map["unit"])
+        f_text = get_col(col_map["factor"])
+        w_text = get_col(col_map["worker"])
+        form_text = get_col(col_map["form"])
+        
+        # Garbage Filter: Timestamps / Footer
+        # If any text contains "~" and ":" (e.g. ~ 15:30), it's likely a timestamp row
+        if conv._TIMESTAMP_PATTERN.search(row_full) \
+                or "종료" in row_full or "시작" in row_full:
+            if profile is not None: profile.count("rows_dropped_timestamp")
+            continue
+        
+        # Worker Val: Keep exact string 
+        w_val = None
+        if w_text: 
+             w_val = w_text
+        
+        # Unit Name Cleanup: Ignore numeric garbage
+        if u_text and (u_text.isdigit() or conv._NUMERIC_UNIT_PATTERN.match(u_text) or len(u_text) < 2 and u_text.isdigit()):
+            if not w_val: w_val = u_text # Fallback
+            u_text = ""
+
+        # Logic: When to start a New Unit?
+        # 1. Group text exists -> Definitely New Group -> New Unit
+        # 2. Unit text exists AND Previous Unit was 'Completed' (had workers/factors populated in a way that implies end)
+        # OR just standard: If Unit text exists -> New Unit (unless it looks like wrapped text).
+        # 'Wrapped text' heuristic: Previous line had NO workers/form, and this line has text.
+        
+        start_new_unit = False
+        
+        if g_text:
+            current_group = g_text
+            start_new_unit = True
+        elif u_text:
+            # If we have text, is it a new unit or continuation?
+            if unit_row_completed:
+                start_new_unit = True
+            else:
+                # Previous row didn't have workers/form.
+                # It might be a continuation of the name.
+                # OR it might be distinct unit that just has no worker data (unlikely for "Distribution" report)
+                # Let's assume continuation.
+                start_new_unit = False
+        
+        # If we don't have a current unit object yet, force start
+        if not current_unit and (g_text or u_text):
+            if not g_text and current_group: # Continuation of group but start of first unit finding
+                 start_new_unit = True
+            elif g_text:
+                 start_new_unit = True
+
+        if start_new_unit:
+            current_unit = {
+                "name_parts": [],
+                "factors": defaultdict(set),
+                "workers": "", # String accumulation
+                "work_form": set()
+            }
+            if current_group:
+                jobs[current_group].append(current_unit)
+            unit_row_completed = False
+            
+        if not current_unit:
+            if profile is not None: profile.count("rows_dropped_orphan") # 첫 공정 이전의 행
+            continue
+        if profile is not None: profile.count("rows_kept")
+        
+        # 1. Name Parts
+        if u_text:
+            current_unit["name_parts"].append(u_text)
+        
+        # 2. Workers
+        if w_val:
+            # User wants exact string.
+            # If multiple rows have workers for same 'unit' (merged cells with split rows?), logic says we started new unit?
+            # If we are here, it means we are in 'current_unit'.
+            # If 'current_unit' already has workers, and we see NEW workers on this line...
+            # It suggests we missed a split? 
+            # Or it's just aggregating.
+            # Given "Strict Separation", if we see `w_val`, it flags completion.
+            current_unit["workers"] = w_val # Overwrite or append? "16(4)" usually one line.
+            unit_row_completed = True
+            
+        # 3. Form
+        if form_text:
+            if "교대" in form_text:
+                current_unit["work_form"].add(form_text.split()[0])
+            unit_row_completed = True # Form implies completion row usually
+                
+        # 4. Factors
+        if f_text and "유해인자" not in f_text:
+            if f_text.isdigit(): pass
+            else:
+                parts = f_text.split()
+                for p in parts:
+                    p = p.strip()
+                    if profile is None:
+                        cat = conv.classify_factor(p)
+                    else:
+                        t = time.perf_counter()
+                        cat = conv.classify_factor(p)
+                        profile.add("classify_factor", time.perf_counter() - t)
+                    if cat:
+                        current_unit["factors"][cat].add(p)
+
+    return current_group
+
+def collect_tables(pdf_path):
+    """extract_job_data_impl과 같은 순서로 추출한 문서의 표 목록 (빈 표 제외)."""
+    import pdfplumber
+
+    tables = []
+    with pdfplumber.open(pdf_path) as pdf:
+        layout_cache = conv._new_layout_cache()
+        for page in pdf.pages:
+            tables.extend(t for t in conv._extract_page_tables(page, "content", layout_cache) or [] if t)
+            page.close()
+    return tables
+
+def parse_all(parse, tables, profile=None):
+    jobs = defaultdict(list)
+    col_map = dict(COL_MAP)
+    groups = [parse(table, col_map, jobs, profile) for table in tables]
+    return jobs, groups, col_map
+
+def main(argv=None):
+    import synthetic_report
+    from run_benchmarks import SCENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["wrapped", "large"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "pdf_summary_bench"))
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    failed = False
+    for name in args.scenario:
+        pdf_path = os.path.join(args.work_dir, f"{name}.pdf")
+        if not os.path.exists(pdf_path):
+            synthetic_report.generate(pdf_path, **SCENARIOS[name])
+        tables = collect_tables(pdf_path)
+        rows = sum(len(t) for t in tables)
+
+        expected, actual = parse_all(legacy_parse_table, tables), parse_all(conv._parse_table, tables)
+        profile_a, profile_b = ConversionProfile(), ConversionProfile()
+        parse_all(legacy_parse_table, tables, profile_a)
+        parse_all(conv._parse_table, tables, profile_b)
+        same = expected == actual and profile_a.counters == profile_b.counters
+        failed |= not same
+
+        # 두 구현을 번갈아 재서 시스템 부하 변화가 한쪽에만 몰리지 않도록 함
+        impls = (("legacy (row by row)", legacy_parse_table), ("columnar filter", conv._parse_table))
+        best = {label: None for label, _ in impls}
+        for _ in range(args.repeat):
+            for label, fn in impls:
+                sec = min(timeit.repeat(lambda: parse_all(fn, tables), number=1, repeat=3))
+                best[label] = sec if best[label] is None else min(best[label], sec)
+        results = list(best.items())
+        base = results[0][1]
+        print(f"{name}: 표 {len(tables)}개, {rows}행, 결과 {'같음' if same else '다름'}")
+        for label, sec in results:
+            print(f"  {label:<22} {sec * 1000:8.2f} ms  {rows / sec:12,.0f} rows/s  x{base / sec:5.2f}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
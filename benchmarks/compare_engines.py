@@ -0,0 +1,129 @@
+"""표 추출 엔진 비교 ("tables" vs "rows", 참고로 "tiered").
+
+PDF마다 모든 페이지의 표를 두 엔진으로 추출해 페이지 단위로 같은지 확인하고,
+convert_pdf_to_txt()의 최종 출력도 비교합니다. 엔진별 변환 시간(반복 중 최솟값)과
+rows 엔진이 격자 경로로 처리한 페이지 비율을 함께 보여줍니다. 결과가 하나라도
+다르면 종료 코드 1을 돌려줍니다. "tiered"는 결과가 같다고 보장하지 않는 엔진이므로
+시간, 출력 일치 여부, 추출 단계 적중률만 보여주고 종료 코드에는 넣지 않습니다.
+
+    python benchmarks/compare_engines.py                 # 합성 시나리오 (run_benchmarks.SCENARIOS)
+    python benchmarks/compare_engines.py reports/*.pdf --repeat 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _synthetic_pdfs(work_dir):
+    import synthetic_report
+    from run_benchmarks import SCENARIOS
+
+    os.makedirs(work_dir, exist_ok=True)
+    paths = []
+    for name, params in SCENARIOS.items():
+        pdf_path = os.path.join(work_dir, f"{name}.pdf")
+        if not os.path.exists(pdf_path):
+            synthetic_report.generate(pdf_path, **params)
+        paths.append(pdf_path)
+    return paths
+
+def compare_pages(pdf_path):
+    """모든 페이지(사전 필터 없음)를 두 엔진으로 추출해 {"pages", "grid_pages", "diff_pages"}를 돌려줍니다."""
+    import pdfplumber
+    from pdfplumber.table import TableSettings
+
+    import pdf_summary_converter as conv
+    import row_engine
+
+    settings = TableSettings.resolve(conv.TABLE_SETTINGS)
+    result = {"pages": 0, "grid_pages": 0, "diff_pages": []}
+    with pdfplumber.open(pdf_path) as pdf_a, pdfplumber.open(pdf_path) as pdf_b:
+        cache_a, cache_b = conv._new_layout_cache(), conv._new_layout_cache()
+        for page_no, (page_a, page_b) in enumerate(zip(pdf_a.pages, pdf_b.pages), 1):
+            expected = conv._extract_page_tables(page_a, "off", cache_a, "tables")
+            if row_engine.extract_grid_tables(page_b, settings) is not None:
+                result["grid_pages"] += 1
+            actual = conv._extract_page_tables(page_b, "off", cache_b, "rows")
+            if actual != expected:
+                result["diff_pages"].append(page_no)
+            result["pages"] += 1
+            page_a.close()
+            page_b.close()
+    return result
+
+def time_engines(pdf_path, repeat):
+    """엔진별 {"seconds", "text"} (convert_pdf_to_txt, 반복 중 가장 빠른 값)."""
+    from pdf_summary_converter import TABLE_ENGINES, convert_pdf_to_txt
+
+    timings = {engine: {"seconds": None, "text": None} for engine in TABLE_ENGINES}
+    for _ in range(repeat):
+        for engine in TABLE_ENGINES:
+            start = time.perf_counter()
+            text = convert_pdf_to_txt(pdf_path, engine=engine)
+            sec = time.perf_counter() - start
+            best = timings[engine]
+            if best["seconds"] is None or sec < best["seconds"]:
+                best["seconds"] = sec
+            best["text"] = text
+    return timings
+
+def tier_hit_rates(pdf_path):
+    """tiered 엔진의 추출 단계별 페이지 수 (iter_convert_pdf의 done 이벤트)."""
+    from pdf_summary_converter import iter_convert_pdf
+
+    for event in iter_convert_pdf(pdf_path, engine="tiered"):
+        if event["type"] == "done":
+            return event["tier_pages"]
+    return {}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="표 추출 엔진 결과/속도 비교")
+    parser.add_argument("pdfs", nargs="*", help="비교할 PDF (기본: 합성 시나리오)")
+    parser.add_argument("--repeat", type=int, default=3, help="엔진별 변환 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--work-dir", help="합성 PDF를 만들/재사용할 폴더")
+    parser.add_argument("--no-pages", action="store_true", help="페이지 단위 비교는 건너뛰고 최종 출력만 비교")
+    args = parser.parse_args(argv)
+
+    pdfs = args.pdfs or _synthetic_pdfs(args.work_dir or os.path.join(tempfile.gettempdir(), "pdf_summary_bench"))
+    failed = 0
+    total = {"tables": 0.0, "rows": 0.0, "tiered": 0.0}
+    for pdf_path in pdfs:
+        timings = time_engines(pdf_path, args.repeat)
+        same_text = timings["tables"]["text"] == timings["rows"]["text"]
+        for engine in total:
+            total[engine] += timings[engine]["seconds"]
+        speedup = timings["tables"]["seconds"] / timings["rows"]["seconds"]
+        line = (f"{os.path.basename(pdf_path)}: tables {timings['tables']['seconds']:.3f}s, "
+                f"rows {timings['rows']['seconds']:.3f}s (x{speedup:.2f}), 출력 {'같음' if same_text else '다름'}")
+        tiers = tier_hit_rates(pdf_path)
+        tiered = sum(tiers.values())
+        line += (f", tiered {timings['tiered']['seconds']:.3f}s "
+                 f"(출력 {'같음' if timings['tiered']['text'] == timings['tables']['text'] else '다름'}, "
+                 f"ruled 단계 {tiers.get('ruled', 0)}/{tiered}p)")
+        ok = same_text
+        if not args.no_pages:
+            pages = compare_pages(pdf_path)
+            line += (f", 페이지 {pages['pages']}개 중 격자 경로 {pages['grid_pages']}개, "
+                     f"표가 다른 페이지 {len(pages['diff_pages'])}개")
+            if pages["diff_pages"]:
+                ok = False
+                line += f" {pages['diff_pages'][:10]}"
+        print(line)
+        failed += not ok
+
+    if total["rows"]:
+        print(f"전체: tables {total['tables']:.3f}s, rows {total['rows']:.3f}s "
+              f"(x{total['tables'] / total['rows']:.2f}), tiered {total['tiered']:.3f}s "
+              f"(x{total['tables'] / total['tiered']:.2f})")
+    if failed:
+        print(f"결과가 다른 PDF {failed}개")
+        return 1
+    print("모든 PDF에서 두 엔진의 결과가 같습니다")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
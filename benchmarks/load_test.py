@@ -0,0 +1,377 @@
+"""변환 경로 부하 테스트 (동시 사용자 수 / 워커 수별 처리량, 지연 시간, 메모리).
+
+PDF 묶음(기본: 합성 시나리오 small, medium)을 동시 사용자 수(--concurrency)만큼의 스레드가
+번갈아 보내고, 워커 수(--workers)마다 다음을 보여줍니다.
+
+- 처리량: 성공한 요청/초, 페이지/초
+- 지연 시간: 요청을 보낸 뒤 결과를 받을 때까지 p50/p95/p99/최댓값(초)
+- 메모리: 측정 중 최대 RSS(MB). 서비스는 서비스 프로세스와 워커 프로세스의 합 (Linux /proc)
+- 실패: 상태별 개수 (서비스의 503 거절, 504 제한 시간 등)
+
+대상(--target):
+- service: convert_service.py를 워커 수마다 새로 띄워 POST /convert로 보냄 (--url이면 이미 떠 있는 서비스)
+- jobs   : 앱과 같은 작업 큐(job_queue.JobQueue(max_running=워커 수) + convert_job)를 새 프로세스에서
+           직접 사용. 사용자마다 작업을 넣고 앱처럼 주기적으로 상태를 읽음
+- apptest: app.py를 Streamlit AppTest 세션으로 실행 (요청마다 새 세션이 업로드 -> 변환 시작 -> 완료까지
+           다시 실행). AppTest는 스레드 안전하지 않아 스크립트 실행은 한 번에 하나씩 하고, 변환은 앱과
+           같이 공유 작업 큐에서 동시에 진행됩니다. 워커 수는 PDF_SUMMARY_MAX_JOBS로 넘깁니다.
+jobs/apptest는 결과 캐시를 쓰지 않습니다 (--use-cache로 켜면 같은 PDF는 캐시에서 바로 나옴).
+
+    python benchmarks/load_test.py --workers 1 2 4 --concurrency 1 4 8
+    python benchmarks/load_test.py reports/*.pdf --target jobs --workers 2 --concurrency 4 --requests 40
+    python benchmarks/load_test.py --target service --url http://127.0.0.1:8765 --concurrency 8
+"""
+import argparse
+import glob
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ("service", "jobs", "apptest")
+DEFAULT_SCENARIOS = ("small", "medium")
+# jobs/apptest 대상에서 작업 상태를 다시 읽는 주기(초) (app.POLL_SECONDS보다 짧게 잡아 지연 측정 오차를 줄임)
+POLL_SECONDS = 0.05
+SAMPLE_SECONDS = 0.1
+
+def _rss_mb(pid):
+    """pid와 그 자식 프로세스들의 현재 RSS 합(MB). /proc이 없거나 pid를 읽을 수 없으면 None.
+
+    읽는 중에 끝난 자식(워커 교체 등)은 건너뛰고 나머지 프로세스를 계속 셉니다.
+    """
+    total = 0
+    todo = [pid]
+    while todo:
+        p = todo.pop()
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            for task in os.listdir(f"/proc/{p}/task"):
+                try:
+                    with open(f"/proc/{p}/task/{task}/children") as f:
+                        todo.extend(int(c) for c in f.read().split())
+                except FileNotFoundError:
+                    continue  # 그 사이에 끝난 스레드
+        except OSError:
+            if p == pid:
+                return None
+            continue  # 목록을 읽은 뒤 끝난 자식
+    return round(total / 1024, 1)
+
+class _MemorySampler:
+    """측정 중 SAMPLE_SECONDS마다 RSS를 읽어 최댓값을 기록합니다."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            rss = _rss_mb(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            if self._stop.wait(SAMPLE_SECONDS):
+                break
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def percentile(values, q):
+    """가장 가까운 순위(nearest-rank) 백분위수. values가 비었으면 None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+def replay(send, corpus, concurrency, requests):
+    """concurrency개 스레드가 corpus를 차례로 돌며 requests건을 send(data)로 보냅니다.
+
+    send는 결과 상태 문자열("ok" 또는 실패 종류)을 돌려줍니다.
+    돌려주는 값: {"elapsed", "latencies"(성공한 요청), "statuses", "pages"(성공한 요청의 페이지 합)}
+    """
+    lock = threading.Lock()
+    counter = iter(range(requests))
+    latencies, statuses = [], {}
+    pages = [0]
+
+    def user():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            item = corpus[i % len(corpus)]
+            start = time.perf_counter()
+            try:
+                status = send(item["data"])
+            except Exception as e:
+                status = type(e).__name__
+            sec = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == "ok":
+                    latencies.append(sec)
+                    pages[0] += item["pages"]
+
+    threads = [threading.Thread(target=user) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"elapsed": time.perf_counter() - start, "latencies": latencies, "statuses": statuses, "pages": pages[0]}
+
+def summarize(run, workers, concurrency, peak_rss_mb):
+    lat = run["latencies"]
+    elapsed = run["elapsed"]
+    return {
+        "workers": workers,
+        "concurrency": concurrency,
+        "requests": sum(run["statuses"].values()),
+        "ok": len(lat),
+        "statuses": run["statuses"],
+        "elapsed": round(elapsed, 3),
+        "requests_per_sec": round(len(lat) / elapsed, 3) if elapsed > 0 else 0.0,
+        "pages_per_sec": round(run["pages"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50": percentile(lat, 50),
+        "p95": percentile(lat, 95),
+        "p99": percentile(lat, 99),
+        "max": max(lat) if lat else None,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+# --- service ---
+
+def _service_sender(url, timeout):
+    def send(data):
+        req = urllib.request.Request(url.rstrip("/") + "/convert", data=data, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                r.read()
+                return "ok"
+        except urllib.error.HTTPError as e:
+            e.read()
+            return f"http_{e.code}"
+    return send
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_healthy(url, proc, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError("convert_service.py가 시작하자마자 종료되었습니다")
+        try:
+            with urllib.request.urlopen(url.rstrip("/") + "/health", timeout=2) as r:
+                return json.loads(r.read())
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"{url}/health 응답 없음")
+
+def run_service(corpus, workers, concurrency_levels, requests, timeout, url=None, start_method=None):
+    """워커 수 하나에 대해 동시 사용자 수별 결과 목록."""
+    proc = None
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        cmd = [sys.executable, os.path.join(ROOT, "convert_service.py"), "--port", str(port), "-j", str(workers),
+               "--quiet", "--timeout", str(timeout), "--max-queue", str(max(concurrency_levels))]
+        if start_method:
+            cmd += ["--start-method", start_method]
+        proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        health = _wait_healthy(url, proc)
+        send = _service_sender(url, timeout + 10)
+        send(corpus[0]["data"])  # 워커마다 첫 요청 비용이 섞이지 않도록 한 번 보내 둠
+        results = []
+        for concurrency in concurrency_levels:
+            with _MemorySampler(proc.pid if proc else None) as mem:
+                run = replay(send, corpus, concurrency, requests or max(2 * concurrency, len(corpus)))
+            results.append(summarize(run, workers if proc else health.get("workers"), concurrency,
+                                     mem.peak if proc else None))
+        return results
+    finally:
+        if proc is not None:
+            # SIGINT(KeyboardInterrupt)로 끝내야 서비스가 워커 프로세스까지 정리함
+            proc.send_signal(signal.SIGINT if os.name != "nt" else signal.SIGTERM)
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+# --- jobs / apptest (새 프로세스에서 실행) ---
+
+def _jobs_sender(use_cache):
+    from job_queue import FINISHED, JobQueue, convert_job
+
+    queue = JobQueue(max_running=int(os.environ["PDF_SUMMARY_MAX_JOBS"]))
+    owners = threading.local()
+
+    def send(data):
+        if not hasattr(owners, "id"):
+            owners.id = threading.get_ident()  # 사용자(스레드)마다 다른 owner -> 큐의 사용자 간 공정 배분
+        job_id = queue.submit(owners.id, "load-test", convert_job, data, use_cache=use_cache)
+        while True:
+            job = queue.get(job_id)
+            if job.status in FINISHED:
+                break
+            time.sleep(POLL_SECONDS)
+        status = job.status
+        queue.release(job_id)  # 앱에서 결과를 내려받은 것과 같음
+        return "ok" if status == "done" else status
+    return send
+
+def _apptest_sender(use_cache):
+    import logging
+
+    from streamlit.testing.v1 import AppTest
+
+    # 사용자 스레드마다 나오는 "missing ScriptRunContext" 경고 숨김 (AppTest가 로그 수준을 다시 설정하므로 끔)
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+    run_lock = threading.Lock()  # AppTest는 전역 런타임을 바꾸므로 스크립트 실행은 하나씩
+
+    def run(at):
+        with run_lock:
+            at.run()
+
+    def send(data):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        run(at)
+        with run_lock:
+            at.file_uploader[0].upload("load.pdf", data, "application/pdf").run()
+            if not use_cache:
+                [c for c in at.checkbox if c.label.startswith("캐시 사용 안 함")][0].check().run()
+            [b for b in at.button if b.label == "변환 시작"][0].click().run()
+        while True:
+            time.sleep(POLL_SECONDS)
+            run(at)
+            if any(b.label == "📥 텍스트 파일 다운로드" for b in at.get("download_button")):
+                return "ok"
+            if at.exception:
+                return "exception"
+            if any("오류가 발생했습니다" in e.value for e in at.error):
+                return "failed"
+    return send
+
+def _run_in_process(target, corpus, workers, concurrency_levels, requests, use_cache):
+    """(새 프로세스) jobs/apptest 대상의 동시 사용자 수별 결과 목록."""
+    os.environ["PDF_SUMMARY_MAX_JOBS"] = str(workers)  # apptest: app의 JobQueue 기본값
+    send = _jobs_sender(use_cache) if target == "jobs" else _apptest_sender(use_cache)
+    send(corpus[0]["data"])  # import와 첫 변환 비용 제외
+    results = []
+    for concurrency in concurrency_levels:
+        with _MemorySampler(os.getpid()) as mem:
+            run = replay(send, corpus, concurrency, requests or max(2 * concurrency, len(corpus)))
+        results.append(summarize(run, workers, concurrency, mem.peak))
+    return results
+
+def load_corpus(inputs, work_dir):
+    """[{"name", "data", "pages"}] (inputs가 없으면 합성 시나리오 PDF를 만들어 씀)."""
+    import pdfplumber
+
+    paths = []
+    for pattern in inputs:
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) if any(c in pattern for c in "*?[") else [pattern])
+    if not paths:
+        import synthetic_report
+        from run_benchmarks import SCENARIOS
+
+        os.makedirs(work_dir, exist_ok=True)
+        for name in DEFAULT_SCENARIOS:
+            path = os.path.join(work_dir, f"{name}.pdf")
+            if not os.path.exists(path):
+                synthetic_report.generate(path, **SCENARIOS[name])
+            paths.append(path)
+    corpus = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        with pdfplumber.open(path) as pdf:
+            pages = len(pdf.pages)
+        corpus.append({"name": os.path.basename(path), "data": data, "pages": pages})
+    return corpus
+
+def print_report(target, results):
+    print(f"대상 {target}")
+    print(f"{'워커':>4} {'동시':>4} {'요청':>5} {'성공':>5} {'req/s':>7} {'pages/s':>8} "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'RSS MB':>8}  실패")
+
+    def sec(v):
+        return f"{v:7.2f}" if v is not None else f"{'-':>7}"
+
+    for r in results:
+        failures = ", ".join(f"{k} {n}" for k, n in sorted(r["statuses"].items()) if k != "ok") or "-"
+        rss = f"{r['peak_rss_mb']:8.1f}" if r["peak_rss_mb"] is not None else f"{'-':>8}"
+        print(f"{r['workers'] or '-':>4} {r['concurrency']:>4} {r['requests']:>5} {r['ok']:>5} "
+              f"{r['requests_per_sec']:7.2f} {r['pages_per_sec']:8.1f} {sec(r['p50'])} {sec(r['p95'])} "
+              f"{sec(r['p99'])} {sec(r['max'])} {rss}  {failures}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="보낼 PDF 파일 또는 글롭 패턴 (기본: 합성 small, medium)")
+    parser.add_argument("--target", choices=TARGETS, default="service")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="워커 수 목록 (기본: 1 2)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="동시 사용자 수 목록 (기본: 1 4)")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="측정마다 보낼 요청 수 (기본: 동시 사용자 수의 2배와 PDF 수 중 큰 값)")
+    parser.add_argument("--timeout", type=float, default=300, help="service: 요청별 제한 시간(초)")
+    parser.add_argument("--url", help="service: 이미 떠 있는 서비스 주소 (지정하면 --workers는 무시)")
+    parser.add_argument("--start-method", help="service: 워커 시작 방식 (preload.START_METHODS)")
+    parser.add_argument("--use-cache", action="store_true", help="jobs/apptest: 결과 캐시 사용")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "pdf_summary_bench"))
+    parser.add_argument("--save", metavar="JSON", help="결과를 JSON으로 저장")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.inputs, args.work_dir)
+    print(f"PDF {len(corpus)}개 ({sum(c['pages'] for c in corpus)}페이지): " + ", ".join(c["name"] for c in corpus))
+    results = []
+    for workers in ([None] if args.url else args.workers):
+        if args.target == "service":
+            results += run_service(corpus, workers, args.concurrency, args.requests, args.timeout, args.url,
+                                   args.start_method)
+        else:
+            # 워커 수마다 새 프로세스 (앱의 작업 큐 설정과 메모리 측정을 분리)
+            import multiprocessing
+
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results += executor.submit(_run_in_process, args.target, corpus, workers, args.concurrency,
+                                           args.requests, args.use_cache).result()
+    print_report(args.target, results)
+
+    if args.save:
+        doc = {"target": args.target, "corpus": [{"name": c["name"], "pages": c["pages"]} for c in corpus],
+               "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.save}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
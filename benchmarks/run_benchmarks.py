@@ -0,0 +1,232 @@
+"""변환기 성능 벤치마크 (속도 / 메모리 / 단계별 시간).
+
+합성 보고서(benchmarks/synthetic_report.py)를 시나리오별로 만들고, 시나리오마다
+새 프로세스에서 extract_job_data_impl / classify_factor / convert_pdf_to_txt를
+측정합니다. 결과를 JSON 기준선으로 저장하고, 다음 측정을 기준선과 비교해
+허용치보다 느려지거나 메모리가 늘면 종료 코드 1을 돌려줍니다.
+
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --tolerance 0.15
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_report
+
+# 시나리오: synthetic_report.generate() 인자
+SCENARIOS = {
+    "small": {"pages": 5, "rows": 12, "seed": 1},
+    "medium": {"pages": 40, "rows": 14, "seed": 2, "appendix_pages": 10},
+    "wrapped": {"pages": 20, "rows": 16, "seed": 3, "wrap_every": 2, "timestamp_every": 2, "multiline_every": 2},
+    "large": {"pages": 150, "rows": 14, "seed": 4, "appendix_pages": 50},
+    # 행마다 괘선이 있는 서식 (tiered 엔진의 ruled 단계가 처리하는 페이지)
+    "ruled": {"pages": 40, "rows": 14, "seed": 5, "appendix_pages": 10, "ruled_rows": True,
+              "wrap_every": 0, "timestamp_every": 0, "multiline_every": 0},
+}
+QUICK_SCENARIOS = ["small", "medium"]
+
+# 이 지표들은 값이 클수록 좋음 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ("pages_per_sec", "rows_per_sec", "tokens_per_sec")
+
+def _bench_extract(pdf_path):
+    """extract_job_data_impl과 같은 순서로 단계를 직접 호출해 단계별 시간을 잽니다."""
+    import pdfplumber
+    import pdf_summary_converter as conv
+
+    stages = {"open": 0.0, "metadata": 0.0, "extract_tables": 0.0, "parse": 0.0,
+              "postprocess": 0.0, "render": 0.0}
+    rows = 0
+    start = time.perf_counter()
+
+    t = time.perf_counter()
+    pdf = pdfplumber.open(pdf_path)
+    stages["open"] = time.perf_counter() - t
+    with pdf:
+        t = time.perf_counter()
+        company_info = conv._extract_company_info(pdf)
+        stages["metadata"] = time.perf_counter() - t
+
+        jobs = conv.defaultdict(list)
+        col_map = {"group": 0, "unit": 3, "factor": 4, "worker": 5, "form": 6}
+        page_count = len(pdf.pages)
+        layout_cache = conv._new_layout_cache()
+        for page in pdf.pages:
+            t = time.perf_counter()
+            tables = conv._extract_page_tables(page, "content", layout_cache) or []
+            t2 = time.perf_counter()
+            for table in tables:
+                if not table: continue
+                rows += len(table)
+                conv._parse_table(table, col_map, jobs)
+            stages["extract_tables"] += t2 - t
+            stages["parse"] += time.perf_counter() - t2
+
+    t = time.perf_counter()
+    report = conv.build_report(company_info, jobs)
+    stages["postprocess"] = time.perf_counter() - t
+    total = time.perf_counter() - start
+
+    t = time.perf_counter()
+    conv.render_txt(report)
+    stages["render"] = time.perf_counter() - t
+
+    return {
+        "seconds": round(total, 4),
+        "pages": page_count,
+        "rows": rows,
+        "pages_per_sec": round(page_count / total, 2),
+        "rows_per_sec": round(rows / total, 1),
+        "stages": {k: round(v, 4) for k, v in stages.items()},
+    }
+
+def _bench_classify(n_tokens=20000):
+    from bench_classify_factor import build_tokens
+    from pdf_summary_converter import classify_factor
+
+    tokens = build_tokens(n_tokens)
+    classify_factor.cache_clear()
+    start = time.perf_counter()
+    for tok in tokens:
+        classify_factor(tok)
+    sec = time.perf_counter() - start
+    return {"seconds": round(sec, 4), "tokens_per_sec": round(len(tokens) / sec, 1)}
+
+def _bench_convert(pdf_path, page_count):
+    from pdf_summary_converter import convert_pdf_to_txt
+
+    start = time.perf_counter()
+    convert_pdf_to_txt(pdf_path)
+    sec = time.perf_counter() - start
+    return {"seconds": round(sec, 4), "pages_per_sec": round(page_count / sec, 2)}
+
+def _run_scenario(pdf_path):
+    """(새 프로세스에서 실행) 시나리오 하나의 모든 벤치마크."""
+    result = {"extract_job_data_impl": _bench_extract(pdf_path)}
+    result["classify_factor"] = _bench_classify()
+    result["convert_pdf_to_txt"] = _bench_convert(pdf_path, result["extract_job_data_impl"]["pages"])
+    from pdf_summary_converter import peak_rss_mb
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def run(scenarios, repeat=1, work_dir=None):
+    work_dir = work_dir or tempfile.mkdtemp(prefix="pdf_summary_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    ctx = multiprocessing.get_context("spawn")  # 시나리오마다 깨끗한 프로세스 (RSS 측정 분리)
+    results = {}
+    for name in scenarios:
+        pdf_path = os.path.join(work_dir, f"{name}.pdf")
+        if not os.path.exists(pdf_path):
+            synthetic_report.generate(pdf_path, **SCENARIOS[name])
+
+        best = None
+        for _ in range(repeat):
+            with ctx.Pool(1) as pool:
+                res = pool.apply(_run_scenario, (pdf_path,))
+            # 반복 중 가장 빠른 측정을 사용 (잡음 제거)
+            if best is None or res["convert_pdf_to_txt"]["seconds"] < best["convert_pdf_to_txt"]["seconds"]:
+                best = res
+        results[name] = best
+    return results
+
+def _flatten(results):
+    flat = {}
+    for scenario, benches in results.items():
+        for bench, metrics in benches.items():
+            if not isinstance(metrics, dict):
+                flat[f"{scenario}.{bench}"] = metrics
+                continue
+            for metric, value in metrics.items():
+                if isinstance(value, (int, float)):
+                    flat[f"{scenario}.{bench}.{metric}"] = value
+    return flat
+
+def compare(current, baseline, tolerance):
+    """기준선 대비 허용치를 넘게 나빠진 지표 목록 [(키, 기준, 현재, 변화율)]."""
+    cur = _flatten(current)
+    base = _flatten(baseline)
+    regressions = []
+    for key, base_val in base.items():
+        if key not in cur or not base_val or cur[key] is None:
+            continue
+        metric = key.rsplit(".", 1)[-1]
+        if metric not in HIGHER_IS_BETTER + ("seconds", "peak_rss_mb"):
+            continue  # pages/rows 같은 개수는 비교 대상 아님
+        change = (cur[key] - base_val) / base_val
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        if worse > tolerance:
+            regressions.append((key, base_val, cur[key], change))
+    return regressions
+
+def print_report(results):
+    for name, res in results.items():
+        ext = res["extract_job_data_impl"]
+        print(f"[{name}] {ext['pages']} pages, {ext['rows']} rows, peak RSS {res['peak_rss_mb']} MB")
+        print(f"  extract_job_data_impl : {ext['seconds']:.3f}s  "
+              f"{ext['pages_per_sec']:.1f} pages/s  {ext['rows_per_sec']:.0f} rows/s")
+        print("    stages: " + ", ".join(f"{k} {v:.3f}s" for k, v in ext["stages"].items()))
+        cls = res["classify_factor"]
+        print(f"  classify_factor       : {cls['tokens_per_sec']:.0f} tokens/s")
+        conv = res["convert_pdf_to_txt"]
+        print(f"  convert_pdf_to_txt    : {conv['seconds']:.3f}s  {conv['pages_per_sec']:.1f} pages/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 요약 변환기 벤치마크")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument("--quick", action="store_true", help=f"{', '.join(QUICK_SCENARIOS)} 시나리오만 실행")
+    parser.add_argument("--repeat", type=int, default=3, help="시나리오별 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--work-dir", help="합성 PDF를 만들/재사용할 폴더")
+    parser.add_argument("--save", metavar="JSON", help="결과를 기준선 JSON으로 저장")
+    parser.add_argument("--compare", metavar="JSON", help="기준선 JSON과 비교")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용 성능 저하 비율 (기본 0.15)")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or (QUICK_SCENARIOS if args.quick else list(SCENARIOS))
+    if args.compare and not args.scenario and not args.quick:
+        with open(args.compare, encoding="utf-8") as f:
+            scenarios = [s for s in json.load(f)["results"] if s in SCENARIOS]
+
+    from pdf_summary_converter import CONVERTER_VERSION
+
+    results = run(scenarios, repeat=args.repeat, work_dir=args.work_dir)
+    print_report(results)
+
+    if args.save:
+        doc = {
+            "meta": {
+                "converter_version": CONVERTER_VERSION,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "scenarios": {name: SCENARIOS[name] for name in scenarios},
+            },
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"성능 저하 {len(regressions)}건 (허용치 {args.tolerance:.0%}):")
+            for key, base_val, cur_val, change in regressions:
+                print(f"  {key}: {base_val} -> {cur_val} ({change:+.1%})")
+            return 1
+        print(f"기준선 대비 성능 저하 없음 (허용치 {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
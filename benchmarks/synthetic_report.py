@@ -0,0 +1,213 @@
+"""벤치마크용 합성 작업환경측정 결과표 PDF 생성기.
+
+외부 라이브러리 없이 PDF를 직접 작성합니다. 글꼴은 글리프 없이 ToUnicode
+CMap만 가진 Type0 글꼴이라 화면 표시용은 아니지만, pdfplumber가 읽는
+문자/좌표/선 정보는 실제 보고서와 같은 형태입니다.
+
+    python benchmarks/synthetic_report.py out.pdf --pages 80 --rows 14
+"""
+import argparse
+import random
+import zlib
+
+def _hex(s):
+    # Identity-H: 코드 = 유니코드 코드포인트 (BMP만 사용)
+    return "".join("%04X" % ord(c) for c in s)
+
+class SyntheticPdf:
+    """텍스트(한 글꼴)와 직선만 그리는 최소한의 PDF 작성기."""
+
+    def __init__(self):
+        self.pages = []
+        self.used = set()
+        self.info = {}  # 문서 정보(Info) 사전 {키: 값}
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+
+    def text(self, x, y, s, size=9):
+        self.used.update(s)
+        self.ops.append("BT /F1 %d Tf %.2f %.2f Td <%s> Tj ET" % (size, x, y, _hex(s)))
+
+    def line(self, x0, y0, x1, y1):
+        self.ops.append("%.2f %.2f m %.2f %.2f l S" % (x0, y0, x1, y1))
+
+    def save(self, path):
+        objs = []
+
+        def add(body):
+            objs.append(body)
+            return len(objs)
+
+        cat = add(None)
+        pages_id = add(None)
+        used = sorted(ord(c) for c in self.used)
+        cmap = ["/CIDInit /ProcSet findresource begin", "12 dict begin", "begincmap",
+                "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+                "/CMapName /Adobe-Identity-UCS def", "/CMapType 2 def",
+                "1 begincodespacerange", "<0000> <FFFF>", "endcodespacerange"]
+        for i in range(0, len(used), 100):
+            chunk = used[i:i + 100]
+            cmap.append("%d beginbfchar" % len(chunk))
+            cmap.extend("<%04X> <%04X>" % (c, c) for c in chunk)
+            cmap.append("endbfchar")
+        cmap += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+        cmap_data = "\n".join(cmap).encode("ascii")
+        tou = add(b"<< /Length %d >>\nstream\n" % len(cmap_data) + cmap_data + b"\nendstream")
+        desc = add(b"<< /Type /FontDescriptor /FontName /SynthGothic /Flags 4 /FontBBox [0 -200 1000 900] "
+                   b"/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 700 /StemV 80 >>")
+        w = " ".join("%d [500]" % c for c in used if c < 128)
+        cid = add(("<< /Type /Font /Subtype /CIDFontType2 /BaseFont /SynthGothic "
+                   "/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                   "/FontDescriptor %d 0 R /DW 1000 /W [%s] >>" % (desc, w)).encode("ascii"))
+        font = add(("<< /Type /Font /Subtype /Type0 /BaseFont /SynthGothic /Encoding /Identity-H "
+                    "/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (cid, tou)).encode("ascii"))
+        kids = []
+        for ops in self.pages:
+            data = zlib.compress("\n".join(ops).encode("ascii"))
+            content = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+            kids.append(add(("<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                             "/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                             % (pages_id, font, content)).encode("ascii")))
+        objs[cat - 1] = ("<< /Type /Catalog /Pages %d 0 R >>" % pages_id).encode("ascii")
+        objs[pages_id - 1] = ("<< /Type /Pages /Kids [%s] /Count %d >>"
+                              % (" ".join("%d 0 R" % k for k in kids), len(kids))).encode("ascii")
+        info = b""
+        if self.info:
+            # 값은 UTF-16BE 문자열, 한글 키는 이름 객체의 #xx 표기
+            entries = " ".join("/%s <FEFF%s>" % ("".join(chr(b) if chr(b).isalnum() and b < 128 else "#%02X" % b
+                                                         for b in k.encode("utf-8")), v.encode("utf-16-be").hex())
+                               for k, v in self.info.items())
+            info = b" /Info %d 0 R" % add(("<< %s >>" % entries).encode("ascii"))
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, body in enumerate(objs, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+        for off in offsets:
+            out += b"%010d 00000 n \n" % off
+        out += b"trailer\n<< /Size %d /Root %d 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, cat, info, xref)
+        with open(path, "wb") as f:
+            f.write(bytes(out))
+
+GROUPS = ["목공", "철근", "용접", "도장", "사면보강", "토공", "배관", "전기"]
+UNITS = ["비계설치", "거푸집조립 및 해체", "철근가공", "아크용접", "스프레이도장", "격자블록설치",
+         "낙석방지망설치", "굴착작업", "배관용접", "전선포설", "그라인딩", "연마작업"]
+FACTORS = ["소음", "용접흄", "산화철분진", "망간", "톨루엔", "크실렌", "초산에틸", "황산", "수산화나트륨",
+           "광물성분진", "목재분진", "미네랄오일미스트", "아세톤", "니켈", "시멘트분진", "고열"]
+FORMS = ["1조1교대", "2조2교대", "3조3교대"]
+
+# 열 경계(세로선) x 좌표: 공정명 | 단위작업장소 | 유해인자 | 근로자수 | 근무형태
+COLS = [30, 100, 230, 420, 480, 520]
+
+def generate(path, pages=10, rows=12, seed=0, wrap_every=4, timestamp_every=5, multiline_every=3,
+             cover=True, appendix_pages=0, ruled_appendix=False, ruled_rows=False):
+    """합성 보고서를 path에 씁니다.
+
+    pages          : 단위작업장소 측정결과 표 페이지 수
+    rows           : 표 하나에 들어가는 단위작업 수
+    wrap_every     : N번째 단위작업마다 이름을 두 줄로 나눔 (0이면 없음)
+    timestamp_every: N번째 단위작업마다 "09:00 ~ 15:30" 같은 측정시각 행 추가
+    multiline_every: N번째 단위작업마다 유해인자 칸을 두 줄로 나눔
+    cover          : 공장명/공사명이 있는 표지 페이지 포함 여부
+    appendix_pages : 표 뒤에 붙는 표 없는 부록 페이지 수
+    ruled_appendix : 부록 페이지에 그래프처럼 격자선을 그림 (선은 있지만 측정결과 표는 아닌 페이지)
+    ruled_rows     : 머리글과 단위작업마다 아래에 가로선을 그림 (가로선으로 행을 나누는 서식)
+    """
+    rnd = random.Random(seed)
+    d = SyntheticPdf()
+    if cover:
+        d.new_page()
+        d.text(60, 780, "작업환경측정 결과표", 16)
+        d.text(60, 740, "공장명 : (주)합성건설 ○ 사업장관리번호 : 123-45-67890")
+        d.text(60, 720, "공 사 명 : 합성 국도 12공구 건설공사")
+        d.text(60, 700, "측정기간 : 2025.07.01 ~ 2025.07.03")
+    gi = 0
+    for _ in range(pages):
+        d.new_page()
+        d.text(60, 800, "나-1. 단위작업장소별 측정결과")
+        top = 780
+        y = top - 14
+        hdr = ["공정명", "단위작업장소", "유해인자", "근로자수", "근무형태"]
+        for i, h in enumerate(hdr):
+            d.text(COLS[i] + (4 if i == 4 else 3), y, h)
+        y -= 16
+        if ruled_rows:
+            d.line(COLS[0], y + 12, COLS[-1], y + 12)
+        r = 0
+        while r < rows:
+            grp = GROUPS[gi % len(GROUPS)]
+            gi += 1
+            nunits = rnd.randint(1, 3)
+            for k in range(nunits):
+                if r >= rows:
+                    break
+                unit = rnd.choice(UNITS)
+                facs = rnd.sample(FACTORS, rnd.randint(1, 3))
+                if k == 0:
+                    d.text(COLS[0] + 3, y, grp)
+                wrap = wrap_every and r % wrap_every == wrap_every - 1 and " " in unit
+                name1, name2 = unit.split(" ", 1) if wrap else (unit, None)
+                d.text(COLS[1] + 3, y, name1)
+                head = facs[:2] if multiline_every and r % multiline_every == 0 else facs
+                d.text(COLS[2] + 3, y, " ".join(head))
+                d.text(COLS[3] + 3, y, "%d(%d)" % (rnd.randint(1, 30), rnd.randint(0, 5)))
+                d.text(COLS[4] + 4, y, rnd.choice(FORMS))
+                y -= 14
+                tail = facs[2:] if head is not facs else []
+                if name2 or tail:
+                    if name2:
+                        d.text(COLS[1] + 3, y, name2)
+                    if tail:
+                        d.text(COLS[2] + 3, y, " ".join(tail))
+                    y -= 14
+                if timestamp_every and r % timestamp_every == timestamp_every - 1:
+                    d.text(COLS[2] + 3, y, "09:%02d ~ 15:%02d" % (rnd.randint(0, 59), rnd.randint(0, 59)))
+                    y -= 14
+                if ruled_rows and (k == nunits - 1 or r == rows - 1):
+                    d.line(COLS[0], y + 10, COLS[-1], y + 10)
+                elif ruled_rows:
+                    d.line(COLS[1], y + 10, COLS[-1], y + 10)  # 공정 칸은 공정이 끝날 때까지 병합
+                r += 1
+        # 세로선으로 열을 나누고 행은 텍스트 위치로 구분 (horizontal_strategy="text")
+        bottom = y + 8
+        for x in COLS:
+            d.line(x, top, x, bottom)
+        d.line(COLS[0], top, COLS[-1], top)
+        d.line(COLS[0], bottom, COLS[-1], bottom)
+    for _ in range(appendix_pages):
+        d.new_page()
+        d.text(60, 780, "부록. 시료채취 및 분석방법")
+        for i in range(30):
+            d.text(60, 750 - i * 16, "측정방법 설명 문단 %d : 개인시료채취기를 이용하여 측정함" % i)
+        if ruled_appendix:
+            for k in range(6):
+                d.line(60 + k * 80, 760, 60 + k * 80, 280)
+                d.line(60, 760 - k * 96, 460, 760 - k * 96)
+    d.save(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 작업환경측정 결과표 PDF 생성")
+    parser.add_argument("output")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--wrap-every", type=int, default=4)
+    parser.add_argument("--timestamp-every", type=int, default=5)
+    parser.add_argument("--multiline-every", type=int, default=3)
+    parser.add_argument("--appendix-pages", type=int, default=0)
+    parser.add_argument("--ruled-appendix", action="store_true")
+    parser.add_argument("--ruled-rows", action="store_true")
+    parser.add_argument("--no-cover", action="store_true")
+    args = parser.parse_args(argv)
+    generate(args.output, pages=args.pages, rows=args.rows, seed=args.seed,
+             wrap_every=args.wrap_every, timestamp_every=args.timestamp_every,
+             multiline_every=args.multiline_every, cover=not args.no_cover,
+             appendix_pages=args.appendix_pages, ruled_appendix=args.ruled_appendix,
+             ruled_rows=args.ruled_rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import cProfile
+import marshal
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# 보고서에 보여줄 단계 순서 (측정되지 않은 단계는 생략)
+STAGES = ("open", "metadata", "extract_tables", "parse", "classify_factor", "postprocess", "render")
+
+# 한 프로세스에서 cProfile은 한 번에 하나만 켤 수 있음 (Python 3.12+의 sys.monitoring).
+# 앱의 작업 큐처럼 여러 스레드가 동시에 측정하면 cProfile을 켠 구간끼리는 차례로 실행
+_cprofile_lock = threading.Lock()
+
+class ConversionProfile:
+    """변환 한 번의 단계별/페이지별 소요 시간과 행 카운터.
+
+    변환 함수에 profile=ConversionProfile()을 넘기면 채워지고, 넘기지 않으면(None)
+    변환 코드는 측정을 전혀 하지 않습니다. cprofile=True 이면 변환 코드가 실행되는
+    동안(스트리밍 소비자 코드 제외)만 cProfile을 켜서 dump_stats()로 저장할 수 있습니다.
+    cProfile을 켠 측정끼리는 _cprofile_lock으로 차례로 실행하고, 다른 프로파일러가 이미 켜져 있어
+    켤 수 없으면 cProfile 없이 단계별 시간만 재고 그 이유를 cprofile_error에 남깁니다.
+
+    - stages: 단계 -> 누적 초. classify_factor는 parse 안에 포함된 시간입니다.
+      workers > 1 이면 extract_tables는 메인 프로세스가 워커 결과를 기다린 시간이고,
+      cProfile도 메인 프로세스만 측정합니다.
+    - counters: tables(찾은 표), rows(표의 전체 행), rows_kept(단위작업에 반영된 행),
+      rows_dropped_<이유>(header/footer/timestamp/short/orphan), skipped_pages,
+      reused_pages(페이지 캐시에서 재사용한 페이지), tier_<단계>(engine="tiered"에서 그 단계로 추출한 페이지)
+    - pages: 페이지별 {"page", "skipped", "reused", "tables", "rows", "extract_tables", "parse"}
+    """
+
+    def __init__(self, cprofile=False):
+        self.stages = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.pages = []
+        self.total = 0.0
+        self._profiler = cProfile.Profile() if cprofile else None
+        self.cprofile_error = None
+        self._running = False
+        self._locked = False
+        self._run_start = 0.0
+
+    def add(self, stage, seconds):
+        self.stages[stage] += seconds
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def add_page(self, page, skipped, tables, rows, extract_sec, parse_sec, reused=False):
+        self.pages.append({"page": page, "skipped": skipped, "reused": reused, "tables": tables, "rows": rows,
+                           "extract_tables": extract_sec, "parse": parse_sec})
+        self.add("extract_tables", extract_sec)
+        self.add("parse", parse_sec)
+
+    def _start_run(self):
+        self._running = True
+        if self._profiler is not None:
+            _cprofile_lock.acquire()
+            self._locked = True
+            try:
+                self._profiler.enable()
+            except ValueError as e:
+                # 다른 도구가 프로파일러를 쓰는 중: 변환은 계속하고 단계별 시간만 측정
+                self._profiler = None
+                self.cprofile_error = str(e)
+                self._release()
+        self._run_start = time.perf_counter()
+
+    def _stop_run(self):
+        self.total += time.perf_counter() - self._run_start
+        if self._profiler is not None:
+            self._profiler.disable()
+        self._release()
+        self._running = False
+
+    def _release(self):
+        if self._locked:
+            self._locked = False
+            _cprofile_lock.release()
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 시간을 단계 name에 더합니다 (측정 구간 밖이면 전체 시간/cProfile도 켬)."""
+        outer = not self._running
+        if outer:
+            self._start_run()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+            if outer:
+                self._stop_run()
+
+    def wrap(self, events):
+        """이벤트 제너레이터를 감싸 다음 이벤트를 만드는 동안만 전체 시간/cProfile을 잽니다.
+
+        이미 측정 중인 구간 안에서 다시 감싸면 그대로 통과시킵니다.
+        """
+        if self._running:
+            yield from events
+            return
+        while True:
+            self._start_run()
+            try:
+                event = next(events)
+            except StopIteration:
+                return
+            finally:
+                self._stop_run()
+            yield event
+
+    def stats_bytes(self):
+        """cProfile 결과를 pstats.Stats로 읽을 수 있는 바이트로 돌려줍니다 (cProfile을 쓰지 않았으면 None)."""
+        if self._profiler is None:
+            return None
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)
+
+    def dump_stats(self, path):
+        """cProfile 결과를 pstats 파일로 저장합니다 (python -m pstats 파일 / snakeviz 등으로 열람)."""
+        if self._profiler is None:
+            raise ValueError("cprofile=True로 만든 ConversionProfile만 저장할 수 있습니다")
+        self._profiler.dump_stats(path)
+
+    def top_functions(self, limit=15, sort="cumulative"):
+        """cProfile 상위 함수 목록 [(함수, 호출 수, 자체 시간, 누적 시간)]."""
+        if self._profiler is None:
+            return []
+        self._profiler.create_stats()
+        stats = pstats.Stats(self._profiler)
+        stats.sort_stats(sort)
+        rows = []
+        for func in stats.fcn_list[:limit]:
+            cc, nc, tt, ct, _ = stats.stats[func]
+            rows.append((pstats.func_std_string(func), nc, tt, ct))
+        return rows
+
+    def elapsed(self):
+        """지금까지 측정된 전체 시간 (측정 중이면 진행 중인 구간 포함)."""
+        if self._running:
+            return self.total + time.perf_counter() - self._run_start
+        return self.total
+
+    def to_dict(self):
+        stages = {name: round(self.stages[name], 4) for name in STAGES if name in self.stages}
+        return {
+            "total": round(self.elapsed(), 4),
+            "stages": stages,
+            "counters": dict(self.counters),
+            "pages": [dict(p, extract_tables=round(p["extract_tables"], 4), parse=round(p["parse"], 4))
+                      for p in self.pages],
+        }
+
+    def summary_lines(self):
+        """사람이 읽는 요약 (CLI 출력용)."""
+        d = self.to_dict()
+        lines = [f"전체 {d['total']:.3f}s"]
+        for name, sec in d["stages"].items():
+            share = f" ({sec / d['total']:.0%})" if d["total"] else ""
+            lines.append(f"  {name:<16}{sec:8.3f}s{share}")
+        lines.append("  " + ", ".join(f"{k} {v}" for k, v in sorted(d["counters"].items())))
+        return lines
@@ -0,0 +1,403 @@
+"""다른 도구에서 변환기를 호출하기 위한 로컬 HTTP 서비스 (표준 라이브러리만 사용).
+
+    python convert_service.py --port 8765 -j 2
+    curl --data-binary @report.pdf http://127.0.0.1:8765/convert                 # 텍스트
+    curl --data-binary @report.pdf "http://127.0.0.1:8765/convert?format=json"   # JSON
+    curl http://127.0.0.1:8765/health
+    curl http://127.0.0.1:8765/metrics                                           # Prometheus 지표
+
+POST /convert 본문에 PDF 바이트를 그대로 보내면 convert_pdf_to_txt()와 같은 텍스트
+(format=text, 기본) 또는 extract_job_data_impl() 결과의 JSON(format=json)을 돌려줍니다.
+쿼리 인자: page_filter, engine, low_memory(0/1), timeout(초, 서버 최대값 이하).
+
+변환은 서비스가 시작할 때 띄워 둔 워커 프로세스(pdfplumber와 변환기를 이미 import한
+상태)에서 실행하므로 요청마다 인터프리터를 새로 시작하지 않습니다.
+
+- 워커가 모두 바쁘면 최대 max_queue개 요청까지 기다리게 하고, 그 이상은 바로 503으로
+  거절합니다 (Retry-After 포함).
+- 요청마다 제한 시간(대기 시간 포함)이 지나면 504를 돌려주고, 그 요청을 처리하던 워커는
+  종료한 뒤 새 워커로 바꿉니다. 새 워커를 띄우지 못하면 기록하고 간격을 늘려 가며 다시
+  시도하며, 그동안 /health는 degraded=true와 실제로 살아 있는 워커 수(alive)를 보여줍니다.
+- 요청 결과(ok/failed/timeout/rejected), 변환 시간, 문서 페이지 수는 metrics에 source="service"로
+  기록하고 GET /metrics에서 워커 풀 상태와 함께 Prometheus 텍스트 형식으로 내보냅니다.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from metrics import CONTENT_TYPE, REGISTRY, record_conversion
+from pdf_summary_converter import (CONVERTER_VERSION, PAGE_FILTERS, TABLE_ENGINES, build_report,
+                                   fix_console_encoding, iter_extract_job_data, render_txt)
+from preload import START_METHODS, mp_context, preload
+
+DEFAULT_PORT = int(os.environ.get("PDF_SUMMARY_SERVICE_PORT", 8765))
+DEFAULT_TIMEOUT = float(os.environ.get("PDF_SUMMARY_SERVICE_TIMEOUT", 120))
+DEFAULT_MAX_QUEUE = int(os.environ.get("PDF_SUMMARY_SERVICE_MAX_QUEUE", 8))
+DEFAULT_MAX_BODY_MB = int(os.environ.get("PDF_SUMMARY_SERVICE_MAX_BODY_MB", 100))
+# 새 워커가 준비(import 완료)될 때까지 기다리는 최대 시간(초)
+WORKER_START_TIMEOUT = 60
+# 바꿀 워커를 띄우지 못했을 때 다시 시도하는 간격(초). 실패할 때마다 두 배, 최대 RETRY_MAX_SECONDS
+RETRY_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+
+FORMATS = ("text", "json")
+
+class QueueFull(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음."""
+
+class WorkerTimeout(Exception):
+    """제한 시간 안에 변환이 끝나지 않음."""
+
+class WorkerFailed(Exception):
+    """워커 프로세스가 응답 없이 종료됨."""
+
+def report_to_json(report):
+    """Report를 다른 도구가 읽기 쉬운 dict로 바꿉니다 (유해인자는 카테고리별 이름 목록)."""
+    return {
+        "converter_version": CONVERTER_VERSION,
+        "company_info": report.company_info,
+        "groups": [{"name": group.name, "units": [
+            {"name": unit.name, "workers": unit.workers, "work_form": list(unit.work_form),
+             "factors": report.factors_by_category([unit])}
+            for unit in group.units
+        ]} for group in report.groups],
+    }
+
+def _convert(data, fmt, page_filter, engine, low_memory):
+    """(본문, 페이지 수). 본문은 extract_job_data_impl() 결과를 format에 맞게 만든 것입니다."""
+    company_info, jobs, pages = {}, {}, 0
+    for event in iter_extract_job_data(data, page_filter=page_filter, low_memory=low_memory, engine=engine):
+        if event["type"] == "start":
+            company_info, jobs, pages = event["company_info"], event["jobs"], event["pages"]
+    report = build_report(company_info, jobs)
+    if fmt == "json":
+        return json.dumps(report_to_json(report), ensure_ascii=False), pages
+    return render_txt(report), pages
+
+def _worker_main(conn):
+    """(워커 프로세스) 요청 (data, fmt, page_filter, engine, low_memory)을 받아 ("ok", (본문, 페이지 수)) 또는
+    ("error", 메시지)를 보냅니다."""
+    preload()  # 표 추출 모듈까지 읽은 뒤 준비 완료 (fork/forkserver 방식이면 이미 읽혀 있음)
+
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        try:
+            conn.send(("ok", _convert(*request)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        try:
+            ready = self.conn.poll(WORKER_START_TIMEOUT) and self.conn.recv() == "ready"
+        except (EOFError, OSError):
+            ready = False  # 준비 전에 워커가 종료됨
+        if not ready:
+            self.kill()
+            raise WorkerFailed("워커를 시작하지 못했습니다")
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+class WorkerPool:
+    """미리 띄워 둔 변환 워커 프로세스 묶음.
+
+    동시에 처리하는 요청은 워커 수, 기다리는 요청은 max_queue개까지입니다.
+    start_method는 워커 시작 방식입니다 (preload.START_METHODS). 멈춘 워커는 HTTP 요청 스레드가
+    도는 중에 다시 띄우므로 threaded=True로 컨텍스트를 골라, "auto"이면 스레드가 있는 프로세스를
+    fork하지 않도록 "forkserver"(지원하지 않는 플랫폼은 "spawn")를 씁니다. forkserver는 PDF 모듈을 읽어 둔 서버에서 새 워커를
+    바로 fork합니다.
+    """
+
+    def __init__(self, workers=None, max_queue=DEFAULT_MAX_QUEUE, start_method=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._ctx = mp_context(start_method, threaded=True)
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+        self.counters = {"requests": 0, "ok": 0, "failed": 0, "rejected": 0, "timeouts": 0, "restarts": 0,
+                         "start_failures": 0}
+        self._active = 0
+        for _ in range(self.workers):
+            self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self._ctx)
+        with self._lock:
+            if self._closed:
+                worker.stop()
+                return
+            self._all.add(worker)
+        self._idle.put(worker)
+
+    def _restart_worker(self):
+        # (백그라운드 스레드) 새 워커를 띄울 때까지 간격을 늘려 가며 다시 시도
+        delay = RETRY_SECONDS
+        while not self._closed:
+            try:
+                self._add_worker()
+                return
+            except Exception as e:
+                self._count("start_failures")
+                print(f"워커를 다시 띄우지 못했습니다 ({type(e).__name__}: {e}), {delay:g}초 뒤 다시 시도합니다",
+                      file=sys.stderr, flush=True)
+            time.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def _replace(self, worker):
+        # 멈춘/죽은 워커는 종료하고, 새 워커는 백그라운드에서 띄워 응답을 늦추지 않음
+        with self._lock:
+            self._all.discard(worker)
+            self.counters["restarts"] += 1
+        worker.kill()
+        threading.Thread(target=self._restart_worker, name="pdf-summary-worker-restart", daemon=True).start()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def run(self, request, timeout):
+        """워커 하나에서 요청을 처리해 ("ok"|"error", 결과)를 돌려줍니다.
+
+        대기열이 가득 차면 QueueFull, 제한 시간(대기 포함)이 지나면 WorkerTimeout을 냅니다.
+        """
+        self._count("requests")
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise QueueFull()
+        deadline = time.monotonic() + timeout
+        try:
+            try:
+                worker = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                self._count("timeouts")
+                raise WorkerTimeout() from None
+            with self._lock:
+                self._active += 1
+            try:
+                worker.conn.send(request)
+                if not worker.conn.poll(max(deadline - time.monotonic(), 0)):
+                    self._count("timeouts")
+                    self._replace(worker)
+                    raise WorkerTimeout()
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                self._count("failed")
+                self._replace(worker)
+                raise WorkerFailed("워커 프로세스가 비정상 종료되었습니다") from None
+            finally:
+                with self._lock:
+                    self._active -= 1
+            self._idle.put(worker)
+            self._count("ok" if status == "ok" else "failed")
+            return status, payload
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, workers=self.workers, alive=len(self._all), busy=self._active,
+                        max_queue=self.max_queue, degraded=len(self._all) < self.workers)
+
+    def metric_families(self):
+        """metrics.Metrics.add_collector()에 넘길 워커 풀 상태."""
+        stats = self.stats()
+        return [("pdf_summary_service_workers", "gauge", "Conversion worker processes",
+                 {(("state", "alive"),): stats["alive"], (("state", "busy"),): stats["busy"]}),
+                ("pdf_summary_service_worker_restarts_total", "counter", "Worker processes replaced",
+                 {(): stats["restarts"]}),
+                ("pdf_summary_service_worker_start_failures_total", "counter", "Failed worker restarts",
+                 {(): stats["start_failures"]})]
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.stop()
+
+def _flag(value):
+    return value.lower() in ("1", "true", "yes", "on")
+
+class ConvertHandler(BaseHTTPRequestHandler):
+    server_version = f"pdf-summary-converter/{CONVERTER_VERSION}"
+
+    def _reply(self, code, body, content_type="application/json; charset=utf-8", headers=None):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, code, message, headers=None):
+        self._reply(code, json.dumps({"error": message}, ensure_ascii=False), headers=headers)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._reply(200, self.server.registry.render(), CONTENT_TYPE)
+            return
+        if path != "/health":
+            self._error(404, "GET /health, GET /metrics 또는 POST /convert만 지원합니다")
+            return
+        self._reply(200, json.dumps(dict(self.server.pool.stats(), converter_version=CONVERTER_VERSION)))
+
+    def _record(self, status, start, pages=None, error=None):
+        record_conversion("service", status, time.perf_counter() - start, pages=pages, error=error,
+                          registry=self.server.registry)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self._error(404, "POST /convert만 지원합니다")
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        fmt = params.get("format", "text")
+        page_filter = params.get("page_filter", "content")
+        engine = params.get("engine", "tables")
+        try:
+            timeout = float(params.get("timeout", self.server.timeout_sec))
+        except ValueError:
+            timeout = math.nan
+        if not math.isfinite(timeout) or timeout <= 0:
+            self._error(400, "timeout은 0보다 큰 초 단위 숫자여야 합니다")
+            return
+        timeout = min(timeout, self.server.timeout_sec)
+        if fmt not in FORMATS:
+            self._error(400, f"format은 {FORMATS} 중 하나여야 합니다")
+            return
+        if page_filter not in PAGE_FILTERS:
+            self._error(400, f"page_filter는 {PAGE_FILTERS} 중 하나여야 합니다")
+            return
+        if engine not in TABLE_ENGINES:
+            self._error(400, f"engine은 {TABLE_ENGINES} 중 하나여야 합니다")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._error(400, "Content-Length가 올바르지 않습니다")
+            return
+        if length == 0:
+            self._error(400, "요청 본문에 PDF를 넣어 주세요")
+            return
+        if length > self.server.max_body:
+            self._error(413, f"PDF가 너무 큽니다 (최대 {self.server.max_body // (1024 * 1024)} MB)")
+            return
+        data = self.rfile.read(length)
+
+        start = time.perf_counter()
+        try:
+            status, payload = self.server.pool.run(
+                (data, fmt, page_filter, engine, _flag(params.get("low_memory", "0"))), timeout)
+        except QueueFull:
+            self._record("rejected", start)
+            self._error(503, "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요", {"Retry-After": "5"})
+            return
+        except WorkerTimeout:
+            self._record("timeout", start)
+            self._error(504, f"제한 시간({timeout:g}초) 안에 변환하지 못했습니다")
+            return
+        except WorkerFailed as e:
+            self._record("failed", start, error=e)
+            self._error(500, str(e))
+            return
+        if status != "ok":
+            self._record("failed", start, error=payload.split(":", 1)[0])
+            self._error(422, payload)
+            return
+        payload, pages = payload
+        self._record("ok", start, pages)
+        headers = {"X-Elapsed-Seconds": f"{time.perf_counter() - start:.3f}"}
+        if fmt == "json":
+            self._reply(200, payload, headers=headers)
+        else:
+            self._reply(200, payload, "text/plain; charset=utf-8", headers)
+
+class ConvertServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pool, timeout_sec=DEFAULT_TIMEOUT, max_body_mb=DEFAULT_MAX_BODY_MB, quiet=False,
+                 registry=REGISTRY):
+        super().__init__(address, ConvertHandler)
+        self.pool = pool
+        self.registry = registry
+        registry.add_collector(pool.metric_families)
+        self.timeout_sec = timeout_sec
+        self.max_body = max_body_mb * 1024 * 1024
+        self.quiet = quiet
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 요약 변환 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본: 127.0.0.1, 로컬 전용)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"워커를 기다릴 수 있는 요청 수, 넘으면 503 (기본: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"요청별 최대 시간(초), 넘으면 504 (기본: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--max-body-mb", type=int, default=DEFAULT_MAX_BODY_MB,
+                        help=f"받을 수 있는 PDF 크기(MB) (기본: {DEFAULT_MAX_BODY_MB})")
+    parser.add_argument("--quiet", action="store_true", help="요청 로그를 출력하지 않음")
+    parser.add_argument("--start-method", choices=START_METHODS, default=None,
+                        help="워커 프로세스 시작 방식 (preload.START_METHODS 참고, 기본: auto = forkserver, 없으면 spawn)")
+    args = parser.parse_args(argv)
+    fix_console_encoding()
+
+    pool = WorkerPool(args.workers, args.max_queue, args.start_method)
+    server = ConvertServer((args.host, args.port), pool, args.timeout, args.max_body_mb, args.quiet)
+    print(f"http://{args.host}:{server.server_port} 에서 대기 중 (워커 {pool.workers}개, 대기열 {pool.max_queue}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import json
+import zlib
+from array import array
+from dataclasses import dataclass, field
+
+# 유해인자 카테고리 (출력 순서). Report.factor_categories에는 이 튜플의 인덱스가 들어갑니다.
+CATEGORY_ORDER = ("물리적인자", "분진류", "금속류", "유기화합물", "산 및 알칼리류", "금속가공유", "기타")
+_CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORY_ORDER)}
+
+# to_dict()/to_bytes() 형식 버전 (형식이 바뀌면 올리고 from_dict에서 검사)
+REPORT_FORMAT = 1
+
+@dataclass(slots=True)
+class Unit:
+    """검증을 마친 단위작업 하나."""
+    name: str           # 단위작업 이름 (이름이 없으면 "(공정명 없음)")
+    workers: str        # 근로자수 원문 그대로 (예: "16(4)"), 없으면 ""
+    work_form: tuple    # 근무형태 (정렬됨, 예: ("1조1교대",))
+    factors: array      # Report.factor_names 인덱스 (array('H'), 정렬됨)
+
+@dataclass(slots=True)
+class Group:
+    """공정 하나 (출력 블록 하나). units는 출력할 단위작업만 담습니다."""
+    name: str
+    units: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class Report:
+    """파싱 결과의 중간 표현. 한 번 파싱해 두면 render_txt()로 몇 번이든 출력할 수 있습니다.
+
+    유해인자 이름은 보고서 단위로 한 번만 저장하고(factor_names), 단위작업은 그 인덱스
+    배열만 가집니다. factor_categories[i]는 factor_names[i]의 CATEGORY_ORDER 인덱스입니다.
+    """
+    company_info: dict = field(default_factory=dict)
+    groups: list = field(default_factory=list)
+    factor_names: list = field(default_factory=list)
+    factor_categories: array = field(default_factory=lambda: array("B"))
+    _factor_ids: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def intern_factor(self, name, category):
+        """유해인자 이름의 인덱스 (처음 보는 이름이면 추가)."""
+        fid = self._factor_ids.get(name)
+        if fid is None:
+            fid = len(self.factor_names)
+            self._factor_ids[name] = fid
+            self.factor_names.append(name)
+            self.factor_categories.append(_CATEGORY_INDEX[category])
+        return fid
+
+    def factors_by_category(self, units):
+        """단위작업들의 유해인자를 합쳐 {카테고리: 정렬된 이름 목록}을 CATEGORY_ORDER 순서로 돌려줍니다."""
+        ids = set()
+        for u in units:
+            ids.update(u.factors)
+        merged = {}
+        for fid in ids:
+            merged.setdefault(self.factor_categories[fid], []).append(self.factor_names[fid])
+        return {CATEGORY_ORDER[c]: sorted(merged[c]) for c in sorted(merged)}
+
+    def to_dict(self):
+        """JSON으로 저장할 수 있는 간결한 dict (단위작업은 [이름, 근로자수, 근무형태, 유해인자 인덱스])."""
+        return {
+            "format": REPORT_FORMAT,
+            "company_info": self.company_info,
+            "factors": [[name, CATEGORY_ORDER[c]] for name, c in zip(self.factor_names, self.factor_categories)],
+            "groups": [[g.name, [[u.name, u.workers, list(u.work_form), u.factors.tolist()] for u in g.units]]
+                       for g in self.groups],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != REPORT_FORMAT:
+            raise ValueError(f"지원하지 않는 보고서 형식입니다: {data.get('format')!r}")
+        report = cls(company_info=dict(data["company_info"]))
+        for name, category in data["factors"]:
+            report.intern_factor(name, category)
+        for group_name, units in data["groups"]:
+            report.groups.append(Group(group_name, [
+                Unit(name, workers, tuple(work_form), array("H", factors))
+                for name, workers, work_form, factors in units
+            ]))
+        return report
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def to_bytes(self):
+        """zlib으로 압축한 JSON (캐시/배치 저장용)."""
+        return zlib.compress(self.to_json().encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls.from_json(zlib.decompress(data).decode("utf-8"))
@@ -0,0 +1,298 @@
+"""Streamlit 세션과 분리된 백그라운드 변환 작업 큐.
+
+앱은 변환을 버튼 콜백 안에서 직접 돌리지 않고 JobQueue에 작업을 넣은 뒤 작업 ID만
+세션 상태에 저장하고, 주기적으로 상태(get)를 읽어 진행률을 보여줍니다. 작업은 서버
+프로세스 전체가 공유하는 스레드 풀에서 실행되므로 위젯 조작으로 스크립트가 다시 실행돼도
+변환이 버려지지 않습니다.
+
+- 동시에 실행되는 작업 수는 max_running으로 제한하고, 빈 자리가 생기면 실행 중인 작업이
+  가장 적은 사용자(owner)의 작업부터 꺼내므로 큰 보고서를 올린 사용자 한 명이 다른 사용자를
+  막지 않습니다.
+- 취소는 협조 방식입니다. 작업 함수가 페이지(또는 파일)마다 job.check_cancelled()를 부릅니다.
+- 끝난 작업의 결과는 release()(다운로드 완료)할 때까지, 최대 result_ttl초 동안 보관합니다.
+"""
+import io
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_convert import iter_convert_uploads, record_entry
+from metrics import record_conversion
+from pdf_summary_converter import preview_pdf
+from result_cache import MemoryPageCache, PageCache, ResultCache, iter_convert_pdf_cached, pdf_digest
+
+# 서버 전체의 동시 실행 작업 수 / 찾아가지 않은 결과 보관 시간(초)
+DEFAULT_MAX_RUNNING = int(os.environ.get("PDF_SUMMARY_MAX_JOBS", max(2, min(4, os.cpu_count() or 1))))
+DEFAULT_RESULT_TTL = int(os.environ.get("PDF_SUMMARY_RESULT_TTL", 3600))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    """작업 함수가 취소 요청을 확인했을 때 (Job.check_cancelled)."""
+
+class Job:
+    """작업 하나의 상태. 작업 스레드가 쓰고 앱은 읽기만 합니다.
+
+    status: QUEUED -> RUNNING -> DONE / FAILED / CANCELLED
+    progress(0~1), message, preview(텍스트 또는 표 행 목록)는 작업 함수가 update()로
+    갱신하는 진행 정보이고, result는 작업 함수의 반환값, error는 실패 메시지입니다.
+    """
+
+    def __init__(self, owner, label, target, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.label = label
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "대기 중"
+        self.preview = None
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._call = (target, args, kwargs)
+        self._cancel = threading.Event()
+
+    def update(self, progress=None, message=None, preview=None):
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        if preview is not None:
+            self.preview = preview
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+class JobQueue:
+    """여러 세션이 공유하는 작업 큐 (스레드 안전)."""
+
+    def __init__(self, max_running=DEFAULT_MAX_RUNNING, result_ttl=DEFAULT_RESULT_TTL):
+        self.max_running = max(1, max_running)
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=self.max_running, thread_name_prefix="pdf-summary-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._pending = OrderedDict()  # owner -> deque(Job), 먼저 기다린 사용자 순
+        self._running = {}             # owner -> 실행 중인 작업 수
+
+    def submit(self, owner, label, target, *args, **kwargs):
+        """target(job, *args, **kwargs)를 실행할 작업을 넣고 작업 ID를 돌려줍니다."""
+        job = Job(owner, label, target, args, kwargs)
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job.id] = job
+            self._pending.setdefault(owner, deque()).append(job)
+            self._dispatch()
+        return job.id
+
+    def get(self, job_id):
+        """작업(Job) 또는 None (없거나 보관 시간이 지나 지워진 경우)."""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """대기 중이면 바로, 실행 중이면 작업 함수가 다음에 확인할 때 취소합니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job._cancel.set()
+            if job.status == QUEUED:
+                self._pending[job.owner].remove(job)
+                if not self._pending[job.owner]:
+                    del self._pending[job.owner]
+                self._finish(job, CANCELLED)
+            else:
+                job.message = "취소하는 중..."
+            return True
+
+    def release(self, job_id):
+        """결과를 가져간 작업을 지웁니다 (끝나지 않았으면 취소)."""
+        self.cancel(job_id)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status in FINISHED:
+                del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            return {"running": sum(self._running.values()),
+                    "queued": sum(len(jobs) for jobs in self._pending.values()),
+                    "max_running": self.max_running}
+
+    def metric_families(self):
+        """metrics.Metrics.add_collector()에 넘길 현재 작업 수 (실행 중/대기 중)."""
+        stats = self.stats()
+        return [("pdf_summary_jobs", "gauge", "Jobs in the shared conversion queue",
+                 {(("state", RUNNING),): stats["running"], (("state", QUEUED),): stats["queued"]}),
+                ("pdf_summary_jobs_max_running", "gauge", "Concurrent job limit", {(): stats["max_running"]})]
+
+    def shutdown(self):
+        with self._lock:
+            job_ids = list(self._jobs)
+        for job_id in job_ids:
+            self.cancel(job_id)
+        self._executor.shutdown(wait=False)
+
+    def _dispatch(self):
+        # 빈 자리마다 실행 중인 작업이 가장 적은 사용자의 작업을 꺼냄 (같으면 먼저 기다린 사용자)
+        while sum(self._running.values()) < self.max_running and self._pending:
+            owner = min(self._pending, key=lambda o: self._running.get(o, 0))
+            jobs = self._pending.pop(owner)
+            job = jobs.popleft()
+            if jobs:
+                self._pending[owner] = jobs  # 남은 작업은 맨 뒤에서 다시 차례를 기다림
+            self._running[owner] = self._running.get(owner, 0) + 1
+            job.status = RUNNING
+            job.started = time.time()
+            job.message = "변환 중..."
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        target, args, kwargs = job._call
+        job._call = None  # 업로드 바이트 등 인자는 작업이 끝나면 바로 해제
+        status = DONE
+        try:
+            job.result = target(job, *args, **kwargs)
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            status = FAILED
+        with self._lock:
+            self._finish(job, status)
+            self._running[job.owner] -= 1
+            if not self._running[job.owner]:
+                del self._running[job.owner]
+            self._dispatch()
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished = time.time()
+        job._call = None
+        if status == CANCELLED:
+            job.message = "취소됨"
+            job.result = None
+
+    def _purge_expired(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.status in FINISHED and now - job.finished > self.result_ttl:
+                del self._jobs[job_id]
+
+def convert_job(job, data, use_cache=True, low_memory=False, profile=None, preview=False):
+    """(작업 함수) PDF 바이트 하나를 변환합니다.
+
+    진행 중에는 머리말과 완성된 공정 블록을 job.preview로 보여주고, 결과는
+    {"text", "cached", "peak_rss_mb", "reused_pages", "profile"} 입니다.
+    preview=True이고 캐시된 결과가 없으면 먼저 앞쪽 표 페이지만 분석한 부분 결과
+    (pdf_summary_converter.preview_pdf)를 job.preview로 보여준 뒤 같은 작업에서 전체 변환을
+    이어 갑니다. 미리보기에서 추출한 페이지는 페이지 캐시(use_cache=False이면 이 작업만의
+    result_cache.MemoryPageCache)로 전체 변환에서 다시 쓰고, 전체 변환이 미리보기보다 뒤 페이지까지
+    진행하면 공정 블록 미리보기로 바뀝니다.
+    결과/실패/취소는 metrics에 source="app"으로 기록합니다.
+    """
+    header_text = ""
+    blocks = {}
+    result = None
+    pages = None
+    page = 0
+    preview_until = 0  # 부분 결과 미리보기가 분석한 마지막 페이지
+    status, error = "failed", None
+    start = time.perf_counter()
+    page_cache = None  # None이면 iter_convert_pdf_cached의 기본값
+    events = None
+    try:
+        if preview and not (use_cache and ResultCache().contains(pdf_digest(data))):
+            job.update(message="미리보기 만드는 중...")
+            page_cache = PageCache() if use_cache else MemoryPageCache()
+            quick = preview_pdf(data, low_memory=low_memory, page_cache=page_cache, cancel=job.check_cancelled)
+            if quick["partial"]:
+                preview_until = quick["parsed_pages"]
+                job.update(preview_until / quick["pages"],
+                           f"미리보기 완료 (앞 {preview_until}/{quick['pages']}페이지), 전체 변환 중...",
+                           quick["text"])
+        events = iter_convert_pdf_cached(data, use_cache=use_cache, profile=profile, low_memory=low_memory,
+                                         page_cache=page_cache)
+        for event in events:
+            job.check_cancelled()
+            if event["type"] == "header":
+                header_text = event["text"]
+            elif event["type"] == "progress":
+                page, pages = event["page"], event["pages"]
+                job.update(event["page"] / event["pages"],
+                           f"페이지 분석 중... ({event['page']}/{event['pages']}, "
+                           f"표 없는 페이지 {event['skipped_pages']}개 건너뜀, "
+                           f"이전 결과 재사용 {event['reused_pages']}개)")
+            elif event["type"] == "group":
+                blocks[event["index"]] = event["text"]
+                if page >= preview_until:  # 그 전까지는 더 많이 분석한 부분 결과를 계속 보여줌
+                    job.update(preview="\n".join([header_text] + [blocks[i] for i in sorted(blocks)]))
+            elif event["type"] == "done":
+                result = {"text": event["text"], "cached": event.get("cached", False),
+                          "peak_rss_mb": event.get("peak_rss_mb"), "reused_pages": event.get("reused_pages", 0),
+                          "profile": profile}
+                pages = event.get("pages", pages)
+        status = "ok"
+    except JobCancelled:
+        status = "cancelled"
+        raise
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if events is not None:
+            events.close()  # 취소되면 열린 PDF/프로세스 풀을 바로 정리
+        record_conversion("app", status, time.perf_counter() - start, pages=pages,
+                          cached=result["cached"] if result and use_cache else None, error=error)
+    job.update(1.0, "분석 완료")
+    return result
+
+def convert_uploads_job(job, files, file_names, zip_names, workers=None, use_cache=True, low_memory=False):
+    """(작업 함수) PDF 바이트 여러 개를 동시에 변환해 ZIP 하나로 묶습니다.
+
+    zip_names는 ZIP 안의 결과 파일 이름이고, 진행 중에는 파일별 상태 표(rows)를
+    job.preview로 보여줍니다. 결과는 {"zip"(io.BytesIO), "rows", "failed"}.
+    파일마다 결과를 metrics에 source="app_batch"로 기록합니다.
+    """
+    rows = [{"파일": name, "상태": "대기", "페이지": None, "소요(초)": None, "최대 RSS(MB)": None}
+            for name in file_names]
+    job.update(preview=rows)
+    failed = 0
+    zip_buffer = io.BytesIO()
+    uploads = iter_convert_uploads(files, workers=workers, use_cache=use_cache, low_memory=low_memory,
+                                   cancel=job.check_cancelled)
+    try:
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for done_count, (index, entry) in enumerate(uploads, 1):
+                record_entry("app_batch", entry, use_cache)
+                job.check_cancelled()
+                row = rows[index]
+                if entry["status"] == "ok":
+                    zf.writestr(zip_names[index], entry["text"])
+                    row["상태"] = "캐시" if entry["cached"] else "완료"
+                    row["페이지"] = entry.get("pages")
+                else:
+                    failed += 1
+                    row["상태"] = f"실패: {entry['error']}"
+                row["소요(초)"] = entry["duration"]
+                row["최대 RSS(MB)"] = entry.get("peak_rss_mb")
+                job.update(done_count / len(rows), f"변환 중... ({done_count}/{len(rows)})")
+    finally:
+        uploads.close()
+    # getvalue()로 복사하지 않고 버퍼를 그대로 넘김 (st.download_button이 BytesIO를 바로 받음)
+    return {"zip": zip_buffer, "rows": rows, "failed": failed}
@@ -0,0 +1,65 @@
+from collections import deque
+
+class KeywordMatcher:
+    """여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤.
+
+    각 키워드에는 우선순위(작을수록 우선)가 붙고, best_priority()는 문자열에
+    포함된 키워드 중 가장 높은 우선순위를 돌려줍니다. 키워드가 서로 겹쳐도
+    (예: "수산화" / "산화철") 모든 출현을 고려하므로 `any(k in s for k in ...)`를
+    우선순위 순서대로 돌리는 것과 결과가 같습니다.
+    """
+
+    def __init__(self, keywords):
+        # keywords: (keyword, priority) 목록
+        self._goto = [{}]
+        self._out = [None]
+        for word, priority in keywords:
+            if not word:
+                continue
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(None)
+                node = nxt
+            if self._out[node] is None or priority < self._out[node]:
+                self._out[node] = priority
+        self._build()
+
+    def _build(self):
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[nxt] = self._goto[f].get(ch, 0)
+                # 실패 링크를 따라 도달하는 키워드의 우선순위도 이 노드의 출력에 합침
+                inherited = self._out[fail[nxt]]
+                if inherited is not None and (self._out[nxt] is None or inherited < self._out[nxt]):
+                    self._out[nxt] = inherited
+        self._fail = fail
+
+    def best_priority(self, text, stop_at=0):
+        """text에 포함된 키워드의 최소 우선순위, 없으면 None. stop_at에 도달하면 즉시 반환."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        node = 0
+        best = None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            p = out[node]
+            if p is not None and (best is None or p < best):
+                best = p
+                if best <= stop_at:
+                    break
+        return best
@@ -0,0 +1,197 @@
+"""변환 서비스 지표 (Prometheus 텍스트 형식).
+
+변환을 실행하는 곳(앱 작업, 배치, HTTP 서비스, convert_pdf_to_txt)이 끝날 때마다
+record_conversion()으로 결과를 남기면 프로세스 전체가 공유하는 REGISTRY에 카운터와
+히스토그램이 쌓입니다. 기록은 잠금 한 번과 dict 갱신뿐이므로 항상 켜 두어도 됩니다.
+
+내보내는 방법:
+- GET /metrics: convert_service는 같은 서버에서, 앱은 PDF_SUMMARY_METRICS_PORT를 지정하면
+  start_http_server()로 띄운 작은 서버에서 제공합니다.
+- textfile: PDF_SUMMARY_METRICS_TEXTFILE(또는 batch_convert --metrics-textfile)을 지정하면
+  기록할 때마다 파일을 원자적으로 교체합니다 (node_exporter textfile collector용).
+
+지표:
+- pdf_summary_conversions_total{source,status}    변환 수 (status: ok/failed/cancelled, 서비스는 timeout/rejected도)
+- pdf_summary_conversion_errors_total{source,error} 실패한 변환의 예외 종류별 수
+- pdf_summary_cache_lookups_total{source,result}  결과 캐시 조회 (result: hit/miss)
+- pdf_summary_conversion_seconds{source}          변환 시간 히스토그램
+- pdf_summary_document_pages{source}              문서당 페이지 수 히스토그램
+- 그 밖에 add_collector()로 등록한 현재값 (작업 큐 길이, 서비스 워커 수 등)
+
+앱 작업이 예외로 실패하면 status="failed"와 conversion_errors_total{error=<예외 이름>}이 늘어나므로
+실패율 알림은 예를 들어 다음처럼 걸 수 있습니다.
+
+    sum(rate(pdf_summary_conversions_total{status="failed"}[15m]))
+      / sum(rate(pdf_summary_conversions_total[15m])) > 0.05
+"""
+import os
+import threading
+from bisect import bisect_left
+
+DEFAULT_PORT = int(os.environ.get("PDF_SUMMARY_METRICS_PORT", 0))  # 0이면 띄우지 않음
+DEFAULT_TEXTFILE = os.environ.get("PDF_SUMMARY_METRICS_TEXTFILE") or None
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+PAGE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# 이름 -> (종류, 설명, 히스토그램 구간)
+METRICS = {
+    "pdf_summary_conversions_total": ("counter", "PDF conversions by outcome", None),
+    "pdf_summary_conversion_errors_total": ("counter", "Failed conversions by exception type", None),
+    "pdf_summary_cache_lookups_total": ("counter", "Result cache lookups", None),
+    "pdf_summary_conversion_seconds": ("histogram", "Conversion wall time in seconds", LATENCY_BUCKETS),
+    "pdf_summary_document_pages": ("histogram", "Pages per converted document", PAGE_BUCKETS),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _labels_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metrics:
+    """스레드 안전한 카운터/히스토그램 모음.
+
+    값은 (이름, 레이블 튜플) 키로 저장하고 render()에서 Prometheus 텍스트로 만듭니다.
+    textfile을 지정하면 기록할 때마다 그 파일도 갱신합니다.
+    """
+
+    def __init__(self, textfile=DEFAULT_TEXTFILE):
+        self.textfile = textfile
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}  # key -> [구간별 개수..., 합계, 개수]
+        self._collectors = []
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, tuple(sorted(labels.items())) if isinstance(labels, dict) else labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())) if isinstance(labels, dict) else labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * (len(buckets) + 2) + [0]
+            hist[bisect_left(buckets, value)] += 1  # 마지막 칸은 +Inf
+            hist[-2] += value
+            hist[-1] += 1
+
+    def add_collector(self, fn):
+        """render()할 때마다 부를 함수. [(이름, 종류, 설명, {레이블 dict 튜플: 값})] 목록을 돌려줘야 합니다."""
+        with self._lock:
+            self._collectors.append(fn)
+
+    def render(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(hist) for key, hist in self._histograms.items()}
+            collectors = list(self._collectors)
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            series = sorted((key[1], value) for key, value in (counters if kind == "counter" else histograms).items()
+                            if key[0] == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind == "counter":
+                    lines.append(f"{name}{_labels_text(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, n in zip(buckets + ("+Inf",), value):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_labels_text(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels_text(labels)} {_number(value[-2])}")
+                lines.append(f"{name}_count{_labels_text(labels)} {value[-1]}")
+        for fn in collectors:
+            try:
+                families = fn()
+            except Exception:
+                continue  # 현재값 수집 실패가 지표 전체를 막지 않도록
+            for name, kind, help_text, values in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in values.items():
+                    lines.append(f"{name}{_labels_text(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path=None):
+        """render() 결과를 path(기본: self.textfile)에 원자적으로 씁니다."""
+        import tempfile
+
+        path = path or self.textfile
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".prom")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+REGISTRY = Metrics()
+
+def record_conversion(source, status, seconds, pages=None, cached=None, error=None, registry=REGISTRY):
+    """변환 한 건의 결과를 기록합니다.
+
+    source: 변환을 실행한 곳 (app, app_batch, batch, service, library 등)
+    status: "ok", "failed", "cancelled" (서비스는 "timeout", "rejected"도). 시간/페이지 수는 ok일 때만 관찰
+    cached: 결과 캐시를 조회했으면 적중 여부 (조회하지 않았으면 None)
+    error: 실패 원인 (예외 객체 또는 예외 이름)
+    """
+    source = (("source", source),)
+    registry.inc("pdf_summary_conversions_total", source + (("status", status),))
+    if error is not None:
+        error_type = error if isinstance(error, str) else type(error).__name__
+        registry.inc("pdf_summary_conversion_errors_total", (("error", error_type),) + source)
+    if cached is not None:
+        registry.inc("pdf_summary_cache_lookups_total", (("result", "hit" if cached else "miss"),) + source)
+    if status == "ok":
+        registry.observe("pdf_summary_conversion_seconds", seconds, source)
+        if pages is not None:
+            registry.observe("pdf_summary_document_pages", pages, source)
+    if registry.textfile:
+        try:
+            registry.write_textfile()
+        except OSError:
+            pass  # 지표 파일을 못 써도 변환 결과에는 영향 없음
+
+def start_http_server(port=DEFAULT_PORT, host="127.0.0.1", registry=REGISTRY):
+    """데몬 스레드에서 GET /metrics 서버를 띄우고 서버 객체를 돌려줍니다 (port=0이면 None)."""
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # 스크레이프마다 로그를 남기지 않음
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="pdf-summary-metrics", daemon=True).start()
+    return server
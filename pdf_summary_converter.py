@@ -1,81 +1,99 @@
-import pdfplumber
+import io
+import os
 import re
 from collections import defaultdict
+from functools import lru_cache
+from itertools import accumulate, compress
 import sys
+import time
+from array import array
+from bisect import bisect_right
+from xml.etree import ElementTree
 
-# Windows console encoding fix
-if sys.platform == 'win32':
-    sys.stdout.reconfigure(encoding='utf-8')
+from job_model import Group, Report, Unit
+from keyword_matcher import KeywordMatcher
+from metrics import record_conversion
+from preload import mp_context
+
+# pdfplumber/pdfminer와 표 추출 엔진(row_engine, table_layout, tiered_engine), 프로세스 풀은 import가
+# 무거우므로 처음 쓰는 함수 안에서 읽습니다. 미리 읽어 두려면 preload.preload()를 부릅니다.
+
+# 출력 형식이나 파싱 결과가 바뀌면 올려서 기존 캐시(result_cache)를 무효화
+CONVERTER_VERSION = "4"
+
+def fix_console_encoding():
+    """Windows 콘솔에서 한글 출력이 깨지지 않도록 stdout을 UTF-8로 바꿉니다 (CLI 진입점에서 호출)."""
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
 
 def clean_text(text):
     if not text:
         return ""
     return text.replace("\n", " ").strip()
 
-def classify_factor(factor_name):
-    """유해인자 이름을 기반으로 카테고리를 분류합니다 ([별표 12] 참조)."""
-    factor_name = factor_name.replace("\n", "").strip()
-    if not factor_name or factor_name == "유해인자":
-        return None
-    
+# 유해인자 분류 규칙 ([별표 12] 참조). 위에 있는 카테고리가 우선합니다.
+FACTOR_RULES = [
     # 0. 물리적 인자
-    if "소음" in factor_name or "고열" in factor_name:
-        return "물리적인자"
+    ("물리적인자", ["소음", "고열"]),
 
     # 1. 금속가공유 (미네랄오일 등) - 별표 12 기준
-    if any(x in factor_name for x in ["미네랄오일", "오일미스트", "금속가공유"]):
-        return "금속가공유"
+    ("금속가공유", ["미네랄오일", "오일미스트", "금속가공유"]),
 
     # 2. 유기화합물 (가장 많음, 우선순위 높여서 산성 오분류 방지)
     # 아세톤, 톨루엔, 크실렌(자일렌), 메탄올, 에탄올, 이소프로필알코올, 
     # 초산메틸/에틸/부틸, 디메틸..., 벤젠, 헥산, 신너, 가솔린, 나프타 등
-    organic_keywords = [
+    # '초산' 단독은 산류로 분류될 수 있으나, '초산XX'는 유기화합물
+    ("유기화합물", [
         "아세톤", "톨루엔", "크실렌", "자일렌", "부틸", "에탄올", "메탄올", "이소프로필", "알코올",
         "초산메틸", "초산에틸", "초산부틸", "초산이소", "초산(아세트산)", "아세트산", # 아세트산은 사실 산류일수도 있지만 유기용제로 주로 분류됨 (별표12 유기화합물 108호 초산 등)
         "디메틸", "벤젠", "헥산", "신너", "가솔린", "나프타", "와이어", "유기화합물", "트리클로로",
         "디클로로", "메틸", "에틸", "스티렌", "포름알데히드", "에테르", "케톤", "솔벤트", "세척제", "유기용제"
-    ]
-    # '초산' 단독은 산류로 분류될 수 있으나, '초산XX'는 유기화합물
-    if any(x in factor_name for x in organic_keywords):
-        # 예외: 무기산이 섞여있어서 유기화합물로 분류되면 안되는 경우? (거의 없음)
-        return "유기화합물"
+    ]),
 
     # 3. 산 및 알칼리류
-    acid_alkali_keywords = [
-        "황산", "염산", "질산", "불산", "불소", "수산화", "암모니아", "과산화", "산 및 알칼리", "포르말린" # 포르말린은 알데히드지만 관리상.. 별표12에선 유기화합물(포름알데히드). 여기선 키워드 주의
-    ]
     # 별표12에 포름알데히드는 유기화합물임. 위에서 처리됨.
-    if any(x in factor_name for x in acid_alkali_keywords):
-        return "산 및 알칼리류"
-    
-    # '산'이 들어가지만 유기가 아닌것 (위에서 유기 다 걸러짐)
-    if "산" in factor_name and not any(x in factor_name for x in ["산화", "탄산", "규산", "초산", "유산", "젖산"]): 
-        # 산화철(금속), 규산(분진), 탄산(가스/분진) 등 제외
-        # 초산은 위에서 유기화합물로 처리 (아세트산)
-        # 하지만 그냥 '산' 글자만으로는 위험. 구체적 산 이름 위주로.
-        pass
-
-    if "알칼리" in factor_name:
-        return "산 및 알칼리류"
+    # '산' 글자만으로는 위험(산화철, 규산, 탄산 등)하므로 구체적 산 이름 위주로.
+    ("산 및 알칼리류", [
+        "황산", "염산", "질산", "불산", "불소", "수산화", "암모니아", "과산화", "산 및 알칼리", "포르말린", # 포르말린은 알데히드지만 관리상.. 별표12에선 유기화합물(포름알데히드). 여기선 키워드 주의
+        "알칼리"
+    ]),
 
     # 4. 금속류
-    metal_keywords = [
+    ("금속류", [
         "산화철", "망간", "티타늄", "용접흄", "구리", "납", "니켈", "크롬", "아연", "알루미늄", 
         "카드뮴", "코발트", "주석", "안티몬", "비소", "수은", "금속", "스테인리스", "철분"
-    ]
-    if any(x in factor_name for x in metal_keywords):
-        return "금속류"
+    ]),
 
     # 5. 분진류
-    dust_keywords = [
+    ("분진류", [
         "분진", "석영", "규소", "시멘트", "광물", "곡물", "목재", "면", "활석", "카본", "유리"
-    ]
-    if any(x in factor_name for x in dust_keywords):
-        return "분진류"
+    ]),
+]
+
+# 규칙 표를 한 번만 오토마톤으로 컴파일 (토큰당 한 번의 스캔으로 최우선 카테고리를 찾음)
+_FACTOR_CATEGORIES = [cat for cat, _ in FACTOR_RULES]
+_FACTOR_MATCHER = KeywordMatcher(
+    (kw, priority) for priority, (_, keywords) in enumerate(FACTOR_RULES) for kw in keywords
+)
 
-    return "기타"
+# 같은 유해인자 이름이 수백 번 반복되므로 토큰 -> 카테고리 결과를 메모 (크기 제한)
+FACTOR_MEMO_SIZE = 4096
+
+@lru_cache(maxsize=FACTOR_MEMO_SIZE)
+def classify_factor(factor_name):
+    """유해인자 이름을 기반으로 카테고리를 분류합니다 ([별표 12] 참조)."""
+    factor_name = factor_name.replace("\n", "").strip()
+    if not factor_name or factor_name == "유해인자":
+        return None
+
+    priority = _FACTOR_MATCHER.best_priority(factor_name)
+    if priority is None:
+        return "기타"
+    return _FACTOR_CATEGORIES[priority]
 
 def extract_job_data(pdf_path):
+    import pdfplumber
+
     # 계층적 데이터 저장: jobs[group_name][unit_name] = data
     jobs = defaultdict(lambda: defaultdict(lambda: {
         "job_content": "", # text accumulating
@@ -226,9 +244,636 @@ def extract_job_data(pdf_path):
     # (Since I cannot edit inside tool call as text, I will write the full function string below)
     return extract_job_data_impl(pdf_path)
 
-def extract_job_data_impl(pdf_path):
-    jobs = defaultdict(list) 
+TABLE_SETTINGS = {"horizontal_strategy": "text"}
+
+# 같은 서식의 페이지에서 열 경계/표 영역을 재사용 (table_layout 참고, 결과는 동일)
+REUSE_TABLE_LAYOUT = True
+
+# 저메모리 모드(low_memory=True)에서 PDF를 다시 여는 페이지 간격.
+# pdfminer는 문서를 닫을 때까지 읽은 객체(폰트, 콘텐츠 스트림 등)를 계속 들고 있으므로
+# 이 간격마다 문서를 새로 열어 최대 메모리를 페이지 수와 상관없이 일정하게 유지합니다.
+LOW_MEMORY_WINDOW = 50
+
+# 표 추출 엔진
+#   "tables": pdfplumber의 extract_tables (REUSE_TABLE_LAYOUT이면 table_layout의 격자 경로 사용) (기본값)
+#   "rows"  : row_engine. page.layout의 글자/세로선에서 바로 행과 열을 나눔. 페이지가 하나의
+#             완전한 격자로 확인될 때만 쓰고 나머지는 "tables"로 처리하므로 결과는 같음
+#   "tiered": tiered_engine. 그려진 선만으로 먼저 추출하고, 측정결과 표로 보이지 않는 페이지만
+#             "rows"로 다시 추출. 행마다 괘선이 있는 서식에서 빠르지만 결과가 같다고 보장하지 않음
+TABLE_ENGINES = ("tables", "rows", "tiered")
+
+# 회사명/공사명이 문서 정보(Info)나 XMP에 직접 들어 있으면 첫 페이지보다 먼저 사용 (항목 -> 키).
+# 일반 키 Company/Project는 쓰지 않음: Word/HWP에서 만든 PDF는 작성자(측정기관) 오피스 설정의
+# 회사명이 /Company에 들어가므로 측정 대상 사업장 대신 측정기관 이름이 나옴
+DOC_INFO_KEYS = {"name": ("공장명",), "project": ("공사명",)}
+# 첫 페이지에서 회사명/공사명을 먼저 찾아보는 머리말 영역 (페이지 위쪽 비율)
+HEADER_REGION = 0.4
+# page.extract_text()의 줄 묶음 기준 (pdfplumber 기본 y_tolerance)
+_LINE_TOLERANCE = 3
+
+_COMPANY_NAME_PATTERN = re.compile(r"공장명\s*:\s*(.*?)\s*[○\n]")
+_PROJECT_PATTERN = re.compile(r"공 사 명\s*:\s*(.*)")
+
+def _xmp_properties(pdf):
+    """XMP 메타데이터의 속성 {로컬 이름: 값} (없거나 읽을 수 없으면 빈 dict)."""
+    from pdfminer.pdftypes import resolve1
+
+    try:
+        stream = resolve1(pdf.doc.catalog.get("Metadata"))
+        if stream is None:
+            return {}
+        root = ElementTree.fromstring(stream.get_data())
+    except Exception:
+        return {}
+    props = {}
+    for elem in root.iter():
+        # <pdfx:공장명>값</pdfx:공장명> 과 <rdf:Description pdfx:공장명="값"> 둘 다 허용
+        if elem.text and elem.text.strip():
+            props.setdefault(elem.tag.rsplit("}", 1)[-1], elem.text.strip())
+        for name, value in elem.attrib.items():
+            props.setdefault(name.rsplit("}", 1)[-1], value)
+    return props
+
+def _doc_info_company(pdf):
+    """문서 정보/XMP에 명시된 회사명/공사명."""
+    company_info = {}
+    sources = [pdf.metadata]
+    if pdf.doc.catalog.get("Metadata") is not None:
+        sources.append(_xmp_properties(pdf))
+    for source in sources:
+        for field, keys in DOC_INFO_KEYS.items():
+            if field in company_info:
+                continue
+            for key in keys:
+                value = source.get(key)
+                if isinstance(value, str) and value.strip():
+                    company_info[field] = value.strip()
+                    break
+    return company_info
+
+def _header_text(page):
+    """첫 페이지 위쪽 HEADER_REGION 안의 줄만 뽑은 텍스트, 영역을 나눌 수 없으면 None.
+
+    경계를 글자 줄 사이(줄 묶음 간격보다 넓은 곳)에 맞추므로 결과는 page.extract_text()의
+    앞쪽 줄들과 같습니다. 세로 글자가 섞인 페이지는 줄 순서가 달라질 수 있어 나누지 않습니다.
+    """
+    chars = page.chars
+    if not chars or not all(c["upright"] for c in chars):
+        return None
+    limit = page.bbox[1] + page.height * HEADER_REGION
+    tops = sorted({c["top"] for c in chars})
+    for prev, top in zip(tops, tops[1:]):
+        if top > limit and top - prev > _LINE_TOLERANCE:
+            return page.filter(lambda obj: obj.get("object_type") != "char" or obj["top"] < top).extract_text()
+    return None
+
+def _extract_company_info(pdf):
+    """회사명/공사명을 추출합니다.
+
+    문서 정보/XMP에 둘 다 있으면 그 값을 쓰고, 아니면 첫 페이지의 머리말 영역에서
+    공장명/공사명을 찾습니다. 머리말에서 둘 다 찾지 못하면 첫 페이지 전체 텍스트로
+    판단합니다 (머리말 결과는 전체 텍스트로 판단한 결과와 같을 때만 사용).
+    첫 페이지 레이아웃은 표 추출 때 그대로 다시 씁니다 (_iter_page_tables).
+    """
+    doc_info = _doc_info_company(pdf)
+    if len(doc_info) == len(DOC_INFO_KEYS):
+        return doc_info
     company_info = {}
+    try:
+        page = pdf.pages[0]
+        header_text = _header_text(page)
+        if header_text is not None:
+            name = _COMPANY_NAME_PATTERN.search(header_text)
+            project = _PROJECT_PATTERN.search(header_text)
+            # 공사명 값이 머리말 경계 바로 아래 줄에 있으면 잘린 텍스트에서는 빈 값이나 경계 앞부분만
+            # 잡히므로, 값이 비었거나 머리말 끝까지 이어지는 일치는 전체 텍스트로 다시 판단
+            if (name and project and name.group(1).strip() and project.group(1).strip()
+                    and project.end() < len(header_text)):
+                # 정규식 결과가 줄 단위 판단을 항상 덮어쓰므로 전체 텍스트를 볼 필요가 없음
+                return dict({"name": name.group(1).strip(), "project": project.group(1).strip()}, **doc_info)
+
+        first_page_text = page.extract_text()
+        if first_page_text:
+            lines = first_page_text.split('\n')
+            if lines:
+                for line in lines:
+                    clean_line = line.strip()
+                    if not clean_line: continue
+                    
+                    # Skip typical report headers
+                    if "나-1" in clean_line or "단위작업" in clean_line:
+                        if ":" in clean_line:
+                            # Extract content after colon
+                            temp = clean_line.split(":", 1)[1].strip()
+                            if temp:
+                                company_info["name"] = temp
+                                break
+                        continue
+                    
+                    if "측정" in clean_line and "결과" in clean_line: continue
+                    
+                    # If we reached here, it might be the company name line
+                    company_info["name"] = clean_line
+                    break
+                    
+        # Use regex if specific pattern found (more reliable)
+        if "공장명" in first_page_text:
+            m = _COMPANY_NAME_PATTERN.search(first_page_text)
+            if m: company_info["name"] = m.group(1).strip()
+
+        if "공 사 명" in first_page_text:
+            m = _PROJECT_PATTERN.search(first_page_text)
+            if m: company_info["project"] = m.group(1).strip()
+    except: pass
+    company_info.update(doc_info)
+    return company_info
+
+# 페이지 사전 필터 (표가 없는 표지/부록/그래프 페이지를 extract_tables 전에 제외)
+#   "off"     : 필터 없음 (strict 모드, 모든 페이지에 extract_tables 실행)
+#   "content" : 콘텐츠 스트림에 선/사각형 그리기와 텍스트 출력이 모두 있는 페이지만 처리.
+#               세로선(vertical_strategy="lines")과 글자(horizontal_strategy="text")가
+#               없으면 표가 만들어질 수 없으므로 결과가 바뀌지 않음 (기본값)
+#   "keywords": "content" + 페이지 글자에 표 머리글/행에 쓰이는 단어가 있는 페이지만 처리.
+#               더 많이 거르지만 서식이 특이한 보고서에서는 행을 놓칠 수 있음
+PAGE_FILTERS = ("off", "content", "keywords")
+PAGE_FILTER_KEYWORDS = ("공정", "단위작업", "작업장소", "유해인자", "근로자", "근무형태", "교대")
+
+_PATH_OPERATOR = re.compile(rb"(?<![^\s\])>])(?:re|l|c|v|y)(?![^\s\[(</])")
+_TEXT_OPERATOR = re.compile(rb"(?<![^\s\])>])(?:Tj|TJ|'|\")(?![^\s\[(</])")
+
+def _page_content_may_have_tables(page):
+    """페이지 콘텐츠 스트림만 보고 표가 있을 수 있는지 빠르게 판단합니다 (레이아웃 분석 없음).
+
+    판단이 애매하면(폼 XObject, 스트림 읽기 실패 등) True를 돌려줍니다.
+    """
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.psparser import LIT
+
+    try:
+        resources = resolve1(page.page_obj.resources) or {}
+        xobjects = resolve1(resources.get("XObject")) or {}
+        for xobj in xobjects.values():
+            xobj = resolve1(xobj)
+            if getattr(xobj, "get", None) and resolve1(xobj.get("Subtype")) is LIT("Form"):
+                return True  # 폼 안의 그리기 명령까지는 확인하지 않음
+        data = b"".join(resolve1(stream).get_data() for stream in page.page_obj.contents)
+    except Exception:
+        return True
+    return bool(_PATH_OPERATOR.search(data)) and bool(_TEXT_OPERATOR.search(data))
+
+def _page_has_table_keywords(page):
+    text = "".join(c["text"] for c in page.chars).replace(" ", "")
+    return any(kw in text for kw in PAGE_FILTER_KEYWORDS)
+
+def _extract_page_tables_tier(page, page_filter="content", layout_cache=None, engine="tables"):
+    """페이지의 (테이블 목록, 추출 단계). 사전 필터에서 제외된 페이지의 테이블은 None.
+
+    추출 단계는 engine="tiered"일 때 tiered_engine.TIERS 중 하나이고, 그 밖에는 None입니다.
+    """
+    if page_filter != "off":
+        if not _page_content_may_have_tables(page):
+            return None, None
+        if page_filter == "keywords" and not _page_has_table_keywords(page):
+            return None, None
+    if engine == "tiered":
+        from tiered_engine import extract_tables as extract_tables_tiered
+        return extract_tables_tiered(page, TABLE_SETTINGS, layout_cache)
+    if engine == "rows":
+        from row_engine import extract_tables as extract_tables_with_rows
+        return extract_tables_with_rows(page, TABLE_SETTINGS, layout_cache), None
+    if layout_cache is not None:
+        from table_layout import extract_tables as extract_tables_with_layout
+        return extract_tables_with_layout(page, TABLE_SETTINGS, layout_cache), None
+    return page.extract_tables(table_settings=TABLE_SETTINGS), None
+
+def _extract_page_tables(page, page_filter="content", layout_cache=None, engine="tables"):
+    """페이지의 테이블 목록. 사전 필터에서 제외된 페이지는 None."""
+    return _extract_page_tables_tier(page, page_filter, layout_cache, engine)[0]
+
+def _new_layout_cache(engine="tables"):
+    from table_layout import TableLayoutCache
+    from tiered_engine import TierCache
+
+    layout_cache = TableLayoutCache() if REUSE_TABLE_LAYOUT else None
+    if engine == "tiered":
+        return TierCache(layout_cache)  # 서식별 단계 기록 + text 단계의 레이아웃 캐시
+    return layout_cache
+
+def open_pdf(pdf_source):
+    """파일 경로, PDF 바이트(bytes/bytearray/memoryview) 또는 파일 객체를 pdfplumber로 엽니다.
+
+    바이트는 BytesIO로 감싸기만 하므로 복사본이나 임시 파일을 만들지 않습니다.
+    """
+    import pdfplumber
+
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return pdfplumber.open(io.BytesIO(pdf_source))
+    if hasattr(pdf_source, "seek"):
+        pdf_source.seek(0)
+    return pdfplumber.open(pdf_source)
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB, high-water mark). resource 모듈이 없는 플랫폼(Windows)에서는 None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _extract_closing(page, page_filter, layout_cache, engine, page_cache=None):
+    """페이지 하나의 (테이블 목록, 페이지 캐시 재사용 여부, 추출 단계).
+
+    page_cache(result_cache.PageCache)가 있으면 페이지 내용 지문이 같은 항목의 테이블을
+    그대로 돌려주고, 없으면 추출한 뒤 저장합니다.
+    """
+    key = None
+    if page_cache is not None:
+        # "tiered"는 다른 엔진과 결과가 다를 수 있으므로 따로 저장
+        key = page_cache.page_key(page, page_filter if engine != "tiered" else f"{page_filter}:tiered")
+        entry = page_cache.get(key)
+        if entry is not None:
+            page.close()
+            return entry["tables"], True, entry.get("tier")
+    # 표를 꺼낸 페이지는 다시 보지 않으므로 레이아웃 캐시(chars, objects 등)를 바로 해제
+    tables, tier = _extract_page_tables_tier(page, page_filter, layout_cache, engine)
+    page.close()
+    if key is not None:
+        page_cache.put(key, {"tables": tables, "tier": tier})
+    return tables, False, tier
+
+def _extract_tables_for_pages(pdf_path, page_indices, page_filter="content", engine="tables", page_cache=None):
+    """(프로세스 풀 워커) PDF를 직접 열어 지정된 페이지들의 (테이블, 재사용 여부, 추출 단계)를 추출합니다."""
+    layout_cache = _new_layout_cache(engine)
+    with open_pdf(pdf_path) as pdf:
+        return [_extract_closing(pdf.pages[i], page_filter, layout_cache, engine, page_cache)
+                for i in page_indices]
+
+def _chunk_pages(page_count, workers, max_size=None):
+    # 워커당 여러 청크로 나눠 페이지별 부하 편차를 줄임 (청크마다 PDF를 한 번 열게 됨)
+    n_chunks = min(page_count, workers * 4)
+    if max_size:
+        n_chunks = max(n_chunks, -(-page_count // max_size))
+    size, rest = divmod(page_count, n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < rest else 0)
+        chunks.append(range(start, end))
+        start = end
+    return chunks
+
+def _iter_page_tables_parallel(pdf_path, start, page_count, workers, page_filter="content", low_memory=False,
+                               engine="tables", page_cache=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [range(start + chunk.start, start + chunk.stop)
+              for chunk in _chunk_pages(page_count - start, workers, LOW_MEMORY_WINDOW if low_memory else None)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as executor:
+        # map()은 제출 순서대로 결과를 돌려주므로 페이지 순서가 보존됨
+        for chunk_tables in executor.map(_extract_tables_for_pages, [pdf_path] * len(chunks), chunks,
+                                         [page_filter] * len(chunks), [engine] * len(chunks),
+                                         [page_cache] * len(chunks)):
+            yield from chunk_tables
+
+def _iter_page_tables_windowed(pdf_source, start, page_count, page_filter="content", engine="tables",
+                               page_cache=None):
+    # LOW_MEMORY_WINDOW 페이지마다 문서를 새로 열어 pdfminer의 객체 캐시까지 비움
+    layout_cache = _new_layout_cache(engine)
+    for window_start in range(start, page_count, LOW_MEMORY_WINDOW):
+        with open_pdf(pdf_source) as pdf:
+            for page in pdf.pages[window_start:window_start + LOW_MEMORY_WINDOW]:
+                yield _extract_closing(page, page_filter, layout_cache, engine, page_cache)
+
+def _iter_page_tables(pdf, pdf_path, workers=1, page_filter="content", low_memory=False, engine="tables",
+                      page_cache=None):
+    """페이지 순서대로 각 페이지의 (테이블 목록, 재사용 여부, 추출 단계)를 돌려줍니다 (사전 필터로 제외된 페이지의 테이블은 None).
+
+    workers > 1 이면 프로세스 풀에서 페이지를 나눠 추출하고(경로는 각 워커가 직접 열고,
+    bytes는 워커에 전달), 풀을 쓸 수 없는 환경(파일 객체 입력, 프로세스 생성 실패 등)에서는
+    직렬로 처리합니다. low_memory=True 이면 LOW_MEMORY_WINDOW 페이지 단위로 문서를
+    다시 열어 처리합니다 (병렬이면 청크 크기를 그 이하로 제한). engine은 TABLE_ENGINES 참고.
+    page_cache가 있으면 내용이 바뀌지 않은 페이지는 저장된 테이블을 재사용합니다 (_extract_closing 참고).
+    """
+    if page_filter not in PAGE_FILTERS:
+        raise ValueError(f"page_filter는 {PAGE_FILTERS} 중 하나여야 합니다: {page_filter!r}")
+    if engine not in TABLE_ENGINES:
+        raise ValueError(f"engine은 {TABLE_ENGINES} 중 하나여야 합니다: {engine!r}")
+    page_count = len(pdf.pages)
+    if not page_count:
+        return
+    # 첫 페이지는 회사 정보를 읽으며 이미 레이아웃을 분석했으므로 열려 있는 문서에서 바로 처리
+    # (워커나 저메모리 창에서 같은 페이지를 다시 분석하지 않음)
+    layout_cache = _new_layout_cache(engine)
+    yield _extract_closing(pdf.pages[0], page_filter, layout_cache, engine, page_cache)
+    done = 1
+    if (workers and workers > 1 and page_count - done > 1
+            and isinstance(pdf_path, (str, os.PathLike, bytes, bytearray))):
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            for item in _iter_page_tables_parallel(pdf_path, done, page_count, workers, page_filter, low_memory,
+                                                   engine, page_cache):
+                yield item
+                done += 1
+            return
+        except (OSError, BrokenProcessPool):
+            # 이미 넘긴 페이지는 건너뛰고 나머지를 직렬로 이어서 처리
+            pass
+
+    if low_memory:
+        yield from _iter_page_tables_windowed(pdf_path, done, page_count, page_filter, engine, page_cache)
+        return
+    for page in pdf.pages[done:]:
+        yield _extract_closing(page, page_filter, layout_cache, engine, page_cache)
+
+# 행 필터 패턴 (행마다 re 캐시를 거치지 않도록 한 번만 컴파일)
+_TIMESTAMP_PATTERN = re.compile(r'~\s*\d{1,2}:\d{2}|\d{1,2}:\d{2}\s*~')  # 측정 시각 행 (~ 15:30, 09:10 ~)
+_NUMERIC_UNIT_PATTERN = re.compile(r'^\d+(\s+\d+)*$')
+_CLOCK_PATTERN = re.compile(r'\d{2}:\d{2}')
+
+# 행 필터 (_filter_rows). 이 단어가 있는 행은 상태 머신에 넣지 않습니다.
+_HEADER_WORDS = ("측정시각",)                     # 시각 머리글 (공정+작업 머리글은 따로 검사)
+_FOOTER_WORDS = ("측정방법", "비고", "평균치")
+_TIMESTAMP_WORDS = ("종료", "시작")               # _TIMESTAMP_PATTERN과 함께 측정 시각 행
+# 행을 이어 붙일 때 쓰는 구분자. 필터 단어/패턴의 어느 글자와도 겹치지 않아 행을 넘는 일치가 없음
+_ROW_SEPARATOR = "\x00"
+
+def _drop_reason(row_full):
+    """제외할 행이면 profile 카운터 이름, 아니면 None (행 하나씩 검사하던 원래 순서)."""
+    if "공정" in row_full and "작업" in row_full or "측정시각" in row_full:
+        return "rows_dropped_header"
+    if "측정방법" in row_full or "비고" in row_full or "평균치" in row_full:
+        return "rows_dropped_footer"
+    if _TIMESTAMP_PATTERN.search(row_full) or "종료" in row_full or "시작" in row_full:
+        return "rows_dropped_timestamp"
+    return None
+
+def _rows_containing(text, starts, word):
+    """행을 이어 붙인 text에서 word가 나오는 행 번호 집합 (starts: 행별 시작 위치, 마지막 값은 끝 위치)."""
+    found = set()
+    i = text.find(word)
+    while i != -1:
+        r = bisect_right(starts, i) - 1
+        found.add(r)
+        i = text.find(word, starts[r + 1])  # 같은 행의 나머지는 건너뜀
+    return found
+
+def _column_texts(column, all_str):
+    """열 하나의 셀 문자열 (줄바꿈은 공백으로, 빈 셀은 ""). all_str이면 셀이 모두 문자열인 표."""
+    if all_str:
+        return [cell.replace("\n", " ").strip() if cell else "" for cell in column]
+    return [str(cell).replace("\n", " ").strip() if cell else "" for cell in column]
+
+def _filter_rows(table, col_map, profile=None):
+    """테이블의 행을 열 단위로 한꺼번에 걸러 상태 머신에 넣을 행만 돌려줍니다.
+
+    행마다 필터 단어/정규식을 따로 검사하는 대신, 테이블의 행 문자열을 구분자로 이어 붙인 문자열
+    하나에서 단어마다 str.find를 한 번씩 돌리고 찾은 위치를 행 번호로 바꿉니다. 시각 패턴은 모든
+    일치에 "~"가 들어가므로 "~"가 있는 행에만 정규식을 씁니다. 남은 행은 전치(zip)해서 열
+    (공정/단위작업/유해인자/근로자수/근무형태)별 셀 문자열을 만들고, 숫자만 있는 단위작업명도 이
+    단계에서 표시합니다. 제외 규칙은 행 하나씩 검사하던 것과 같습니다 (_drop_reason 참고).
+
+    돌려주는 값: 남은 행마다 (공정, 단위작업, 유해인자, 근로자수, 근무형태, 단위작업명이 숫자인지) 튜플.
+    모든 셀이 빈 행은 상태를 바꾸지 않으므로 열을 만들지 않고 None을 넣습니다.
+    """
+    rows = [row for row in table if row and len(row) >= 3]
+    if profile is not None and len(rows) < len(table):
+        profile.count("rows_dropped_short", len(table) - len(rows))
+    if not rows:
+        return []
+
+    try:
+        fulls = list(map("".join, rows))  # 셀이 모두 문자열이면 (pdfplumber 표는 보통 그러함) 빈 셀은 "" 그대로
+        all_str = True
+    except TypeError:
+        fulls = ["".join([str(x) for x in row if x]) for row in rows]  # None 등 문자열이 아닌 셀이 있는 표
+        all_str = False
+    starts = list(accumulate((len(full) + 1 for full in fulls), initial=0))
+    text = _ROW_SEPARATOR.join(fulls)
+
+    dropped = _rows_containing(text, starts, "공정") & _rows_containing(text, starts, "작업")
+    for word in _HEADER_WORDS + _FOOTER_WORDS + _TIMESTAMP_WORDS:
+        dropped |= _rows_containing(text, starts, word)
+    dropped.update(r for r in _rows_containing(text, starts, "~") if _TIMESTAMP_PATTERN.search(fulls[r]))
+    if dropped:
+        if profile is not None:
+            for r in dropped:
+                profile.count(_drop_reason(fulls[r]))
+        keep = [r not in dropped for r in range(len(rows))]
+        rows, fulls = list(compress(rows, keep)), list(compress(fulls, keep))
+
+    filled = list(compress(rows, fulls))
+    if not filled:
+        return [None] * len(rows)
+    width = max(map(len, filled))
+    cells = list(zip(*[row if len(row) == width else list(row) + [None] * (width - len(row)) for row in filled]))
+    columns = [_column_texts(cells[col_map[name]], all_str) if col_map[name] < width else [""] * len(filled)
+               for name in ("group", "unit", "factor", "worker", "form")]
+    numeric_units = [bool(u) and (u.isdigit() or _NUMERIC_UNIT_PATTERN.match(u) is not None) for u in columns[1]]
+    values = iter(zip(*columns, numeric_units))
+    return [next(values) if full else None for full in fulls]
+
+def _parse_table(table, col_map, jobs, profile=None):
+    """테이블 하나의 행들을 공정(group)/단위작업(unit) 상태 머신으로 해석해 jobs에 누적합니다.
+
+    col_map은 헤더가 발견될 때마다 갱신되며 이후 테이블에도 그대로 이어집니다.
+    머리글/꼬리말/측정 시각 행은 상태 머신에 들어가기 전에 _filter_rows()에서 한꺼번에 걸러집니다.
+    테이블이 끝날 때 진행 중이던 공정명을 돌려줍니다.
+    profile(ConversionProfile)을 넘기면 행 처리 결과(반영/제외 이유)와 classify_factor 시간을 기록합니다.
+    """
+    # 1. Detect Header
+    header_found = False
+    for row in table[:5]:
+        if not row: continue
+        row_str = "".join([str(x) for x in row if x])
+        if "공정" in row_str and ("작업" in row_str or "장소" in row_str):
+            for cb_idx, cell in enumerate(row):
+                if not cell: continue
+                txt = str(cell).replace(" ", "")
+                if "공정" in txt or "부서" in txt: col_map["group"] = cb_idx
+                elif "작업" in txt or "장소" in txt or "단위" in txt: col_map["unit"] = cb_idx
+                elif "유해" in txt or "인자" in txt: col_map["factor"] = cb_idx
+                elif "근로" in txt or "자수" in txt or "측정치" in txt:
+                    if "치" not in txt: col_map["worker"] = cb_idx
+                elif "형태" in txt or "근무" in txt: col_map["form"] = cb_idx
+            header_found = True
+            break
+    
+    current_group = None
+    current_unit = None
+    
+    # Flag to track if the current unit 'row' seems complete (has workers/form)
+    # If complete, next text implies new unit.
+    unit_row_completed = False
+
+    for values in _filter_rows(table, col_map, profile):
+        if values is None:  # 빈 행: 상태는 그대로, 처리 결과만 기록
+            if profile is not None: profile.count("rows_kept" if current_unit else "rows_dropped_orphan")
+            continue
+        g_text, u_text, f_text, w_text, form_text, numeric_unit = values
+        # Worker Val: Keep exact string 
+        w_val = None
+        if w_text: 
+             w_val = w_text
+        
+        # Unit Name Cleanup: Ignore numeric garbage
+        if numeric_unit:
+            if not w_val: w_val = u_text # Fallback
+            u_text = ""
+
+        # Logic: When to start a New Unit?
+        # 1. Group text exists -> Definitely New Group -> New Unit
+        # 2. Unit text exists AND Previous Unit was 'Completed' (had workers/factors populated in a way that implies end)
+        # OR just standard: If Unit text exists -> New Unit (unless it looks like wrapped text).
+        # 'Wrapped text' heuristic: Previous line had NO workers/form, and this line has text.
+        
+        start_new_unit = False
+        
+        if g_text:
+            current_group = g_text
+            start_new_unit = True
+        elif u_text:
+            # If we have text, is it a new unit or continuation?
+            if unit_row_completed:
+                start_new_unit = True
+            else:
+                # Previous row didn't have workers/form.
+                # It might be a continuation of the name.
+                # OR it might be distinct unit that just has no worker data (unlikely for "Distribution" report)
+                # Let's assume continuation.
+                start_new_unit = False
+        
+        # If we don't have a current unit object yet, force start
+        if not current_unit and (g_text or u_text):
+            if not g_text and current_group: # Continuation of group but start of first unit finding
+                 start_new_unit = True
+            elif g_text:
+                 start_new_unit = True
+
+        if start_new_unit:
+            current_unit = {
+                "name_parts": [],
+                "factors": defaultdict(set),
+                "workers": "", # String accumulation
+                "work_form": set()
+            }
+            if current_group:
+                jobs[current_group].append(current_unit)
+            unit_row_completed = False
+            
+        if not current_unit:
+            if profile is not None: profile.count("rows_dropped_orphan") # 첫 공정 이전의 행
+            continue
+        if profile is not None: profile.count("rows_kept")
+        
+        # 1. Name Parts
+        if u_text:
+            current_unit["name_parts"].append(u_text)
+        
+        # 2. Workers
+        if w_val:
+            # User wants exact string.
+            # If multiple rows have workers for same 'unit' (merged cells with split rows?), logic says we started new unit?
+            # If we are here, it means we are in 'current_unit'.
+            # If 'current_unit' already has workers, and we see NEW workers on this line...
+            # It suggests we missed a split? 
+            # Or it's just aggregating.
+            # Given "Strict Separation", if we see `w_val`, it flags completion.
+            current_unit["workers"] = w_val # Overwrite or append? "16(4)" usually one line.
+            unit_row_completed = True
+            
+        # 3. Form
+        if form_text:
+            if "교대" in form_text:
+                current_unit["work_form"].add(form_text.split()[0])
+            unit_row_completed = True # Form implies completion row usually
+                
+        # 4. Factors
+        if f_text and "유해인자" not in f_text:
+            if f_text.isdigit(): pass
+            else:
+                parts = f_text.split()
+                for p in parts:
+                    p = p.strip()
+                    if profile is None:
+                        cat = classify_factor(p)
+                    else:
+                        t = time.perf_counter()
+                        cat = classify_factor(p)
+                        profile.add("classify_factor", time.perf_counter() - t)
+                    if cat:
+                        current_unit["factors"][cat].add(p)
+
+    return current_group
+
+def _build_group(group_name, unit_list, report):
+    """공정 하나의 단위작업(파싱 중간 상태 dict)을 검증해 Group으로 만듭니다.
+
+    유해인자는 report의 이름 표에 등록하고 인덱스만 저장합니다. 출력할 단위작업이 없으면 None.
+    """
+    if not group_name: return None
+    # Filter out Header Groups
+    if group_name == "공정" or group_name == "부서" or group_name == "단위작업장소": return None
+
+    units = []
+    for u in unit_list:
+        full_name = " ".join(u["name_parts"]).strip()
+        
+        # Check for timestamp in worker field (e.g. 07:07) -> Garbage unit
+        w_str = str(u["workers"])
+        if _CLOCK_PATTERN.search(w_str):
+            continue
+        
+        if not full_name: 
+            # If no name, and no significant data, skip
+            if not u["factors"] and not w_str: continue
+            full_name = "(공정명 없음)"
+        
+        # If name is still empty/placeholder and no meaningful data, skip
+        if full_name == "(공정명 없음)" and (not w_str or w_str.strip() == ""):
+             continue
+
+        factors = sorted(report.intern_factor(f, cat) for cat, f_set in u["factors"].items() for f in sorted(f_set))
+        units.append(Unit(full_name, w_str, tuple(sorted(u["work_form"])), array("H", factors)))
+
+    return Group(group_name, units) if units else None
+
+def build_report(company_info, jobs):
+    """파싱 상태(공정 -> 단위작업 dict 목록)를 검증된 Report로 만듭니다 (유효성 검사는 여기서 한 번만)."""
+    report = Report(company_info=company_info)
+    for grp, unit_list in jobs.items():
+        group = _build_group(grp, unit_list, report)
+        if group is not None:
+            report.groups.append(group)
+    return report
+
+def iter_extract_job_data(pdf_path, workers=1, page_filter="content", profile=None, low_memory=False, engine="tables",
+                          page_cache=None):
+    """페이지 단위로 진행 상황을 돌려주는 추출 제너레이터.
+
+    먼저 {"type": "start", "company_info", "pages", "metadata", "jobs"}를, 이후 페이지를
+    하나 처리할 때마다 {"type": "page", "page", "pages", "jobs", "current_group",
+    "skipped", "skipped_pages", "reused", "reused_pages", "tier", "tier_pages"}를 돌려줍니다
+    (current_group은 그 페이지의 마지막 테이블이 끝날 때 진행 중이던 공정, skipped는 사전 필터로
+    제외되었는지, reused는 페이지 캐시의 테이블을 재사용했는지 여부, tier는 engine="tiered"일 때
+    그 페이지에 쓴 추출 단계이고 tier_pages는 지금까지의 단계별 페이지 수).
+    jobs는 후처리 전의 누적 상태(공정 -> 단위작업 목록)이며 계속 갱신되는 같은 객체입니다.
+    metadata는 PDF 문서 정보(pdf.metadata) 중 문자열 값만 담은 dict입니다 (작성일 등).
+    pdf_path에는 파일 경로 대신 PDF 바이트나 파일 객체도 넘길 수 있습니다 (open_pdf 참고).
+    profile(conversion_profile.ConversionProfile)을 넘기면 단계별/페이지별 시간을 기록합니다.
+    low_memory=True 이면 수백 페이지 보고서도 최대 메모리가 일정하도록 페이지 창 단위로
+    문서를 다시 열어 처리합니다 (LOW_MEMORY_WINDOW 참고, 결과는 같음).
+    engine은 표 추출 엔진입니다 (TABLE_ENGINES 참고, "tiered" 외에는 결과가 같음).
+    page_cache(result_cache.PageCache)를 넘기면 일부 페이지만 고친 개정판 보고서에서 내용이
+    같은 페이지는 표 추출을 건너뛰고 저장된 행을 같은 상태 머신에 넣습니다 (결과는 같음).
+    """
+    events = _iter_extract_job_data(pdf_path, workers, page_filter, profile, low_memory, engine, page_cache)
+    return profile.wrap(events) if profile is not None else events
+
+def _iter_extract_job_data(pdf_path, workers, page_filter, profile, low_memory, engine, page_cache):
+    jobs = defaultdict(list) 
     
     # Default indices (heuristic)
     col_map = {
@@ -239,221 +884,244 @@ def extract_job_data_impl(pdf_path):
         "form": 6
     }
     
-    with pdfplumber.open(pdf_path) as pdf:
+    t = time.perf_counter() if profile is not None else 0.0
+    with open_pdf(pdf_path) as pdf:
+        if profile is not None:
+            profile.add("open", time.perf_counter() - t)
+            t = time.perf_counter()
+        company_info = _extract_company_info(pdf)
+        page_count = len(pdf.pages)
+        if profile is not None:
+            profile.add("metadata", time.perf_counter() - t)
+        metadata = {k: v for k, v in pdf.metadata.items() if isinstance(v, str)}
+        yield {"type": "start", "company_info": company_info, "pages": page_count, "metadata": metadata,
+               "jobs": jobs}
+
+        skipped_pages = 0
+        reused_pages = 0
+        tier_pages = defaultdict(int)
+        t = time.perf_counter() if profile is not None else 0.0
+        page_tables = _iter_page_tables(pdf, pdf_path, workers, page_filter, low_memory, engine, page_cache)
         try:
-            first_page_text = pdf.pages[0].extract_text()
-            if first_page_text:
-                lines = first_page_text.split('\n')
-                if lines:
-                    for line in lines:
-                        clean_line = line.strip()
-                        if not clean_line: continue
-                        
-                        # Skip typical report headers
-                        if "나-1" in clean_line or "단위작업" in clean_line:
-                            if ":" in clean_line:
-                                # Extract content after colon
-                                temp = clean_line.split(":", 1)[1].strip()
-                                if temp:
-                                    company_info["name"] = temp
-                                    break
-                            continue
-                        
-                        if "측정" in clean_line and "결과" in clean_line: continue
-                        
-                        # If we reached here, it might be the company name line
-                        company_info["name"] = clean_line
-                        break
-                        
-            # Use regex if specific pattern found (more reliable)
-            if "공장명" in first_page_text:
-                m = re.search(r"공장명\s*:\s*(.*?)\s*[○\n]", first_page_text)
-                if m: company_info["name"] = m.group(1).strip()
+            for page_no, (tables, reused, tier) in enumerate(page_tables, 1):
+                if profile is not None:
+                    t_tables = time.perf_counter()
+                current_group = None
+                skipped = tables is None
+                if skipped:
+                    skipped_pages += 1
+                    tables = []
+                reused_pages += reused
+                if tier:
+                    tier_pages[tier] += 1
+                for table in tables:
+                    if not table: continue
+                    current_group = _parse_table(table, col_map, jobs, profile) or current_group
+                if profile is not None:
+                    n_tables = sum(1 for table in tables if table)
+                    n_rows = sum(len(table) for table in tables if table)
+                    profile.count("tables", n_tables)
+                    profile.count("rows", n_rows)
+                    profile.count("skipped_pages", skipped)
+                    profile.count("reused_pages", reused)
+                    if tier:
+                        profile.count(f"tier_{tier}")
+                    profile.add_page(page_no, skipped, n_tables, n_rows, t_tables - t, time.perf_counter() - t_tables,
+                                     reused)
+                yield {"type": "page", "page": page_no, "pages": page_count, "jobs": jobs,
+                       "current_group": current_group, "skipped": skipped, "skipped_pages": skipped_pages,
+                       "reused": reused, "reused_pages": reused_pages, "tier": tier, "tier_pages": dict(tier_pages)}
+                if profile is not None:
+                    t = time.perf_counter()  # 소비자 코드 시간은 다음 페이지 추출 시간에서 제외
+        finally:
+            # 페이지마다 정리하지 않고 문서 하나가 끝날 때 한 번 (미리보기처럼 중간에 닫혀도)
+            if page_cache is not None:
+                page_cache.evict()
 
-            if "공 사 명" in first_page_text:
-                m = re.search(r"공 사 명\s*:\s*(.*)", first_page_text)
-                if m: company_info["project"] = m.group(1).strip()
-        except: pass
+def extract_job_data_impl(pdf_path, workers=1, page_filter="content", profile=None, low_memory=False, engine="tables",
+                          page_cache=None):
+    """PDF에서 회사 정보와 공정별 단위작업 데이터를 추출해 Report(job_model)로 돌려줍니다.
 
-        for page in pdf.pages:
-            tables = page.extract_tables(table_settings={"horizontal_strategy": "text"})
-            for table in tables:
-                if not table: continue
-                
-                # 1. Detect Header
-                header_found = False
-                for row in table[:5]:
-                    if not row: continue
-                    row_str = "".join([str(x) for x in row if x])
-                    if "공정" in row_str and ("작업" in row_str or "장소" in row_str):
-                        for cb_idx, cell in enumerate(row):
-                            if not cell: continue
-                            txt = str(cell).replace(" ", "")
-                            if "공정" in txt or "부서" in txt: col_map["group"] = cb_idx
-                            elif "작업" in txt or "장소" in txt or "단위" in txt: col_map["unit"] = cb_idx
-                            elif "유해" in txt or "인자" in txt: col_map["factor"] = cb_idx
-                            elif "근로" in txt or "자수" in txt or "측정치" in txt:
-                                if "치" not in txt: col_map["worker"] = cb_idx
-                            elif "형태" in txt or "근무" in txt: col_map["form"] = cb_idx
-                        header_found = True
-                        break
-                
-                current_group = None
-                current_unit = None
-                
-                # Flag to track if the current unit 'row' seems complete (has workers/form)
-                # If complete, next text implies new unit.
-                unit_row_completed = False
+    workers > 1 이면 페이지별 테이블 추출을 프로세스 풀에 분산하고,
+    결과는 페이지 순서대로 합쳐 직렬 처리와 동일한 결과를 만듭니다.
+    page_filter는 PAGE_FILTERS 참고 ("off"는 모든 페이지를 검사하는 strict 모드).
+    profile(ConversionProfile)을 넘기면 변환이 끝난 뒤 단계별 시간/카운터가 채워져 있습니다.
+    low_memory, engine, page_cache는 iter_extract_job_data() 참고.
+    """
+    company_info, jobs = {}, {}
+    for event in iter_extract_job_data(pdf_path, workers=workers, page_filter=page_filter, profile=profile,
+                                       low_memory=low_memory, engine=engine, page_cache=page_cache):
+        if event["type"] == "start":
+            company_info, jobs = event["company_info"], event["jobs"]
 
-                for row in table:
-                    if not row or len(row) < 3: continue
-                    
-                    row_full = "".join([str(x) for x in row if x])
-                    if "공정" in row_full and "작업" in row_full: continue
-                    if "측정방법" in row_full or "비고" in row_full: continue 
-                    if "평균치" in row_full: continue
-                    if "측정시각" in row_full: continue # Time header
-
-                    def get_col(idx):
-                        if idx < len(row) and row[idx]:
-                            return str(row[idx]).replace("\n", " ").strip()
-                        return ""
-                    
-                    g_text = get_col(col_map["group"])
-                    u_text = get_col(col_map["unit"])
-                    f_text = get_col(col_map["factor"])
-                    w_text = get_col(col_map["worker"])
-                    form_text = get_col(col_map["form"])
-                    
-                    # Garbage Filter: Timestamps / Footer
-                    # If any text contains "~" and ":" (e.g. ~ 15:30), it's likely a timestamp row
-                    if re.search(r'~\s*\d{1,2}:\d{2}', row_full) or re.search(r'\d{1,2}:\d{2}\s*~', row_full):
-                        continue
-                    if "종료" in row_full or "시작" in row_full:
-                        continue
-                    
-                    # Worker Val: Keep exact string 
-                    w_val = None
-                    if w_text: 
-                         w_val = w_text
-                    
-                    # Unit Name Cleanup: Ignore numeric garbage
-                    if u_text and (u_text.isdigit() or re.match(r'^\d+(\s+\d+)*$', u_text) or len(u_text) < 2 and u_text.isdigit()):
-                        if not w_val: w_val = u_text # Fallback
-                        u_text = ""
-
-                    # Logic: When to start a New Unit?
-                    # 1. Group text exists -> Definitely New Group -> New Unit
-                    # 2. Unit text exists AND Previous Unit was 'Completed' (had workers/factors populated in a way that implies end)
-                    # OR just standard: If Unit text exists -> New Unit (unless it looks like wrapped text).
-                    # 'Wrapped text' heuristic: Previous line had NO workers/form, and this line has text.
-                    
-                    start_new_unit = False
-                    
-                    if g_text:
-                        current_group = g_text
-                        start_new_unit = True
-                    elif u_text:
-                        # If we have text, is it a new unit or continuation?
-                        if unit_row_completed:
-                            start_new_unit = True
-                        else:
-                            # Previous row didn't have workers/form.
-                            # It might be a continuation of the name.
-                            # OR it might be distinct unit that just has no worker data (unlikely for "Distribution" report)
-                            # Let's assume continuation.
-                            start_new_unit = False
-                    
-                    # If we don't have a current unit object yet, force start
-                    if not current_unit and (g_text or u_text):
-                        if not g_text and current_group: # Continuation of group but start of first unit finding
-                             start_new_unit = True
-                        elif g_text:
-                             start_new_unit = True
-
-                    if start_new_unit:
-                        current_unit = {
-                            "name_parts": [],
-                            "factors": defaultdict(set),
-                            "workers": "", # String accumulation
-                            "work_form": set()
-                        }
-                        if current_group:
-                            jobs[current_group].append(current_unit)
-                        unit_row_completed = False
-                        
-                    if not current_unit: continue
-                    
-                    # 1. Name Parts
-                    if u_text:
-                        current_unit["name_parts"].append(u_text)
-                    
-                    # 2. Workers
-                    if w_val:
-                        # User wants exact string.
-                        # If multiple rows have workers for same 'unit' (merged cells with split rows?), logic says we started new unit?
-                        # If we are here, it means we are in 'current_unit'.
-                        # If 'current_unit' already has workers, and we see NEW workers on this line...
-                        # It suggests we missed a split? 
-                        # Or it's just aggregating.
-                        # Given "Strict Separation", if we see `w_val`, it flags completion.
-                        current_unit["workers"] = w_val # Overwrite or append? "16(4)" usually one line.
-                        unit_row_completed = True
-                        
-                    # 3. Form
-                    if form_text:
-                        if "교대" in form_text:
-                            current_unit["work_form"].add(form_text.split()[0])
-                        unit_row_completed = True # Form implies completion row usually
-                            
-                    # 4. Factors
-                    if f_text and "유해인자" not in f_text:
-                        if f_text.isdigit(): pass
-                        else:
-                            parts = f_text.split()
-                            for p in parts:
-                                p = p.strip()
-                                cat = classify_factor(p)
-                                if cat:
-                                    current_unit["factors"][cat].add(p)
-
-    # Post-process: Just flatten name parts
-    final_jobs = defaultdict(list)
-    
-    for grp, unit_list in jobs.items():
-        if not grp: continue
-        # Filter out Header Groups
-        if grp == "공정" or grp == "부서" or grp == "단위작업장소": continue
-        
-        for u in unit_list:
-            full_name = " ".join(u["name_parts"]).strip()
-            
-            # Check for timestamp in worker field (e.g. 07:07) -> Garbage unit
-            w_str = str(u["workers"])
-            if re.search(r'\d{2}:\d{2}', w_str):
+    if profile is None:
+        return build_report(company_info, jobs)
+    with profile.stage("postprocess"):
+        report = build_report(company_info, jobs)
+    return report
+
+def extract_job_data(pdf_path, workers=1, page_filter="content", profile=None, low_memory=False, engine="tables",
+                     page_cache=None):
+    return extract_job_data_impl(pdf_path, workers=workers, page_filter=page_filter, profile=profile,
+                                 low_memory=low_memory, engine=engine, page_cache=page_cache)
+
+def convert_pdf_to_txt(pdf_path, workers=1, page_filter="content", profile=None, low_memory=False, engine="tables",
+                       page_cache=None):
+    start = time.perf_counter()
+    try:
+        report = extract_job_data(pdf_path, workers=workers, page_filter=page_filter, profile=profile,
+                                  low_memory=low_memory, engine=engine, page_cache=page_cache)
+        if profile is None:
+            text = render_txt(report)
+        else:
+            with profile.stage("render"):
+                text = render_txt(report)
+    except Exception as e:
+        record_conversion("library", "failed", time.perf_counter() - start, error=e)
+        raise
+    record_conversion("library", "ok", time.perf_counter() - start)
+    return text
+
+def iter_convert_pdf(pdf_path, workers=1, page_filter="content", profile=None, low_memory=False, engine="tables",
+                     page_cache=None):
+    """convert_pdf_to_txt()의 스트리밍 버전. 변환 도중 이벤트(dict)를 차례로 돌려줍니다.
+
+    - {"type": "header", "text"}: 머리말 블록 (첫 페이지 분석 직후)
+    - {"type": "progress", "page", "pages", "skipped_pages", "reused_pages"}: 페이지 하나 처리 완료
+    - {"type": "group", "group", "index", "text", "update"}: 완성된 공정 블록.
+      index로 정렬하면 최종 출력 순서가 되며, 같은 공정명이 뒤 페이지에서 다시 나오면
+      update=True인 이벤트로 해당 블록 전체를 다시 보냅니다.
+    - {"type": "done", "text", "report", "pages", "skipped_pages", "reused_pages", "tier_pages", "peak_rss_mb"}:
+      convert_pdf_to_txt()와 같은 최종 결과와 그 Report, 프로세스 최대 RSS(MB).
+      tier_pages는 engine="tiered"일 때 추출 단계별 페이지 수 (그 밖에는 빈 dict)
+      profile을 넘겼으면 "profile"(to_dict())도 포함
+    """
+    events = _iter_convert_pdf(pdf_path, workers, page_filter, profile, low_memory, engine, page_cache)
+    return profile.wrap(events) if profile is not None else events
+
+def _iter_convert_pdf(pdf_path, workers, page_filter, profile, low_memory, engine, page_cache):
+    company_info, jobs = {}, {}
+    preview = Report()  # 공정 블록 미리 출력용 (유해인자 이름 표만 공유)
+    page_count = 0
+    skipped_pages = 0
+    reused_pages = 0
+    tier_pages = {}
+    emitted = {}        # 공정명 -> 마지막으로 확인했을 때의 단위작업 수
+    sent = set()        # 블록을 한 번이라도 보낸 공정명
+    open_group = None   # 직전 페이지 끝에서 진행 중이던 공정 (다음 페이지로 이어질 수 있어 보류)
+
+    def flush(hold):
+        # jobs의 키 순서(공정이 처음 나온 순서)가 곧 최종 출력 순서
+        for index, (grp, unit_list) in enumerate(list(jobs.items())):
+            if grp == hold or emitted.get(grp) == len(unit_list):
                 continue
-            
-            if not full_name: 
-                # If no name, and no significant data, skip
-                if not u["factors"] and not w_str: continue
-                full_name = "(공정명 없음)"
-            
-            # If name is still empty/placeholder and no meaningful data, skip
-            if full_name == "(공정명 없음)" and (not w_str or w_str.strip() == ""):
-                 continue
+            group = _build_group(grp, unit_list, preview)
+            lines = _render_group_lines(preview, group) if group else []
+            emitted[grp] = len(unit_list)
+            if not lines:
+                continue
+            update = grp in sent
+            sent.add(grp)
+            yield {"type": "group", "group": grp, "index": index, "text": "\n".join(lines), "update": update}
 
-            # Save refined object
-            u["job_content"] = full_name 
-            final_jobs[grp].append(u)
+    for event in iter_extract_job_data(pdf_path, workers=workers, page_filter=page_filter, profile=profile,
+                                       low_memory=low_memory, engine=engine, page_cache=page_cache):
+        if event["type"] == "start":
+            company_info, jobs = event["company_info"], event["jobs"]
+            page_count = event["pages"]
+            yield {"type": "header", "text": "\n".join(_render_header_lines(company_info))}
+            continue
 
-    return company_info, final_jobs
+        # 페이지 끝에서 진행 중이던 공정은 다음 페이지에서 이어질 수 있으므로 보류
+        if event["current_group"]:
+            open_group = event["current_group"]
+        yield from flush(hold=open_group)
+        skipped_pages = event["skipped_pages"]
+        reused_pages = event["reused_pages"]
+        tier_pages = event["tier_pages"]
+        yield {"type": "progress", "page": event["page"], "pages": event["pages"], "skipped_pages": skipped_pages,
+               "reused_pages": reused_pages}
 
-def extract_job_data(pdf_path):
-    return extract_job_data_impl(pdf_path)
+    yield from flush(hold=None)
+    if profile is None:
+        report = build_report(company_info, jobs)
+        text = render_txt(report)
+    else:
+        with profile.stage("postprocess"):
+            report = build_report(company_info, jobs)
+        with profile.stage("render"):
+            text = render_txt(report)
+    done = {
+        "type": "done",
+        "text": text,
+        "report": report,
+        "pages": page_count,
+        "skipped_pages": skipped_pages,
+        "reused_pages": reused_pages,
+        "tier_pages": tier_pages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if profile is not None:
+        done["profile"] = profile.to_dict()
+    yield done
 
-def convert_pdf_to_txt(pdf_path):
-    company_info, jobs = extract_job_data(pdf_path)
-    
+# 미리보기(preview_pdf)에서 분석할 표 페이지 수와 시간 예산(초). 둘 중 먼저 닿는 곳에서 멈춥니다.
+PREVIEW_TABLE_PAGES = 3
+PREVIEW_SECONDS = 5.0
+PREVIEW_NOTICE = ("※ 미리보기 (부분 결과): 전체 {pages}페이지 중 앞 {parsed}페이지만 분석했습니다. "
+                  "전체 변환 결과와 다를 수 있습니다.")
+
+def preview_pdf(pdf_path, max_table_pages=PREVIEW_TABLE_PAGES, max_seconds=PREVIEW_SECONDS, page_filter="content",
+                low_memory=False, engine="tables", page_cache=None, cancel=None):
+    """앞쪽 표 페이지만 분석한 빠른 미리보기 (올바른 보고서인지, 공정이 제대로 잡히는지 확인용).
+
+    사전 필터를 통과한 페이지(표 페이지)를 max_table_pages개 분석했거나 max_seconds초가 지나면
+    멈추고 그때까지의 결과를 render_txt()로 만듭니다 (None이면 그 제한 없음).
+    끝까지 분석하기 전에 멈췄으면 partial=True이고 text 맨 앞에 PREVIEW_NOTICE 줄을 붙입니다.
+    끝까지 분석했으면 text는 convert_pdf_to_txt()와 같습니다. 마지막 공정은 다음 페이지로 이어질 수
+    있으므로 부분 결과에서는 단위작업이 빠져 있을 수 있습니다.
+    page_cache(result_cache.PageCache)를 넘기면 분석한 페이지의 표가 저장되어, 이어서 하는 전체 변환은
+    그 페이지를 다시 추출하지 않습니다.
+    cancel은 페이지마다 부르는 함수입니다 (예: job_queue의 job.check_cancelled). 예외를 내면 PDF를
+    닫고 그 예외를 그대로 올립니다.
+
+    돌려주는 dict: {"text", "partial", "pages", "parsed_pages", "table_pages", "elapsed"}
+    """
+    start = time.perf_counter()
+    company_info, jobs = {}, {}
+    pages = parsed_pages = table_pages = 0
+    events = iter_extract_job_data(pdf_path, page_filter=page_filter, low_memory=low_memory, engine=engine,
+                                   page_cache=page_cache)
+    try:
+        for event in events:
+            if cancel is not None:
+                cancel()
+            if event["type"] == "start":
+                company_info, jobs, pages = event["company_info"], event["jobs"], event["pages"]
+                continue
+            parsed_pages = event["page"]
+            table_pages += not event["skipped"]
+            if ((max_table_pages is not None and table_pages >= max_table_pages)
+                    or (max_seconds is not None and time.perf_counter() - start >= max_seconds)):
+                break
+    finally:
+        events.close()  # 남은 페이지는 읽지 않고 PDF를 닫음
+
+    partial = parsed_pages < pages
+    text = render_txt(build_report(company_info, jobs))
+    if partial:
+        text = PREVIEW_NOTICE.format(pages=pages, parsed=parsed_pages) + "\n" + text
+    return {"text": text, "partial": partial, "pages": pages, "parsed_pages": parsed_pages,
+            "table_pages": table_pages, "elapsed": time.perf_counter() - start}
+
+def preview_pdf_to_txt(pdf_path, max_table_pages=PREVIEW_TABLE_PAGES, max_seconds=PREVIEW_SECONDS,
+                       page_filter="content", low_memory=False, engine="tables", page_cache=None):
+    """convert_pdf_to_txt()의 미리보기 모드. 부분 결과이면 첫 줄이 PREVIEW_NOTICE입니다 (preview_pdf 참고)."""
+    return preview_pdf(pdf_path, max_table_pages=max_table_pages, max_seconds=max_seconds, page_filter=page_filter,
+                       low_memory=low_memory, engine=engine, page_cache=page_cache)["text"]
+
+def _render_header_lines(company_info):
+    """보고서 머리말(회사명/공사명) 줄 목록."""
     lines = []
     lines.append("-" * 93)
     
@@ -477,144 +1145,132 @@ def convert_pdf_to_txt(pdf_path):
     # lines.append(f"   ◇ 특이사항: 공사현장의 경우 공기에 따라 작업내용이 달라질 수 있으므로 작업환경측정 당일") 
     # lines.append(f"                진행되는 작업을 대상으로 작업환경측정을 실시함.")
     # lines.append("-" * 93)
+    return lines
+
+def _render_group_lines(report, group):
+    """공정 하나(build_report로 검증된 Group)의 출력 블록(■ 공정 / 작업내용 / 유해인자 / 근무현황) 줄 목록."""
+    group_name = group.name
+    valid_units = group.units
+
+    lines = []
+
+    # Start Output Block
+    lines.append(f"■ {group_name}")
+    lines.append("-" * 93)
     
-    # 계층적 출력
-    # jobs: group -> list of unit objects
-    # Refined Logic based on Example File:
-    # 1. Group by "Group Name" (e.g. 목공, 사면보강) -> This is the main block "■ 목공"
-    # 2. Inside the block:
-    #    ◇ 작업내용 : Combine names of units (e.g. 비계, 거푸집조립 및 해체...)
-    #    ◇ 유해인자 : Merge all factors for this group
-    #    ◇ 근무현황 : List distinct worker entries, formatted like "UnitName (N명, Form)" if multiple, or just "N명, Form" if single/uniform.
+    # 1. 작업내용 Merge AND/OR Listing
+    # Example uses commas: "비계, 거푸집조립 및 해체, 기타 공사용 목공작업"
+    # We can collect unique names
+    unique_names = []
+    seen_names = set()
+    for u in valid_units:
+        nm = u.name
+        if nm and nm != "(공정명 없음)" and nm not in seen_names:
+            unique_names.append(nm)
+            seen_names.add(nm)
+    
+    content_str = ", ".join(unique_names)
+    if not content_str: content_str = group_name # Fallback
     
-    for group_name, unit_list in jobs.items():
-        if not group_name: continue
-        # Filter out Header Groups
-        if group_name == "공정" or group_name == "부서" or group_name == "단위작업장소": continue
+    lines.append(f"   ◇ 작업내용 : {content_str}")
+    lines.append("")
+    
+    # 2. 유해인자 Merge
+    # (카테고리 순서: job_model.CATEGORY_ORDER)
+    merged_factors = report.factors_by_category(valid_units)
+    
+    if merged_factors:
+        lines.append("   ◇ 유해인자 :")
+        current_line_idx = len(lines) - 1
+        is_first = True
         
-        # Valid Units Filter
-        valid_units = []
-        for u in unit_list:
-            full_name = " ".join(u["name_parts"]).strip()
-            w_str = str(u["workers"])
-            if re.search(r'\d{2}:\d{2}', w_str): continue # detailed timestamp filter
+        for cat, factors in merged_factors.items():
+            factors_str = ", ".join(factors)
             
-            if not full_name:
-                if not u["factors"] and not w_str: continue
-                full_name = "(공정명 없음)"
-            if full_name == "(공정명 없음)" and (not w_str or w_str.strip() == ""): continue
+            if cat == "물리적인자": cat_disp = "물리적인자 :"
+            elif cat == "분진류":     cat_disp = "분진류     :"
+            elif cat == "금속류":     cat_disp = "금속류     :"
+            elif cat == "유기화합물": cat_disp = "유기화합물 :"
+            elif cat == "금속가공유": cat_disp = "금속가공유 :"
+            else:                     cat_disp = f"{cat:<10} :"
             
-            u["job_content"] = full_name 
-            valid_units.append(u)
-            
-        if not valid_units: continue
+            if is_first:
+                 lines[current_line_idx] = f"   ◇ 유해인자 : * {cat_disp} {factors_str}"
+                 is_first = False
+            else:
+                 lines.append(f"                 * {cat_disp} {factors_str}")
+        lines.append("")
 
-        # Start Output Block
-        lines.append(f"■ {group_name}")
-        lines.append("-" * 93)
-        
-        # 1. 작업내용 Merge AND/OR Listing
-        # Example uses commas: "비계, 거푸집조립 및 해체, 기타 공사용 목공작업"
-        # We can collect unique names
-        unique_names = []
-        seen_names = set()
-        for u in valid_units:
-            nm = u["job_content"]
-            if nm and nm != "(공정명 없음)" and nm not in seen_names:
-                unique_names.append(nm)
-                seen_names.add(nm)
-        
-        content_str = ", ".join(unique_names)
-        if not content_str: content_str = group_name # Fallback
+    # 3. 근무현황 Listing
+    # Example Style 1: "13명, 1조1교대" (Simple)
+    # Example Style 2: "격자블록설치 (6명, 1조1교대) \n : 낙석방지망설치(3명...)" (Detailed)
+    
+    # Check if basic aggregation is possible (all same form? names correlate?)
+    # Let's collect lines
+    worker_lines = []
+    for u in valid_units:
+        nm = u.name
+        w = u.workers
+        forms = ", ".join(u.work_form)
         
-        lines.append(f"   ◇ 작업내용 : {content_str}")
-        lines.append("")
+        info = ""
+        if w: info += f"{w}명" if str(w).isdigit() else f"{w}"
+        if forms: 
+            if info: info += f", {forms}"
+            else: info = forms
         
-        # 2. 유해인자 Merge
-        merged_factors = defaultdict(set)
-        for u in valid_units:
-            for cat, f_set in u["factors"].items():
-                merged_factors[cat].update(f_set)
-                
-        category_order = ["물리적인자", "분진류", "금속류", "유기화합물", "산 및 알칼리류", "금속가공유", "기타"]
-        has_factors = any(merged_factors[cat] for cat in category_order)
+        if not info: continue
         
-        if has_factors:
-            lines.append("   ◇ 유해인자 :")
-            current_line_idx = len(lines) - 1
-            is_first = True
-            
-            for cat in category_order:
-                if cat in merged_factors and merged_factors[cat]:
-                    factors = sorted(list(merged_factors[cat]))
-                    factors_str = ", ".join(factors)
-                    
-                    if cat == "물리적인자": cat_disp = "물리적인자 :"
-                    elif cat == "분진류":     cat_disp = "분진류     :"
-                    elif cat == "금속류":     cat_disp = "금속류     :"
-                    elif cat == "유기화합물": cat_disp = "유기화합물 :"
-                    elif cat == "금속가공유": cat_disp = "금속가공유 :"
-                    else:                     cat_disp = f"{cat:<10} :"
-                    
-                    if is_first:
-                         lines[current_line_idx] = f"   ◇ 유해인자 : * {cat_disp} {factors_str}"
-                         is_first = False
-                    else:
-                         lines.append(f"                 * {cat_disp} {factors_str}")
-            lines.append("")
+        worker_lines.append((nm, info))
 
-        # 3. 근무현황 Listing
-        # Example Style 1: "13명, 1조1교대" (Simple)
-        # Example Style 2: "격자블록설치 (6명, 1조1교대) \n : 낙석방지망설치(3명...)" (Detailed)
-        
-        # Check if basic aggregation is possible (all same form? names correlate?)
-        # Let's collect lines
-        worker_lines = []
-        for u in valid_units:
-            nm = u["job_content"]
-            w = u["workers"]
-            forms = ", ".join(sorted(list(u["work_form"])))
-            
-            info = ""
-            if w: info += f"{w}명" if str(w).isdigit() else f"{w}"
-            if forms: 
-                if info: info += f", {forms}"
-                else: info = forms
+    if worker_lines:
+        # Check if simple summary possible (1 entry and name is redundant or empty)
+        if len(worker_lines) == 1:
+             # Just print info
+             lines.append(f"   ◇ 근무현황 : {worker_lines[0][1]}")
+        else:
+            # Multiple entries. 
+            # Check if all infos are identical? If so, just sum? No, user wants exact strings.
+            # Use detailed format: Name (Info)
             
-            if not info: continue
-            
-            worker_lines.append((nm, info))
-
-        if worker_lines:
-            # Check if simple summary possible (1 entry and name is redundant or empty)
-            if len(worker_lines) == 1:
-                 # Just print info
-                 lines.append(f"   ◇ 근무현황 : {worker_lines[0][1]}")
+            # First line
+            nm, info = worker_lines[0]
+            if nm == "(공정명 없음)" or nm in group_name: # if name redundant
+                lines.append(f"   ◇ 근무현황 : {info}")
             else:
-                # Multiple entries. 
-                # Check if all infos are identical? If so, just sum? No, user wants exact strings.
-                # Use detailed format: Name (Info)
-                
-                # First line
-                nm, info = worker_lines[0]
-                if nm == "(공정명 없음)" or nm in group_name: # if name redundant
-                    lines.append(f"   ◇ 근무현황 : {info}")
+                lines.append(f"   ◇ 근무현황 : {nm:<13}({info})")
+            
+            # Subsequent lines
+            for nm, info in worker_lines[1:]:
+                if nm == "(공정명 없음)" or nm in group_name:
+                     lines.append(f"                 : {info}")
                 else:
-                    lines.append(f"   ◇ 근무현황 : {nm:<13}({info})")
-                
-                # Subsequent lines
-                for nm, info in worker_lines[1:]:
-                    if nm == "(공정명 없음)" or nm in group_name:
-                         lines.append(f"                 : {info}")
-                    else:
-                         lines.append(f"                 : {nm:<13}({info})")
-        
-        lines.append("-" * 93)
+                     lines.append(f"                 : {nm:<13}({info})")
+    
+    lines.append("-" * 93)
+    return lines
+
+def render_txt(report):
+    """extract_job_data()의 결과(Report)를 분포실태 조사용 텍스트로 변환합니다."""
+    lines = _render_header_lines(report.company_info)
+
+    # 계층적 출력
+    # report.groups: Group(name, units) 목록 (공정이 처음 나온 순서)
+    # Refined Logic based on Example File:
+    # 1. Group by "Group Name" (e.g. 목공, 사면보강) -> This is the main block "■ 목공"
+    # 2. Inside the block:
+    #    ◇ 작업내용 : Combine names of units (e.g. 비계, 거푸집조립 및 해체...)
+    #    ◇ 유해인자 : Merge all factors for this group
+    #    ◇ 근무현황 : List distinct worker entries, formatted like "UnitName (N명, Form)" if multiple, or just "N명, Form" if single/uniform.
+    
+    for group in report.groups:
+        lines.extend(_render_group_lines(report, group))
 
     return "\n".join(lines)
 
 if __name__ == "__main__":
     # 로컬 테스트 용
+    fix_console_encoding()
     result = convert_pdf_to_txt("측정결과_동양건설(창녕12공구)_25하.pdf")
     print(result)
     with open("분포실태_결과_test.txt", "w", encoding="utf-8") as f:
@@ -0,0 +1,78 @@
+"""무거운 PDF 모듈 미리 읽기와 변환 워커 프로세스의 시작 방식.
+
+pdfplumber/pdfminer를 import하는 데 CPU 시간이 0.1초 이상 걸립니다. 변환기 모듈은 이 모듈들을
+처음 쓸 때 읽습니다 (지연 import). 그래서 CLI 도움말, 이미 변환된 파일만 있는 배치, Streamlit
+첫 화면은 이 비용을 내지 않습니다. 변환이 시작될 곳에서는 아래 함수로 미리 읽어 둡니다.
+
+- preload(): 지금 스레드에서 PRELOAD_MODULES를 읽고 걸린 초를 돌려줍니다.
+- preload_in_background(): 데몬 스레드에서 읽습니다 (앱이 첫 화면을 그리는 동안).
+- mp_context(start_method): 프로세스 풀에 넘길 multiprocessing 컨텍스트. START_METHODS 참고.
+"""
+import importlib
+import os
+import threading
+import time
+
+# 변환에 필요한 무거운 모듈 (표 추출 엔진은 pdfplumber.table/pdfminer.layout을 읽음)
+PRELOAD_MODULES = ("pdfplumber", "pdfminer.layout", "row_engine", "table_layout", "tiered_engine")
+
+# 워커 프로세스 시작 방식
+#   "auto"      : 플랫폼 기본값. 기본값이 fork이면 부모가 먼저 preload()해서 워커가 물려받음.
+#                 다만 스레드가 여러 개 도는 부모(앱의 작업 큐 스레드, HTTP 서비스)는 fork하면 다른 스레드가
+#                 잡고 있던 락 때문에 자식이 멈출 수 있으므로 "forkserver"(없는 플랫폼은 "spawn")를 씀
+#   "fork"      : 부모에서 preload()한 뒤 fork (Linux 기본값과 같음, macOS/Windows 불가)
+#   "forkserver": PRELOAD_MODULES를 읽어 둔 fork 서버에서 워커를 fork. 부모는 가볍게 유지되고
+#                 스레드가 있는 부모(앱, HTTP 서비스)에서도 안전 (Unix 전용)
+#   "spawn"     : 워커마다 새 인터프리터에서 import부터 시작 (Windows/macOS 기본값)
+START_METHODS = ("auto", "fork", "forkserver", "spawn")
+DEFAULT_START_METHOD = os.environ.get("PDF_SUMMARY_START_METHOD", "auto")
+
+_preload_lock = threading.Lock()
+
+def preload(modules=PRELOAD_MODULES):
+    """modules를 import하고 걸린 초를 돌려줍니다 (이미 읽었으면 거의 0)."""
+    start = time.perf_counter()
+    with _preload_lock:  # 백그라운드 스레드와 동시에 불려도 한 번만 읽음
+        for name in modules:
+            importlib.import_module(name)
+    return time.perf_counter() - start
+
+def _preload_quietly(modules):
+    try:
+        preload(modules)
+    except ImportError:
+        pass  # 미리 읽기는 최적화일 뿐이므로 실패하면 처음 쓸 때 다시 읽음
+
+def preload_in_background(modules=PRELOAD_MODULES):
+    thread = threading.Thread(target=_preload_quietly, args=(modules,), name="pdf-summary-preload", daemon=True)
+    thread.start()
+    return thread
+
+def _threadsafe_start_method():
+    import multiprocessing
+
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+def mp_context(start_method=None, threaded=None):
+    """ProcessPoolExecutor(mp_context=...)/Process에 쓸 컨텍스트 (start_method 기본값은 DEFAULT_START_METHOD).
+
+    threaded는 워커를 만들 때 부모에 다른 스레드가 돌고 있는지입니다. None이면 지금 스레드 수로 판단하고,
+    워커를 나중에 다른 스레드에서 다시 띄우는 곳(HTTP 서비스)은 True를 넘깁니다. "auto"이고 플랫폼
+    기본값이 fork일 때 threaded이면 fork 대신 forkserver(없으면 spawn)를 씁니다.
+    """
+    import multiprocessing
+
+    method = start_method or DEFAULT_START_METHOD
+    if method not in START_METHODS:
+        raise ValueError(f"start_method는 {START_METHODS} 중 하나여야 합니다: {method!r}")
+    if method == "auto":
+        method = multiprocessing.get_start_method()
+        if method == "fork" and (threading.active_count() > 1 if threaded is None else threaded):
+            method = _threadsafe_start_method()
+    ctx = multiprocessing.get_context(method)
+    if method == "fork":
+        preload()
+    elif method == "forkserver":
+        # fork 서버는 처음 워커를 만들 때 한 번 뜨고, 이후 워커는 모두 읽어 둔 상태에서 fork됨
+        ctx.set_forkserver_preload(["preload", *PRELOAD_MODULES, "pdf_summary_converter"])
+    return ctx
@@ -0,0 +1,402 @@
+"""파싱한 측정결과 보고서를 SQLite에 모아 두고 바로 조회하는 색인.
+
+보고서마다 회사/공사명, 공정, 단위작업, 근로자수, 근무형태, 분류된 유해인자를
+저장하므로 "이번 반기에 망간이나 용접흄이 나온 현장", "2조2교대 단위작업 전체"
+같은 질문을 PDF를 다시 파싱하지 않고 색인에서 바로 답합니다. 이미 넣은 파일은
+내용 해시(SHA-256)로 알아보고 건너뜁니다 (변환기 버전이 바뀌면 다시 넣음).
+
+    python report_index.py ingest reports/ --db index.sqlite3
+    python report_index.py query --factor 망간 --factor 용접흄 --since 2026-01-01
+    python report_index.py query --form 2조2교대 --units
+    python report_index.py stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from batch_convert import find_pdfs
+from job_model import CATEGORY_ORDER, Report
+from pdf_summary_converter import CONVERTER_VERSION, fix_console_encoding, open_pdf
+from preload import mp_context
+from result_cache import cached_extract
+
+DEFAULT_INDEX_PATH = os.environ.get("PDF_SUMMARY_INDEX_PATH", "report_index.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,        -- PDF 파일 내용 해시
+    path TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT '',
+    project TEXT NOT NULL DEFAULT '',
+    report_date TEXT,                   -- YYYY-MM-DD (PDF 작성일, 없으면 파일 수정일)
+    pages INTEGER,
+    converter_version TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS report_groups (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    group_id INTEGER NOT NULL REFERENCES report_groups(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    workers TEXT NOT NULL,              -- 원문 그대로 (예: "16(4)")
+    workers_count INTEGER               -- 앞의 숫자 (합계용), 없으면 NULL
+);
+CREATE TABLE IF NOT EXISTS unit_forms (
+    form TEXT NOT NULL,
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    PRIMARY KEY (form, unit_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS factors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS unit_factors (
+    factor_id INTEGER NOT NULL REFERENCES factors(id),
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    PRIMARY KEY (factor_id, unit_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_reports_date ON reports(report_date);
+CREATE INDEX IF NOT EXISTS idx_groups_report ON report_groups(report_id);
+CREATE INDEX IF NOT EXISTS idx_units_report ON units(report_id);
+CREATE INDEX IF NOT EXISTS idx_units_group ON units(group_id);
+CREATE INDEX IF NOT EXISTS idx_unit_forms_unit ON unit_forms(unit_id);
+CREATE INDEX IF NOT EXISTS idx_unit_factors_unit ON unit_factors(unit_id);
+"""
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _pdf_date(value):
+    # PDF 날짜 문자열 "D:YYYYMMDDHHmmSS..." -> "YYYY-MM-DD"
+    m = re.match(r"(?:D:)?(\d{4})(\d{2})(\d{2})", str(value or ""))
+    return f"{m.group(1)}-{m.group(2)}-{m.group(3)}" if m else None
+
+def report_date(metadata, pdf_path):
+    """보고서 날짜: PDF 문서 정보의 작성일(CreationDate), 없으면 수정일, 그것도 없으면 파일 수정일."""
+    for key in ("CreationDate", "ModDate"):
+        date = _pdf_date(metadata.get(key))
+        if date:
+            return date
+    return time.strftime("%Y-%m-%d", time.localtime(os.path.getmtime(pdf_path)))
+
+def _workers_count(workers):
+    m = re.match(r"\s*(\d+)", workers)
+    return int(m.group(1)) if m else None
+
+def parse_for_index(pdf_path, use_cache=True):
+    """(프로세스 풀 워커) PDF 하나를 파싱해 색인에 넣을 항목을 돌려줍니다.
+
+    report는 Report.to_bytes()로 압축해서 돌려줍니다. 결과 캐시(result_cache)를 거치므로
+    이미 변환한 적이 있는 PDF는 다시 파싱하지 않습니다. 페이지 수와 작성일은 변환하며 연
+    문서에서 함께 읽고, 그 값이 없는 이전 캐시 항목일 때만 문서 정보를 읽으러 다시 엽니다.
+    """
+    start = time.perf_counter()
+    entry = {}
+    try:
+        result = cached_extract(pdf_path, use_cache=use_cache)
+        metadata, pages = result.get("metadata"), result.get("pages")
+        if metadata is None or pages is None:
+            with open_pdf(pdf_path) as pdf:
+                metadata, pages = pdf.metadata, len(pdf.pages)
+        entry["pages"] = pages
+        entry["report_date"] = report_date(metadata, pdf_path)
+        entry["report"] = result["report"].to_bytes()
+        entry["status"] = "ok"
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["duration"] = round(time.perf_counter() - start, 3)
+    return entry
+
+class ReportIndex:
+    """보고서 색인 (SQLite). with 문으로 쓰거나 다 쓴 뒤 close()를 부릅니다."""
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_INDEX_PATH
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_report(self, sha256):
+        """같은 내용의 PDF가 현재 변환기 버전으로 이미 들어 있는지."""
+        row = self.conn.execute("SELECT converter_version FROM reports WHERE sha256 = ?", (sha256,)).fetchone()
+        return row is not None and row[0] == CONVERTER_VERSION
+
+    def add_report(self, report, sha256, path, pages=None, report_date=None):
+        """Report 하나를 넣습니다 (같은 해시의 이전 항목은 지우고 교체). 보고서 id를 돌려줍니다."""
+        conn = self.conn
+        with conn:
+            conn.execute("DELETE FROM reports WHERE sha256 = ?", (sha256,))
+            cur = conn.execute(
+                "INSERT INTO reports (sha256, path, company, project, report_date, pages, converter_version,"
+                " ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha256, path, report.company_info.get("name", ""), report.company_info.get("project", ""),
+                 report_date, pages, CONVERTER_VERSION, time.strftime("%Y-%m-%dT%H:%M:%S")))
+            report_id = cur.lastrowid
+
+            factor_ids = []
+            for name, category in zip(report.factor_names, report.factor_categories):
+                # 분류 규칙이 바뀌었으면 마지막으로 넣은 보고서의 분류로 갱신
+                conn.execute("INSERT INTO factors (name, category) VALUES (?, ?)"
+                             " ON CONFLICT(name) DO UPDATE SET category = excluded.category",
+                             (name, CATEGORY_ORDER[category]))
+                factor_ids.append(conn.execute("SELECT id FROM factors WHERE name = ?", (name,)).fetchone()[0])
+
+            for g_pos, group in enumerate(report.groups):
+                group_id = conn.execute("INSERT INTO report_groups (report_id, position, name) VALUES (?, ?, ?)",
+                                        (report_id, g_pos, group.name)).lastrowid
+                for u_pos, unit in enumerate(group.units):
+                    unit_id = conn.execute(
+                        "INSERT INTO units (report_id, group_id, position, name, workers, workers_count)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (report_id, group_id, u_pos, unit.name, unit.workers, _workers_count(unit.workers))).lastrowid
+                    conn.executemany("INSERT OR IGNORE INTO unit_forms (form, unit_id) VALUES (?, ?)",
+                                     [(form, unit_id) for form in unit.work_form])
+                    conn.executemany("INSERT OR IGNORE INTO unit_factors (factor_id, unit_id) VALUES (?, ?)",
+                                     [(factor_ids[fid], unit_id) for fid in unit.factors])
+        return report_id
+
+    def _match_factors(self, factors, category):
+        # 유해인자 이름 표는 작으므로(보고서 수와 무관) 부분 일치로 먼저 id를 고름
+        sql = "SELECT id, name FROM factors WHERE 1"
+        params = []
+        if factors:
+            sql += " AND (" + " OR ".join(["instr(name, ?) > 0"] * len(factors)) + ")"
+            params += list(factors)
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        return dict(self.conn.execute(sql, params).fetchall())
+
+    def _unit_filter(self, factors=None, category=None, work_form=None, company=None, since=None, until=None):
+        """units u / reports r 조인에 붙일 (WHERE 절, 인자, 일치한 유해인자 {id: 이름}). 일치하는 게 없으면 None."""
+        where, params = [], []
+        matched = None
+        if factors or category:
+            matched = self._match_factors(factors, category)
+            if not matched:
+                return None
+            where.append("u.id IN (SELECT unit_id FROM unit_factors WHERE factor_id IN (%s))"
+                         % ",".join("?" * len(matched)))
+            params += list(matched)
+        if work_form:
+            where.append("u.id IN (SELECT unit_id FROM unit_forms WHERE form = ?)")
+            params.append(work_form)
+        if company:
+            where.append("(instr(r.company, ?) > 0 OR instr(r.project, ?) > 0)")
+            params += [company, company]
+        if since:
+            where.append("r.report_date >= ?")
+            params.append(since)
+        if until:
+            where.append("r.report_date <= ?")
+            params.append(until)
+        return (" AND ".join(where) or "1"), params, matched
+
+    def find_units(self, factors=None, category=None, work_form=None, company=None, since=None, until=None,
+                   limit=None):
+        """조건에 맞는 단위작업 목록 (최근 보고서부터, 보고서 안에서는 출력 순서).
+
+        factors는 유해인자 이름(부분 일치, 여러 개면 하나라도 있으면), category는 CATEGORY_ORDER의
+        카테고리, work_form은 근무형태(정확히 일치), company는 회사/공사명(부분 일치),
+        since/until은 보고서 날짜 범위(YYYY-MM-DD, 양 끝 포함)입니다.
+        """
+        flt = self._unit_filter(factors, category, work_form, company, since, until)
+        if flt is None:
+            return []
+        where, params, _ = flt
+        sql = ("SELECT u.id, r.company, r.project, r.report_date, r.path, g.name, u.name, u.workers"
+               " FROM units u JOIN reports r ON r.id = u.report_id JOIN report_groups g ON g.id = u.group_id"
+               f" WHERE {where} ORDER BY r.report_date DESC, r.id, g.position, u.position")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.conn.execute(sql, params).fetchall()
+
+        forms, factor_names = {}, {}
+        ids = [row[0] for row in rows]
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for unit_id, form in self.conn.execute(
+                    f"SELECT unit_id, form FROM unit_forms WHERE unit_id IN ({marks})", chunk):
+                forms.setdefault(unit_id, []).append(form)
+            for unit_id, name in self.conn.execute(
+                    "SELECT uf.unit_id, f.name FROM unit_factors uf JOIN factors f ON f.id = uf.factor_id"
+                    f" WHERE uf.unit_id IN ({marks})", chunk):
+                factor_names.setdefault(unit_id, []).append(name)
+
+        return [{"company": company_, "project": project, "report_date": date, "path": path, "group": group,
+                 "unit": unit, "workers": workers, "work_form": sorted(forms.get(unit_id, [])),
+                 "factors": sorted(factor_names.get(unit_id, []))}
+                for unit_id, company_, project, date, path, group, unit, workers in rows]
+
+    def find_sites(self, factors=None, category=None, work_form=None, company=None, since=None, until=None):
+        """조건에 맞는 단위작업이 있는 보고서(현장) 목록과 현장별 단위작업 수/근로자 수 합계.
+
+        인자는 find_units()와 같습니다. 유해인자로 찾으면 현장마다 실제로 나온 유해인자 이름도 돌려줍니다.
+        """
+        flt = self._unit_filter(factors, category, work_form, company, since, until)
+        if flt is None:
+            return []
+        where, params, matched = flt
+        rows = self.conn.execute(
+            "SELECT r.id, r.company, r.project, r.report_date, r.path, COUNT(*), SUM(u.workers_count)"
+            f" FROM units u JOIN reports r ON r.id = u.report_id WHERE {where}"
+            " GROUP BY r.id ORDER BY r.report_date DESC, r.id", params).fetchall()
+
+        found = {}
+        if matched and rows:
+            report_ids = [row[0] for row in rows]
+            for report_id, factor_id in self.conn.execute(
+                    "SELECT DISTINCT u.report_id, uf.factor_id FROM unit_factors uf JOIN units u ON u.id = uf.unit_id"
+                    " WHERE uf.factor_id IN (%s) AND u.report_id IN (%s)"
+                    % (",".join("?" * len(matched)), ",".join("?" * len(report_ids))),
+                    list(matched) + report_ids):
+                found.setdefault(report_id, []).append(matched[factor_id])
+
+        return [{"company": company_, "project": project, "report_date": date, "path": path, "units": n_units,
+                 "workers": workers or 0, "factors": sorted(found.get(report_id, []))}
+                for report_id, company_, project, date, path, n_units, workers in rows]
+
+    def stats(self):
+        counts = {}
+        for table in ("reports", "report_groups", "units", "factors"):
+            counts[table] = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        counts["first_date"], counts["last_date"] = self.conn.execute(
+            "SELECT MIN(report_date), MAX(report_date) FROM reports").fetchone()
+        return counts
+
+def ingest(inputs, db_path=None, workers=None, use_cache=True, force=False, log=print):
+    """PDF들을 파싱해 색인에 넣고 요약 통계 dict를 돌려줍니다.
+
+    이미 색인에 들어 있는 내용은 건너뛰고(skipped), 이번 입력 안에서 내용이 같은 파일은
+    처음 것만 색인합니다(duplicates).
+    """
+    pdfs = find_pdfs(inputs)
+    stats = {"files": len(pdfs), "skipped": 0, "duplicates": 0, "ingested": 0, "failed": 0}
+    started = time.perf_counter()
+    with ReportIndex(db_path) as index:
+        todo = []
+        seen = set()
+        for pdf_path in pdfs:
+            sha256 = file_sha256(pdf_path)
+            if sha256 in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(sha256)
+            if not force and index.has_report(sha256):
+                stats["skipped"] += 1
+                continue
+            todo.append((pdf_path, sha256))
+        log(f"입력 {len(pdfs)}개 중 {stats['skipped']}개는 이미 색인됨, {stats['duplicates']}개는 입력 안에서 중복, "
+            f"{len(todo)}개 색인 시작")
+
+        if todo:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as executor:
+                futures = {executor.submit(parse_for_index, pdf_path, use_cache): (pdf_path, sha256)
+                           for pdf_path, sha256 in todo}
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    pdf_path, sha256 = futures[future]
+                    entry = future.result()
+                    if entry["status"] != "ok":
+                        stats["failed"] += 1
+                        log(f"[{done_count}/{len(todo)}] FAIL {pdf_path}: {entry['error']}")
+                        continue
+                    report = Report.from_bytes(entry["report"])
+                    index.add_report(report, sha256, pdf_path, entry["pages"], entry["report_date"])
+                    stats["ingested"] += 1
+                    log(f"[{done_count}/{len(todo)}] OK   {pdf_path} "
+                        f"({len(report.groups)}개 공정, {entry['duration']:.2f}s)")
+    stats["elapsed"] = round(time.perf_counter() - started, 3)
+    return stats
+
+def _print_rows(rows, columns):
+    for row in rows:
+        print(" | ".join(", ".join(v) if isinstance(v, list) else str(v) for v in (row[c] for c in columns)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="측정결과 보고서 색인 (SQLite)")
+    parser.add_argument("--db", default=None, help=f"색인 파일 (기본: {DEFAULT_INDEX_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="PDF를 파싱해 색인에 추가")
+    p_ingest.add_argument("inputs", nargs="+", help="PDF 파일, 폴더 또는 글롭 패턴")
+    p_ingest.add_argument("-j", "--workers", type=int, default=None, help="동시 파싱 프로세스 수 (기본: CPU 수)")
+    p_ingest.add_argument("--force", action="store_true", help="이미 색인된 파일도 다시 파싱")
+    p_ingest.add_argument("--no-cache", action="store_true", help="변환 결과 캐시를 읽지 않음")
+
+    p_query = sub.add_parser("query", help="색인 조회 (기본: 현장별 요약)")
+    p_query.add_argument("--factor", action="append", help="유해인자 이름 (부분 일치, 여러 번 지정하면 OR)")
+    p_query.add_argument("--category", choices=CATEGORY_ORDER, help="유해인자 카테고리")
+    p_query.add_argument("--form", help="근무형태 (예: 2조2교대)")
+    p_query.add_argument("--company", help="회사/공사명 (부분 일치)")
+    p_query.add_argument("--since", help="보고서 날짜 시작 (YYYY-MM-DD)")
+    p_query.add_argument("--until", help="보고서 날짜 끝 (YYYY-MM-DD)")
+    p_query.add_argument("--units", action="store_true", help="현장 요약 대신 단위작업 목록 출력")
+    p_query.add_argument("--limit", type=int, default=None, help="--units 출력 개수 제한")
+    p_query.add_argument("--json", action="store_true", help="JSON으로 출력")
+
+    sub.add_parser("stats", help="색인 통계")
+    args = parser.parse_args(argv)
+    fix_console_encoding()
+
+    if args.command == "ingest":
+        stats = ingest(args.inputs, args.db, workers=args.workers, use_cache=not args.no_cache, force=args.force)
+        print(f"색인 {stats['ingested']}개 / 실패 {stats['failed']}개 / 건너뜀 {stats['skipped']}개 "
+              f"/ 중복 {stats['duplicates']}개 (전체 {stats['files']}개), {stats['elapsed']:.2f}s")
+        return 1 if stats["failed"] else 0
+
+    with ReportIndex(args.db) as index:
+        if args.command == "stats":
+            print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+            return 0
+
+        start = time.perf_counter()
+        kwargs = dict(factors=args.factor, category=args.category, work_form=args.form, company=args.company,
+                      since=args.since, until=args.until)
+        if args.units:
+            rows = index.find_units(limit=args.limit, **kwargs)
+            columns = ("report_date", "company", "group", "unit", "workers", "work_form", "factors")
+        else:
+            rows = index.find_sites(**kwargs)
+            columns = ("report_date", "company", "project", "units", "workers", "factors")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        _print_rows(rows, columns)
+        print(f"{len(rows)}건 ({elapsed_ms:.1f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import weakref
+
+from job_model import Report
+from pdf_summary_converter import (CONVERTER_VERSION, TABLE_SETTINGS, build_report, iter_convert_pdf,
+                                   iter_extract_job_data, render_txt)
+
+# 캐시 위치/크기는 환경변수로 조정 가능
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PDF_SUMMARY_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf_summary_converter"),
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF_SUMMARY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+DEFAULT_PAGE_CACHE_DIR = os.environ.get("PDF_SUMMARY_PAGE_CACHE_DIR", os.path.join(DEFAULT_CACHE_DIR, "pages"))
+DEFAULT_PAGE_CACHE_MAX_BYTES = int(os.environ.get("PDF_SUMMARY_PAGE_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+_ENTRY_SUFFIX = ".json"
+# 이전 버전이 pickle로 저장한 항목. 읽지 않고 정리할 때 지움
+_LEGACY_SUFFIX = ".pkl"
+_BYTES_KEY = "$bytes"
+
+def _encode_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {_BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"캐시에 저장할 수 없는 값입니다: {type(value).__name__}")
+
+def _decode_object(obj):
+    if len(obj) == 1 and _BYTES_KEY in obj:
+        return base64.b64decode(obj[_BYTES_KEY], validate=True)
+    return obj
+
+def _dump_entry(entry, f):
+    f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=_encode_value).encode("utf-8"))
+
+def _read_entry(f):
+    entry = json.loads(f.read().decode("utf-8"), object_hook=_decode_object)
+    if not isinstance(entry, dict):
+        raise ValueError("캐시 항목은 dict여야 합니다")
+    return entry
+
+def pdf_digest(pdf_source):
+    """PDF 내용(바이트)과 변환기 버전으로 캐시 키(SHA-256)를 만듭니다.
+
+    pdf_source는 파일 경로, PDF 바이트 또는 파일 객체 (open_pdf와 같음).
+    """
+    h = hashlib.sha256()
+    h.update(f"pdf_summary_converter:{CONVERTER_VERSION}\0".encode("utf-8"))
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        h.update(pdf_source)
+    elif hasattr(pdf_source, "getbuffer"):
+        # BytesIO(Streamlit UploadedFile 포함)는 내부 버퍼를 복사 없이 해시
+        with pdf_source.getbuffer() as buf:
+            h.update(buf)
+    elif hasattr(pdf_source, "read"):
+        pdf_source.seek(0)
+        for chunk in iter(lambda: pdf_source.read(1024 * 1024), b""):
+            h.update(chunk)
+        pdf_source.seek(0)
+    else:
+        with open(pdf_source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+class ResultCache:
+    """변환 결과를 내용 주소(content hash) 기반으로 디스크에 저장하는 캐시.
+
+    항목 하나는 {"report"(Report.to_bytes()), "text"} dict를 JSON으로 저장한 파일이며
+    (bytes는 base64), 캐시 디렉터리를 여럿이 같이 써도 읽을 때 코드가 실행되지 않습니다.
+    임시 파일에 쓴 뒤 os.replace()로 교체하므로 여러 Streamlit 세션이 동시에 써도 반쯤 쓰인
+    파일을 읽지 않습니다. 전체 크기가 max_bytes를 넘으면
+    마지막 사용 시각(mtime)이 오래된 항목부터 지웁니다 (LRU).
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = _read_entry(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 손상된 항목은 미스로 처리하고 제거
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # LRU: 사용 시각 갱신
+        except OSError:
+            pass
+        return entry
+
+    def contains(self, key):
+        """항목을 읽지 않고 있는지만 확인합니다 (사용 시각은 갱신하지 않음)."""
+        return os.path.exists(self._path(key))
+
+    def put(self, key, entry):
+        self._write(key, entry)
+        self.evict()
+
+    def _write(self, key, entry):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=_ENTRY_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _dump_entry(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(_LEGACY_SUFFIX):
+                self._remove(os.path.join(self.cache_dir, name))
+                continue
+            if not name.endswith(_ENTRY_SUFFIX) or name.startswith(".tmp-"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # 다른 세션이 먼저 지운 경우
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((_ENTRY_SUFFIX, _LEGACY_SUFFIX)):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# 문서(PDFDocument)별 간접 객체 해시 메모 (글꼴처럼 여러 페이지가 공유하는 자원은 한 번만 해시)
+_object_digests = weakref.WeakKeyDictionary()
+
+def _object_digest(obj, memo):
+    from pdfminer.pdftypes import PDFObjRef, PDFStream  # 페이지를 연 뒤에만 불리므로 이미 읽혀 있음
+
+    if isinstance(obj, PDFObjRef):
+        digest = memo.get(obj.objid)
+        if digest is None:
+            memo[obj.objid] = b"ref:%d" % obj.objid  # 순환 참조 방지용 임시 값
+            digest = memo[obj.objid] = _object_digest(obj.resolve(), memo)
+        return digest
+    h = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        h.update(b"stream")
+        h.update(_object_digest(obj.attrs, memo))
+        h.update(obj.get_data())
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for k in sorted(obj, key=str):
+            h.update(str(k).encode("utf-8") + b"\0")
+            h.update(_object_digest(obj[k], memo))
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"list")
+        for item in obj:
+            h.update(_object_digest(item, memo))
+    else:
+        h.update(repr(obj).encode("utf-8"))
+    return h.digest()
+
+def page_fingerprint(page, extra=""):
+    """페이지의 표 추출 결과를 결정하는 내용의 해시 (PageCache 키).
+
+    콘텐츠 스트림, 페이지 크기/회전, 페이지가 참조하는 자원(글꼴의 ToUnicode/폭,
+    폼 XObject 등) 전체와 변환기 버전/표 설정을 넣으므로, 개정판 PDF라도 이 값이 같은
+    페이지는 extract_tables 결과가 같습니다. extra에는 사전 필터처럼 결과에 영향을
+    주는 옵션을 넣습니다.
+    """
+    memo = _object_digests.setdefault(page.pdf.doc, {})
+    h = hashlib.sha256()
+    h.update(f"pdf_summary_converter:{CONVERTER_VERSION}\0{TABLE_SETTINGS!r}\0{extra}\0".encode("utf-8"))
+    h.update(repr((page.mediabox, page.rotation)).encode("utf-8"))
+    for stream in page.page_obj.contents:
+        h.update(_object_digest(stream, memo))
+    h.update(_object_digest(page.page_obj.resources, memo))
+    return h.hexdigest()
+
+class PageCache(ResultCache):
+    """페이지 단위 표 추출 결과 캐시 (일부 페이지만 고친 개정판 보고서용).
+
+    키는 page_fingerprint(), 항목은 {"tables"} (사전 필터로 제외된 페이지는 None)입니다.
+    변환 함수에 page_cache=PageCache()를 넘기면 내용이 같은 페이지는 extract_tables를
+    건너뛰고 저장된 행을 같은 공정/단위작업 상태 머신에 다시 넣으므로 결과가 같습니다.
+    페이지마다 디렉터리 전체를 훑지 않도록 크기 정리(evict)는 변환이 끝날 때 한 번만 합니다.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_PAGE_CACHE_MAX_BYTES):
+        super().__init__(cache_dir or DEFAULT_PAGE_CACHE_DIR, max_bytes)
+
+    def page_key(self, page, page_filter):
+        return page_fingerprint(page, page_filter)
+
+    def put(self, key, entry):
+        self._write(key, entry)
+
+class MemoryPageCache:
+    """변환 작업 하나 동안만 쓰는 메모리 페이지 캐시 (PageCache와 같은 page_key/get/put/evict).
+
+    디스크 캐시를 쓰지 않는 강제 재변환에서도 빠른 미리보기(preview_pdf)가 추출한 페이지를 이어지는
+    전체 변환이 다시 쓰도록 작업마다 하나 만들어 두 변환에 같이 넘깁니다. 저장된 페이지는 한 번
+    꺼내면 지웁니다 (전체 변환은 페이지마다 한 번씩만 찾음).
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def page_key(self, page, page_filter):
+        return page_fingerprint(page, page_filter)
+
+    def get(self, key):
+        return self._entries.pop(key, None)
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+
+    def evict(self):
+        pass
+
+def _load_entry(entry):
+    # 캐시에는 압축된 보고서를 저장하므로 꺼낼 때 Report로 되돌림
+    return dict(entry, report=Report.from_bytes(entry["report"]))
+
+def _page_cache_for(page_cache, use_cache):
+    if page_cache is None and use_cache:
+        return PageCache()
+    return page_cache
+
+def cached_extract(pdf_path, cache=None, use_cache=True, workers=1, profile=None, low_memory=False,
+                   page_cache=None):
+    """캐시를 거쳐 {"report", "text", "pages", "metadata"} 결과를 돌려줍니다.
+
+    use_cache=False 이면 캐시를 읽지 않고 새로 변환한 뒤 결과로 캐시를 갱신합니다.
+    문서 캐시에 없으면 페이지 캐시(page_cache, 기본 PageCache())로 바뀌지 않은 페이지의
+    표 추출을 건너뜁니다 (use_cache=False 이고 page_cache를 넘기지 않으면 모든 페이지를 추출).
+    pdf_path에는 파일 경로 대신 PDF 바이트나 파일 객체도 넘길 수 있습니다.
+    profile은 새로 변환할 때만 채워집니다 (캐시 적중 시에는 비어 있음).
+    pages/metadata(문서 정보, iter_extract_job_data의 start 이벤트)는 변환하며 연 문서에서 읽은
+    값이라 따로 PDF를 열 필요가 없습니다. 이 값이 없던 이전 캐시 항목이나 iter_convert_pdf_cached()가
+    저장한 항목에는 빠져 있을 수 있습니다.
+    """
+    cache = cache or ResultCache()
+    key = pdf_digest(pdf_path)
+    if use_cache:
+        entry = cache.get(key)
+        if entry is not None:
+            return _load_entry(entry)
+
+    # extract_job_data_impl()과 같지만 start 이벤트의 페이지 수/문서 정보도 함께 저장
+    start = {"company_info": {}, "jobs": {}, "pages": 0, "metadata": {}}
+    for event in iter_extract_job_data(pdf_path, workers=workers, profile=profile, low_memory=low_memory,
+                                       page_cache=_page_cache_for(page_cache, use_cache)):
+        if event["type"] == "start":
+            start = event
+    if profile is None:
+        report = build_report(start["company_info"], start["jobs"])
+        text = render_txt(report)
+    else:
+        with profile.stage("postprocess"):
+            report = build_report(start["company_info"], start["jobs"])
+        with profile.stage("render"):
+            text = render_txt(report)
+    cache.put(key, {"report": report.to_bytes(), "text": text, "pages": start["pages"],
+                    "metadata": start["metadata"]})
+    return {"report": report, "text": text, "pages": start["pages"], "metadata": start["metadata"]}
+
+def convert_pdf_to_txt_cached(pdf_path, cache=None, use_cache=True, workers=1, profile=None, low_memory=False,
+                              page_cache=None):
+    return cached_extract(pdf_path, cache=cache, use_cache=use_cache, workers=workers, profile=profile,
+                          low_memory=low_memory, page_cache=page_cache)["text"]
+
+def iter_convert_pdf_cached(pdf_path, cache=None, use_cache=True, workers=1, profile=None, low_memory=False,
+                            page_cache=None):
+    """iter_convert_pdf()를 캐시와 함께 사용합니다.
+
+    캐시에 있으면 "done" 이벤트 하나만 돌려주고, 없으면 스트리밍 이벤트를 그대로
+    넘기면서 마지막 결과를 캐시에 저장합니다. page_cache는 cached_extract() 참고
+    (progress/done 이벤트의 reused_pages가 재사용한 페이지 수).
+    """
+    cache = cache or ResultCache()
+    key = pdf_digest(pdf_path)
+    if use_cache:
+        entry = cache.get(key)
+        if entry is not None:
+            yield dict(_load_entry(entry), type="done", cached=True)
+            return
+
+    for event in iter_convert_pdf(pdf_path, workers=workers, profile=profile, low_memory=low_memory,
+                                  page_cache=_page_cache_for(page_cache, use_cache)):
+        if event["type"] == "done":
+            cache.put(key, {
+                "report": event["report"].to_bytes(),
+                "text": event["text"],
+                "pages": event["pages"],
+            })
+        yield event
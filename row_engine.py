@@ -0,0 +1,219 @@
+from bisect import bisect_right
+from itertools import groupby
+from operator import itemgetter
+
+from pdfminer.layout import LTChar, LTContainer, LTCurve, LTLine, LTRect
+from pdfplumber import __version__ as PDFPLUMBER_VERSION, utils
+from pdfplumber.table import TableSettings, edges_to_intersections, merge_edges, words_to_edges_h
+from pdfplumber.utils.text import LIGATURES
+
+from table_layout import _complete_grid, extract_tables as extract_tables_with_layout
+
+# 행 엔진 (engine="rows")
+#
+# 측정결과 표는 세로선으로 열이 나뉘고 글자 줄마다 행이 하나씩 생기는 단순한 격자입니다.
+# page.extract_tables()는 이를 위해 페이지의 모든 객체를 dict로 바꾸고(page.chars/edges),
+# 단어 추출, 교차점 탐색, 셀 탐색, 셀별 글자 검색을 거칩니다. 이 엔진은 page.layout의
+# pdfminer 객체에서 글자와 세로선만 튜플로 꺼내 같은 기준(텍스트 줄의 top/bottom으로 가로선,
+# 세로선으로 열 경계)으로 행/열 경계를 구하고, 글자를 경계로 이분 탐색해 셀에 담습니다.
+# 경계 계산은 pdfplumber 함수(merge_edges, edges_to_intersections)를 그대로 쓰고, 페이지
+# 전체가 하나의 완전한 격자로 확인될 때만 이 경로를 쓰므로 결과는 extract_tables()와 같습니다.
+# 확인되지 않는 페이지(표가 여러 개, 병합 셀, 회전 글자 등)는 기존 엔진으로 처리합니다.
+#
+# 글자/선 추출은 pdfplumber 내부 구현(page.layout, LIGATURES 등)을 따라 한 것이라 pdfplumber
+# 버전이 바뀌면 결과가 달라질 수 있습니다. 확인한 버전(TESTED_PDFPLUMBER)이 아니면 모든 페이지를
+# 기존 엔진으로 처리합니다 (requirements.txt도 같은 범위로 고정).
+TESTED_PDFPLUMBER = "0.11."
+
+_CHAR_TEXT, _CHAR_X0, _CHAR_TOP, _CHAR_X1, _CHAR_BOTTOM, _CHAR_UPRIGHT = range(6)
+
+def _supported(settings, page):
+    return (PDFPLUMBER_VERSION.startswith(TESTED_PDFPLUMBER)
+            and settings.vertical_strategy == "lines" and settings.horizontal_strategy == "text"
+            and not settings.explicit_vertical_lines and not settings.explicit_horizontal_lines
+            and set(settings.text_settings) <= {"x_tolerance", "y_tolerance"}
+            and page.pdf.laparams is None and page.pdf.unicode_norm is None)
+
+def _page_objects(page, horizontal=False):
+    """page.layout에서 글자 튜플과 세로 테두리 edge를 page.chars/page.edges와 같은 좌표·순서로 꺼냅니다.
+
+    글자: (text, x0, top, x1, bottom, upright)
+    horizontal=True 이면 가로 테두리 edge도 함께 꺼냅니다 (tiered_engine의 괘선 단계용).
+    """
+    mb_x0, mb_top = page.mediabox[:2]
+    height = page.height
+    chars, line_edges, rect_edges, curve_edges = [], [], [], []
+
+    def walk(objs):
+        for obj in objs:
+            if isinstance(obj, LTContainer):
+                walk(obj._objs)
+            elif isinstance(obj, LTChar):
+                chars.append((obj.get_text(), obj.x0 + mb_x0, (height - obj.y1) + mb_top,
+                              obj.x1 + mb_x0, (height - obj.y0) + mb_top, obj.upright))
+            elif isinstance(obj, LTRect):
+                x0, x1 = obj.x0 + mb_x0, obj.x1 + mb_x0
+                top, bottom = (height - obj.y1) + mb_top, (height - obj.y0) + mb_top
+                if horizontal:
+                    for y in (top, bottom):
+                        rect_edges.append({"x0": x0, "x1": x1, "top": y, "bottom": y,
+                                           "width": obj.width, "orientation": "h"})
+                for x in (x0, x1):
+                    rect_edges.append({"x0": x, "x1": x, "top": top, "bottom": bottom,
+                                       "height": obj.height, "orientation": "v"})
+            elif isinstance(obj, LTLine):
+                top, bottom = (height - obj.y1) + mb_top, (height - obj.y0) + mb_top
+                if top != bottom:  # utils.line_to_edge: 수평이 아니면 모두 세로 edge
+                    line_edges.append({"x0": obj.x0 + mb_x0, "x1": obj.x1 + mb_x0, "top": top,
+                                       "bottom": bottom, "height": obj.height, "orientation": "v"})
+                elif horizontal:
+                    line_edges.append({"x0": obj.x0 + mb_x0, "x1": obj.x1 + mb_x0, "top": top,
+                                       "bottom": bottom, "width": obj.width, "orientation": "h"})
+            elif isinstance(obj, LTCurve):
+                pts = [(mb_x0 + x, mb_top + height - y) for x, y in obj.pts]
+                for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+                    if x0 == x1:
+                        curve_edges.append({"x0": x0, "x1": x1, "top": min(y0, y1), "bottom": max(y0, y1),
+                                            "height": abs(y0 - y1), "orientation": "v"})
+                    elif horizontal and y0 == y1:
+                        curve_edges.append({"x0": min(x0, x1), "x1": max(x0, x1), "top": y0, "bottom": y0,
+                                            "width": abs(x0 - x1), "orientation": "h"})
+
+    walk(page.layout._objs)
+    return chars, line_edges + rect_edges + curve_edges
+
+def _begins_new_word(prev, cur, upright, x_tol, y_tol):
+    # WordExtractor.char_begins_new_word (기본 방향: 가로 ltr, 회전 글자 ttb)
+    if upright:
+        return (cur[_CHAR_X0] < prev[_CHAR_X0] or cur[_CHAR_X0] > prev[_CHAR_X1] + x_tol
+                or abs(cur[_CHAR_TOP] - prev[_CHAR_TOP]) > y_tol)
+    return (cur[_CHAR_TOP] < prev[_CHAR_TOP] or cur[_CHAR_TOP] > prev[_CHAR_BOTTOM] + y_tol
+            or abs(cur[_CHAR_X0] - prev[_CHAR_X0]) > x_tol)
+
+def _merge_word(word_chars):
+    return ("".join(LIGATURES.get(c[_CHAR_TEXT], c[_CHAR_TEXT] or "") for c in word_chars),
+            min(c[_CHAR_X0] for c in word_chars), min(c[_CHAR_TOP] for c in word_chars),
+            max(c[_CHAR_X1] for c in word_chars), max(c[_CHAR_BOTTOM] for c in word_chars))
+
+def _extract_words(chars, x_tol, y_tol):
+    """utils.extract_words(chars)와 같은 단어 목록 [(text, x0, top, x1, bottom)] (기본 설정 기준)."""
+    words = []
+    for upright, run in groupby(chars, key=itemgetter(_CHAR_UPRIGHT)):
+        run = list(run)
+        if upright:
+            lines = utils.cluster_objects(run, itemgetter(_CHAR_TOP), y_tol)
+            sort_key = itemgetter(_CHAR_X0)
+        else:
+            lines = utils.cluster_objects(run, itemgetter(_CHAR_X0), x_tol)
+            sort_key = itemgetter(_CHAR_TOP, _CHAR_BOTTOM)
+        for line in lines:
+            line.sort(key=sort_key)
+            current = []
+            for char in line:
+                text = char[_CHAR_TEXT]
+                if text.isspace():
+                    if current:
+                        words.append(_merge_word(current))
+                    current = []
+                elif text == "":
+                    # split_at_punctuation=""일 때 빈 글자는 ("" in "") 단독 단어가 됨
+                    if current:
+                        words.append(_merge_word(current))
+                    words.append(_merge_word([char]))
+                    current = []
+                elif current and _begins_new_word(current[-1], char, upright, x_tol, y_tol):
+                    words.append(_merge_word(current))
+                    current = [char]
+                else:
+                    current.append(char)
+            if current:
+                words.append(_merge_word(current))
+    return words
+
+def _extract_text(chars, x_tol, y_tol):
+    """utils.extract_text(chars, x_tolerance=x_tol, y_tolerance=y_tol)와 같은 문자열."""
+    top = chars[0][_CHAR_TOP]
+    if all(c[_CHAR_TOP] == top and c[_CHAR_UPRIGHT] for c in chars) and all(c[_CHAR_TEXT] for c in chars):
+        # 셀 대부분: top이 같은 가로 글자 한 줄 -> 줄 묶기 없이 x0 순으로 단어만 나눔
+        words = []
+        current = []
+        prev = None
+        for char in sorted(chars, key=itemgetter(_CHAR_X0)):
+            text = char[_CHAR_TEXT]
+            if text.isspace():
+                if current:
+                    words.append("".join(current))
+                current = []
+            else:
+                if current and (char[_CHAR_X0] < prev[_CHAR_X0] or char[_CHAR_X0] > prev[_CHAR_X1] + x_tol):
+                    words.append("".join(current))
+                    current = []
+                current.append(LIGATURES.get(text, text))
+            prev = char
+        if current:
+            words.append("".join(current))
+        return " ".join(words)
+
+    words = _extract_words(chars, x_tol, y_tol)
+    if len(words) == 1:
+        return words[0][0]
+    lines = utils.cluster_objects(words, itemgetter(2), y_tol)
+    return "\n".join(" ".join(w[0] for w in line) for line in lines)
+
+def extract_grid_tables(page, settings):
+    """페이지가 하나의 완전한 격자 표(또는 표 없음)이면 page.extract_tables()와 같은 결과를, 아니면 None.
+
+    settings는 TableSettings.resolve()의 결과입니다.
+    """
+    if not _supported(settings, page):
+        return None
+    chars, edges = _page_objects(page)
+    x_tol = settings.text_settings["x_tolerance"]
+    y_tol = settings.text_settings["y_tolerance"]
+
+    # TableFinder.get_edges()와 같은 순서: 세로선(lines) + 텍스트 줄의 가로선(text) -> 병합 -> 길이 필터
+    v = utils.filter_edges(edges, "v", min_length=settings.edge_min_length_prefilter)
+    words = [{"x0": w[1], "top": w[2], "x1": w[3], "bottom": w[4]}
+             for w in _extract_words(chars, x_tol, y_tol)]
+    h = words_to_edges_h(words, word_threshold=settings.min_words_horizontal)
+    edges = merge_edges(v + h, snap_x_tolerance=settings.snap_x_tolerance,
+                        snap_y_tolerance=settings.snap_y_tolerance,
+                        join_x_tolerance=settings.join_x_tolerance,
+                        join_y_tolerance=settings.join_y_tolerance)
+    edges = utils.filter_edges(edges, min_length=settings.edge_min_length)
+    intersections = edges_to_intersections(edges, settings.intersection_x_tolerance,
+                                           settings.intersection_y_tolerance)
+    if not intersections:
+        return []
+
+    xs = sorted({p[0] for p in intersections})
+    ys = _complete_grid(intersections, xs)
+    if ys is None:
+        return None
+    n_cols, n_rows = len(xs) - 1, len(ys) - 1
+    if n_cols * n_rows <= 1:
+        return []  # 셀이 하나뿐인 영역은 표로 보지 않음 (cells_to_tables)
+
+    # table_layout._GridTable.extract()와 같은 셀 배정 (글자 중심점 기준)
+    buckets = [[[] for _ in range(n_cols)] for _ in range(n_rows)]
+    for char in chars:
+        r = bisect_right(ys, (char[_CHAR_TOP] + char[_CHAR_BOTTOM]) / 2) - 1
+        c = bisect_right(xs, (char[_CHAR_X0] + char[_CHAR_X1]) / 2) - 1
+        if 0 <= r < n_rows and 0 <= c < n_cols:
+            buckets[r][c].append(char)
+    return [[[_extract_text(cell, x_tol, y_tol) if cell else "" for cell in row] for row in buckets]]
+
+def extract_tables(page, table_settings, cache=None):
+    """행 엔진으로 page.extract_tables(table_settings)와 같은 결과를 계산합니다.
+
+    격자로 확인되지 않는 페이지는 기존 엔진(cache가 있으면 table_layout, 없으면
+    page.extract_tables)으로 처리합니다. 이때 page.layout은 이미 읽혀 있으므로 다시
+    해석하지 않습니다.
+    """
+    settings = TableSettings.resolve(table_settings)
+    tables = extract_grid_tables(page, settings)
+    if tables is not None:
+        return tables
+    if cache is not None:
+        return extract_tables_with_layout(page, table_settings, cache)
+    return page.extract_tables(table_settings=table_settings)
@@ -0,0 +1,155 @@
+from bisect import bisect_right
+
+from pdfplumber import utils
+from pdfplumber.table import (
+    Table,
+    TableFinder,
+    TableSettings,
+    cells_to_tables,
+    edges_to_intersections,
+    intersections_to_cells,
+)
+
+class TableLayoutCache:
+    """페이지 간에 공유되는 측정결과 표 레이아웃.
+
+    머리글이 있는 표를 처음 찾으면 열 경계 x 좌표, 표 영역, 머리글 텍스트를
+    기억합니다. 이후 페이지의 세로선이 같은 열 경계로 이루어진 완전한 격자이면
+    pdfplumber의 일반 셀 탐색(intersections_to_cells)과 셀별 글자 검색 대신
+    격자에서 바로 셀을 만들고 글자를 나눠 담습니다. 격자 검증을 통과한 경우에만
+    쓰므로 결과는 page.extract_tables()와 같습니다.
+    머리글이 다른 표가 나오면(서식이 바뀐 경우) 캐시를 버리고 다시 학습합니다.
+    """
+
+    def __init__(self):
+        self.xs = None          # 열 경계 x 좌표 (세로선 위치)
+        self.bbox = None        # 마지막으로 학습한 표 영역
+        self.header = None      # 머리글 행 (공백 제거한 셀 텍스트 튜플)
+        self.hits = 0           # 격자 경로로 처리한 페이지 수
+        self.misses = 0         # 일반 경로로 처리한 페이지 수
+        self.resets = 0         # 머리글 불일치로 캐시를 버린 횟수
+
+    def reset(self):
+        self.xs = None
+        self.bbox = None
+        self.header = None
+        self.resets += 1
+
+def _header_signature(rows):
+    """_parse_table과 같은 기준으로 처음 5행 안의 머리글 행을 찾습니다."""
+    for row in rows[:5]:
+        if not row: continue
+        row_str = "".join([str(x) for x in row if x])
+        if "공정" in row_str and ("작업" in row_str or "장소" in row_str):
+            return tuple(str(c).replace(" ", "").replace("\n", "") if c else "" for c in row)
+    return None
+
+def _complete_grid(intersections, xs):
+    """교차점이 xs 열 경계의 완전한 격자이고 이웃한 점끼리 모두 선으로 이어져 있으면 ys를 돌려줍니다.
+
+    이 조건에서는 intersections_to_cells()가 찾는 가장 작은 셀이 항상 이웃한
+    격자 칸이므로 결과가 같습니다. 조건이 하나라도 어긋나면 None.
+    """
+    if not intersections:
+        return None
+    point_xs = sorted({p[0] for p in intersections})
+    if point_xs != xs:
+        return None
+    ys = sorted({p[1] for p in intersections})
+    if len(intersections) != len(xs) * len(ys) or len(ys) < 2:
+        return None
+
+    def bboxes(point, kind):
+        return set(map(utils.obj_to_bbox, intersections[point][kind]))
+
+    for x in xs:
+        prev = None
+        for y in ys:
+            cur = bboxes((x, y), "v")
+            if prev is not None and not (prev & cur):
+                return None
+            prev = cur
+    for y in ys:
+        prev = None
+        for x in xs:
+            cur = bboxes((x, y), "h")
+            if prev is not None and not (prev & cur):
+                return None
+            prev = cur
+    return ys
+
+class _GridTable(Table):
+    """완전한 격자 표. 글자를 행/열 경계로 이분 탐색해 셀에 나눠 담습니다."""
+
+    def __init__(self, page, cells, xs, ys):
+        super().__init__(page, cells)
+        self.xs = xs
+        self.ys = ys
+
+    def extract(self, **kwargs):
+        if "layout" in kwargs:
+            return super().extract(**kwargs)
+
+        xs, ys = self.xs, self.ys
+        n_cols, n_rows = len(xs) - 1, len(ys) - 1
+        buckets = [[[] for _ in range(n_cols)] for _ in range(n_rows)]
+        for char in self.page.chars:
+            v_mid = (char["top"] + char["bottom"]) / 2
+            h_mid = (char["x0"] + char["x1"]) / 2
+            r = bisect_right(ys, v_mid) - 1
+            c = bisect_right(xs, h_mid) - 1
+            if 0 <= r < n_rows and 0 <= c < n_cols:
+                buckets[r][c].append(char)
+
+        return [
+            [utils.extract_text(cell_chars, **kwargs) if cell_chars else "" for cell_chars in row]
+            for row in buckets
+        ]
+
+class _LayoutTableFinder(TableFinder):
+    def __init__(self, page, settings, cache):
+        self.page = page
+        self.settings = settings
+        self.edges = self.get_edges()
+        self.intersections = edges_to_intersections(
+            self.edges,
+            self.settings.intersection_x_tolerance,
+            self.settings.intersection_y_tolerance,
+        )
+
+        ys = _complete_grid(self.intersections, cache.xs) if cache.xs else None
+        if ys is not None:
+            xs = cache.xs
+            # intersections_to_cells()와 같은 순서 (교차점을 (x, y)로 정렬한 순서)
+            self.cells = [(xs[i], ys[j], xs[i + 1], ys[j + 1])
+                          for i in range(len(xs) - 1) for j in range(len(ys) - 1)]
+            self.tables = [_GridTable(page, self.cells, xs, ys)] if len(self.cells) > 1 else []
+            self.grid = True
+        else:
+            self.cells = intersections_to_cells(self.intersections)
+            self.tables = [Table(page, group) for group in cells_to_tables(self.cells)]
+            self.grid = False
+
+def extract_tables(page, table_settings, cache):
+    """page.extract_tables(table_settings)와 같은 결과를 레이아웃 캐시를 이용해 계산합니다."""
+    settings = TableSettings.resolve(table_settings)
+    finder = _LayoutTableFinder(page, settings, cache)
+    tables = finder.tables
+    extracted = [table.extract(**(settings.text_settings or {})) for table in tables]
+
+    if finder.grid:
+        cache.hits += 1
+    else:
+        cache.misses += 1
+
+    header = _header_signature(extracted[0]) if len(extracted) == 1 else None
+    if header is not None and cache.header is not None and header != cache.header:
+        # 서식이 바뀜 -> 이전 레이아웃은 버리고 이 페이지에서 다시 학습
+        cache.reset()
+    if header is not None and cache.xs is None:
+        xs = sorted({c[0] for c in tables[0].cells} | {c[2] for c in tables[0].cells})
+        if _complete_grid(finder.intersections, xs) is not None:
+            cache.xs = xs
+            cache.bbox = tables[0].bbox
+            cache.header = header
+    return extracted
@@ -0,0 +1,39 @@
+"""테스트 공용 설정.
+
+저장소 루트와 benchmarks/(합성 보고서 생성기)를 import 경로에 넣고, 결과/페이지 캐시는
+사용자 캐시 폴더 대신 임시 폴더를 쓰게 합니다 (변환기 모듈을 import하기 전에 설정).
+합성 PDF는 세션마다 한 번 만듭니다.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+os.environ["PDF_SUMMARY_CACHE_DIR"] = tempfile.mkdtemp(prefix="pdf_summary_test_cache-")
+
+import synthetic_report  # noqa: E402
+from run_benchmarks import SCENARIOS  # noqa: E402
+
+# run_benchmarks.SCENARIOS를 테스트 시간에 맞게 줄인 것 (서식 종류는 그대로)
+TEST_SCENARIOS = {
+    "small": SCENARIOS["small"],
+    "medium": dict(SCENARIOS["medium"], pages=8, appendix_pages=3),
+    "wrapped": dict(SCENARIOS["wrapped"], pages=6),
+    "ruled": dict(SCENARIOS["ruled"], pages=6, appendix_pages=2),
+}
+
+@pytest.fixture(scope="session")
+def synthetic_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("synthetic")
+    for name, params in TEST_SCENARIOS.items():
+        synthetic_report.generate(str(path / f"{name}.pdf"), **params)
+    return path
+
+@pytest.fixture(params=sorted(TEST_SCENARIOS))
+def scenario_pdf(request, synthetic_dir):
+    """시나리오별 합성 보고서 경로 (str)."""
+    return str(synthetic_dir / f"{request.param}.pdf")
@@ -0,0 +1,58 @@
+"""기준(baseline) 커밋의 변환기로 합성 시나리오의 기대 출력(tests/golden/<시나리오>.txt)을 만듭니다.
+
+테스트가 비교하는 기준은 지금 트리의 변환기가 아니라 최적화 전 변환기의 출력입니다. 합성 보고서
+생성기(benchmarks/synthetic_report.py)나 tests/conftest.py의 TEST_SCENARIOS를 바꾸면 다시 만듭니다.
+
+    python tests/golden/make_golden.py            # 기본 기준: 저장소의 첫 커밋
+    python tests/golden/make_golden.py --rev <커밋>
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+
+GOLDEN_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(GOLDEN_DIR))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.dirname(GOLDEN_DIR))
+
+def _baseline_rev():
+    out = subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout.split()
+    return out[-1]
+
+def _load_converter(rev, workdir):
+    source = subprocess.run(["git", "show", f"{rev}:pdf_summary_converter.py"], cwd=ROOT, check=True,
+                            capture_output=True).stdout
+    path = os.path.join(workdir, "baseline_converter.py")
+    with open(path, "wb") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("baseline_converter", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기준 커밋 변환기로 기대 출력 만들기")
+    parser.add_argument("--rev", default=None, help="기준 커밋 (기본: 저장소의 첫 커밋)")
+    args = parser.parse_args(argv)
+
+    import synthetic_report
+    from conftest import TEST_SCENARIOS
+
+    rev = args.rev or _baseline_rev()
+    with tempfile.TemporaryDirectory() as workdir:
+        converter = _load_converter(rev, workdir)
+        for name, params in TEST_SCENARIOS.items():
+            pdf_path = os.path.join(workdir, f"{name}.pdf")
+            synthetic_report.generate(pdf_path, **params)
+            text = converter.convert_pdf_to_txt(pdf_path)
+            with open(os.path.join(GOLDEN_DIR, f"{name}.txt"), "wb") as f:
+                f.write(text.encode("utf-8"))
+            print(f"{name}: {len(text.splitlines())}줄 ({rev[:12]})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""회사명/공사명 추출 (_extract_company_info)의 머리말 영역 빠른 경로가 전체 텍스트 판단과 같은지."""
+import pdf_summary_converter as conv
+import synthetic_report
+
+PROJECT = "합성 국도 12공구 건설공사"
+
+def _full_text_company_info(pdf):
+    # 머리말 영역을 나누지 않는 원래 경로 (첫 페이지 전체 텍스트)
+    original = conv._header_text
+    conv._header_text = lambda page: None
+    try:
+        return conv._extract_company_info(pdf)
+    finally:
+        conv._header_text = original
+
+def _cover_pdf(path, project_label_y, project_value_y, info=None):
+    d = synthetic_report.SyntheticPdf()
+    d.info = info or {}
+    d.new_page()
+    d.text(60, 780, "작업환경측정 결과표", 16)
+    d.text(60, 740, "공장명 : (주)합성건설 ○ 사업장관리번호 : 123-45-67890")
+    d.text(60, project_label_y, "공 사 명 :")
+    d.text(60, project_value_y, PROJECT)
+    d.text(60, 300, "측정기간 : 2025.07.01 ~ 2025.07.03")
+    d.save(str(path))
+    return str(path)
+
+def test_project_value_below_header_region(tmp_path):
+    # "공 사 명 :"이 머리말 영역(위쪽 40%)의 마지막 줄이고 값은 경계 바로 아래 줄에 있는 표지
+    path = _cover_pdf(tmp_path / "split.pdf", project_label_y=500, project_value_y=484)
+    with conv.open_pdf(path) as pdf:
+        header_text = conv._header_text(pdf.pages[0])
+        assert header_text.endswith("공 사 명 :")
+        assert conv._PROJECT_PATTERN.search(header_text).group(1) == ""  # 머리말만 보면 공사명이 빈 값
+        info = conv._extract_company_info(pdf)
+        assert info == _full_text_company_info(pdf)
+    assert info["name"] == "(주)합성건설"
+    assert info["project"] == PROJECT
+
+def test_project_value_on_next_line_inside_header(tmp_path):
+    path = _cover_pdf(tmp_path / "next_line.pdf", project_label_y=720, project_value_y=704)
+    with conv.open_pdf(path) as pdf:
+        info = conv._extract_company_info(pdf)
+        assert info == _full_text_company_info(pdf)
+    assert info["project"] == PROJECT
+
+def test_header_region_matches_full_text(scenario_pdf):
+    with conv.open_pdf(scenario_pdf) as pdf:
+        assert conv._extract_company_info(pdf) == _full_text_company_info(pdf)
+
+def test_office_company_does_not_override_page(tmp_path):
+    # Word/HWP에서 만든 PDF의 /Company는 작성자(측정기관) 오피스 설정 값이라 표지와 다름
+    path = _cover_pdf(tmp_path / "office.pdf", project_label_y=720, project_value_y=704,
+                      info={"Company": "(주)측정기관", "Project": "측정 대행"})
+    with conv.open_pdf(path) as pdf:
+        assert pdf.metadata["Company"] == "(주)측정기관"
+        info = conv._extract_company_info(pdf)
+    assert info == {"name": "(주)합성건설", "project": PROJECT}
+
+def test_explicit_doc_info_keys(tmp_path):
+    path = _cover_pdf(tmp_path / "explicit.pdf", project_label_y=720, project_value_y=704,
+                      info={"공장명": "(주)명시건설", "공사명": "명시 공사"})
+    with conv.open_pdf(path) as pdf:
+        assert conv._extract_company_info(pdf) == {"name": "(주)명시건설", "project": "명시 공사"}
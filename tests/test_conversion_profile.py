@@ -0,0 +1,40 @@
+"""ConversionProfile의 cProfile 사용 (앱 작업 큐처럼 여러 스레드에서 동시에 측정)."""
+import threading
+
+import pdf_summary_converter as conv
+from conversion_profile import ConversionProfile
+
+class _BusyProfiler:
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+def test_concurrent_cprofile_runs(scenario_pdf):
+    reference = conv.convert_pdf_to_txt(scenario_pdf)
+    profiles = [ConversionProfile(cprofile=True) for _ in range(3)]
+    texts = [None] * len(profiles)
+
+    def run(i):
+        texts[i] = conv.convert_pdf_to_txt(scenario_pdf, profile=profiles[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(profiles))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert texts == [reference] * len(profiles)
+    for profile in profiles:
+        assert profile.cprofile_error is None
+        assert profile.top_functions()
+
+def test_busy_profiler_falls_back_to_stage_timings(scenario_pdf):
+    profile = ConversionProfile(cprofile=True)
+    profile._profiler = _BusyProfiler()
+    assert conv.convert_pdf_to_txt(scenario_pdf, profile=profile) == conv.convert_pdf_to_txt(scenario_pdf)
+    assert "already active" in profile.cprofile_error
+    assert profile.stats_bytes() is None
+    assert profile.stages["extract_tables"] > 0
+    # 잠금이 풀려 있어 다음 측정이 cProfile을 켤 수 있음
+    other = ConversionProfile(cprofile=True)
+    with other.stage("render"):
+        pass
+    assert other.cprofile_error is None
@@ -0,0 +1,121 @@
+"""결과가 같다고 약속한 변환 경로들이 최적화 전 변환기와 같은 텍스트를 만드는지.
+
+기준은 기준(baseline) 커밋의 변환기가 합성 보고서(benchmarks/synthetic_report.py) 시나리오마다 만든
+출력으로, tests/golden/<시나리오>.txt에 저장되어 있습니다 (tests/golden/make_golden.py로 다시 만듦).
+공용 파싱/출력 코드가 바뀌어도 양쪽이 같이 바뀌지 않도록 지금 트리의 출력과 비교하지 않습니다.
+"""
+import os
+
+import pytest
+
+import pdf_summary_converter as conv
+from bench_parse_table import legacy_parse_table, parse_all
+from conversion_profile import ConversionProfile
+from job_model import Report
+from result_cache import PageCache, ResultCache, cached_extract, iter_convert_pdf_cached
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+@pytest.fixture
+def reference(scenario_pdf):
+    """기준 커밋 변환기의 출력."""
+    name = os.path.splitext(os.path.basename(scenario_pdf))[0]
+    with open(os.path.join(GOLDEN_DIR, f"{name}.txt"), "rb") as f:
+        return f.read().decode("utf-8")
+
+def _tables(pdf_path):
+    tables = []
+    with conv.open_pdf(pdf_path) as pdf:
+        for page in pdf.pages:
+            tables.extend(t for t in page.extract_tables(table_settings=conv.TABLE_SETTINGS) if t)
+    return tables
+
+def test_default_matches_reference(scenario_pdf, reference):
+    # 사전 필터(page_filter="content")와 표 영역 재사용(REUSE_TABLE_LAYOUT)이 켜진 기본 경로
+    assert conv.convert_pdf_to_txt(scenario_pdf) == reference
+
+@pytest.mark.parametrize("reuse_layout", [True, False])
+@pytest.mark.parametrize("page_filter", conv.PAGE_FILTERS)
+@pytest.mark.parametrize("engine", conv.TABLE_ENGINES)
+def test_engine_and_filter(scenario_pdf, reference, monkeypatch, engine, page_filter, reuse_layout):
+    # "keywords" 필터와 "tiered" 엔진은 일반 보고서에서 같다고 보장하지 않지만 합성 서식에서는 같아야 함
+    monkeypatch.setattr(conv, "REUSE_TABLE_LAYOUT", reuse_layout)
+    assert conv.convert_pdf_to_txt(scenario_pdf, engine=engine, page_filter=page_filter) == reference
+
+def test_parallel_workers(scenario_pdf, reference):
+    assert conv.convert_pdf_to_txt(scenario_pdf, workers=2) == reference
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_low_memory_windows(scenario_pdf, reference, monkeypatch, workers):
+    # 창을 작게 잡아 문서를 여러 번 다시 열게 함
+    monkeypatch.setattr(conv, "LOW_MEMORY_WINDOW", 2)
+    assert conv.convert_pdf_to_txt(scenario_pdf, workers=workers, low_memory=True) == reference
+
+def test_bytes_input(scenario_pdf, reference):
+    with open(scenario_pdf, "rb") as f:
+        assert conv.convert_pdf_to_txt(f.read()) == reference
+
+def test_streaming_done_event(scenario_pdf, reference):
+    events = list(conv.iter_convert_pdf(scenario_pdf))
+    assert events[-1]["type"] == "done"
+    assert events[-1]["text"] == reference
+    # 머리말과 index별 마지막 공정 블록을 이어 붙이면 최종 텍스트와 같음 (앱의 진행 중 미리보기)
+    header = [e["text"] for e in events if e["type"] == "header"]
+    blocks = {e["index"]: e["text"] for e in events if e["type"] == "group"}
+    assert "\n".join(header + [blocks[i] for i in sorted(blocks)]) == reference
+
+def test_report_round_trip(scenario_pdf, reference):
+    report = conv.extract_job_data(scenario_pdf)
+    assert conv.render_txt(report) == reference
+    assert conv.render_txt(Report.from_bytes(report.to_bytes())) == reference
+
+def test_page_cache(scenario_pdf, reference, tmp_path):
+    page_cache = PageCache(str(tmp_path / "pages"))
+    assert conv.convert_pdf_to_txt(scenario_pdf, page_cache=page_cache) == reference  # 비어 있는 캐시에 저장
+    events = list(conv.iter_convert_pdf(scenario_pdf, page_cache=page_cache))
+    assert events[-1]["reused_pages"] == events[-1]["pages"]
+    assert events[-1]["text"] == reference
+
+def test_result_cache(scenario_pdf, reference, tmp_path):
+    cache = ResultCache(str(tmp_path / "results"))
+    first = cached_extract(scenario_pdf, cache=cache, page_cache=PageCache(str(tmp_path / "pages")))
+    second = cached_extract(scenario_pdf, cache=cache)
+    assert first["text"] == second["text"] == reference
+    assert conv.render_txt(second["report"]) == reference
+    done = list(iter_convert_pdf_cached(scenario_pdf, cache=cache))[-1]
+    assert done["cached"] and done["text"] == reference
+
+def test_columnar_row_filter_matches_state_machine(scenario_pdf):
+    # _filter_rows(열 단위 필터) + 상태 머신 vs 행마다 필터를 검사하던 이전 구현
+    tables = _tables(scenario_pdf)
+    assert tables
+    new_profile, old_profile = ConversionProfile(), ConversionProfile()
+    assert parse_all(conv._parse_table, tables, new_profile) == parse_all(legacy_parse_table, tables, old_profile)
+    assert new_profile.counters == old_profile.counters
+
+EDGE_TABLE = [
+    ["공정명", None, None, "단위작업장소", "유해인자", "근로자수", "근무형태"],
+    ["", "", "", "", "", "", ""],
+    [None, None, None, None, None, None, None],
+    ["용접", "", "", "아크용접", "용접흄 망간", "3(1)", "1조1교대"],
+    ["", "", "", "", "09:10 ~ 15:30", "", ""],
+    ["", "", "", "", "측정시각", "", ""],
+    ["", "", "", "", "시작 09:00", "", ""],
+    ["", "", "", "배관용접", "산화철분진", "", ""],
+    ["", "", "", "", "니켈", "12", "2조2교대"],
+    ["도장", "", "", "스프레이도장", "톨루엔 크실렌", "5(2)", "1조1교대"],
+    ["", "", "", "", "~ 17:00", "", ""],
+    ["", "", "", "1 2 3", "", "", ""],
+    ["비고", "", "", "", "", "", ""],
+    ["", "", "", "평균치", "초산에틸", "", ""],
+    ["", "", "", "측정방법", "", "", ""],
+    ["목공", "", "", "비계설치", "소음", "7", "3조3교대"],
+]
+
+@pytest.mark.parametrize("cut", [1, 4, 9, len(EDGE_TABLE)])
+def test_row_filter_edge_rows(cut):
+    # 빈 행, None 칸, 측정시각/비고/평균치 행, 숫자만 있는 단위작업 행
+    tables = [EDGE_TABLE[:cut], EDGE_TABLE[cut:] or [["", ""]], EDGE_TABLE[1:]]
+    new_profile, old_profile = ConversionProfile(), ConversionProfile()
+    assert parse_all(conv._parse_table, tables, new_profile) == parse_all(legacy_parse_table, tables, old_profile)
+    assert new_profile.counters == old_profile.counters
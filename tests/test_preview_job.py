@@ -0,0 +1,25 @@
+"""빠른 미리보기 뒤 전체 변환 (job_queue.convert_job)이 미리보기에서 추출한 페이지를 다시 쓰는지."""
+import pdf_summary_converter as conv
+import result_cache
+from job_queue import Job, convert_job
+
+def _run(data, **kwargs):
+    job = Job("test", "preview.pdf", convert_job, (data,), kwargs)
+    return convert_job(job, data, preview=True, **kwargs)
+
+def test_force_refresh_reuses_preview_pages(scenario_pdf):
+    with open(scenario_pdf, "rb") as f:
+        data = f.read()
+    quick = conv.preview_pdf(data)
+    result = _run(data, use_cache=False)
+    assert result["text"] == conv.convert_pdf_to_txt(data)
+    assert not result["cached"]
+    assert quick["parsed_pages"] > 0
+    # 사전 필터로 건너뛴 페이지 포함. 내용이 같은 뒤 페이지도 재사용하므로 더 많을 수 있음
+    assert result["reused_pages"] >= quick["parsed_pages"]
+
+def test_preview_evicts_page_cache(scenario_pdf, tmp_path, monkeypatch):
+    evicted = []
+    monkeypatch.setattr(result_cache.PageCache, "evict", lambda self: evicted.append(self.cache_dir))
+    conv.preview_pdf(scenario_pdf, max_table_pages=1, page_cache=result_cache.PageCache(str(tmp_path)))
+    assert evicted == [str(tmp_path)]
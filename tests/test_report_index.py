@@ -0,0 +1,20 @@
+"""report_index.ingest()의 건너뜀/중복 집계."""
+import shutil
+
+from report_index import ingest
+
+def test_duplicates_within_batch_are_not_reported_as_indexed(synthetic_dir, tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    shutil.copy(synthetic_dir / "small.pdf", inputs / "a.pdf")
+    shutil.copy(synthetic_dir / "small.pdf", inputs / "a_copy.pdf")
+    shutil.copy(synthetic_dir / "wrapped.pdf", inputs / "b.pdf")
+    db = str(tmp_path / "index.db")
+    logs = []
+
+    stats = ingest([str(inputs)], db, workers=1, log=logs.append)
+    assert (stats["ingested"], stats["skipped"], stats["duplicates"], stats["failed"]) == (2, 0, 1, 0)
+    assert "0개는 이미 색인됨, 1개는 입력 안에서 중복" in logs[0]
+
+    stats = ingest([str(inputs)], db, workers=1, log=logs.append)
+    assert (stats["ingested"], stats["skipped"], stats["duplicates"]) == (0, 2, 1)
@@ -0,0 +1,38 @@
+"""결과/페이지 캐시 항목 저장 형식."""
+import os
+import pickle
+
+from result_cache import PageCache, ResultCache
+
+class _Boom:
+    def __reduce__(self):
+        return (os.remove, ("unused",))
+
+def test_entry_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    entry = {"report": b"\x00\x01zlib", "text": "공정\n", "pages": 3, "metadata": {"Title": "보고서"}}
+    cache.put("k", entry)
+    assert cache.get("k") == entry
+
+def test_page_tables_round_trip(tmp_path):
+    cache = PageCache(str(tmp_path))
+    entry = {"tables": [[["공정명", None, "유해인자"], ["", "용접", "망간"]]], "tier": None}
+    cache.put("k", entry)
+    assert cache.get("k") == entry
+
+def test_undecodable_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    path = cache._path("k")
+    for data in (pickle.dumps(_Boom()), b"[1, 2]", b'{"report": {"$bytes": "%%%"}}'):
+        with open(path, "wb") as f:
+            f.write(data)
+        assert cache.get("k") is None
+        assert not os.path.exists(path)  # 손상된 항목은 지움
+
+def test_legacy_pickle_entries_are_not_loaded(tmp_path):
+    legacy = tmp_path / "k.pkl"
+    legacy.write_bytes(pickle.dumps(_Boom()))
+    cache = ResultCache(str(tmp_path))
+    assert cache.get("k") is None
+    cache.evict()
+    assert not legacy.exists()
@@ -0,0 +1,190 @@
+import re
+from bisect import bisect_right
+from itertools import groupby
+from operator import itemgetter
+
+from pdfplumber import utils
+from pdfplumber.table import TableSettings, cells_to_tables, edges_to_intersections, merge_edges
+
+from row_engine import _CHAR_BOTTOM, _CHAR_TOP, _CHAR_X0, _CHAR_X1, _extract_text, _page_objects
+from row_engine import extract_tables as extract_tables_with_rows
+
+# 단계별 표 추출 엔진 (engine="tiered")
+#
+# 행마다 가로 괘선이 그려진 서식은 텍스트 줄로 가로선을 만들 필요 없이 그려진 선만으로 격자를
+# 구할 수 있습니다. 이 엔진은 먼저 값싼 "ruled" 단계(가로/세로 모두 lines 전략, 단어 추출 없음)로
+# 표를 만들고 결과가 측정결과 표로 보이는지 확인합니다 (_ruled_tables_ok):
+#   - 표가 하나이고 열이 MIN_COLUMNS개 이상
+#   - 셀 안에 줄바꿈이 없음 (한 칸에 여러 줄이면 text 전략은 줄마다 행을 나눠 결과가 달라짐)
+#   - 처음 5행 안에 머리글이 있음 (_parse_table과 같은 기준, 이미 통과한 서식이면 생략)
+#   - 머리글/시각/꼬리말이 아닌 데이터 행이 하나 이상
+# 확인에 실패한 페이지만 "text" 단계(기존 text 전략, row_engine)로 다시 추출합니다.
+# 서식(페이지 크기와 세로선 위치)마다 어느 단계가 통과했는지 TierCache에 기억해 두고, ruled 단계가
+# 한 번도 통과하지 못한 채 RULED_MAX_FAILURES번 실패한 서식은 바로 text 단계로 보냅니다.
+# ruled 단계는 text 전략과 행 나누는 방식이 다르므로(빈 줄 행이 없고 병합 셀은 첫 행에만 값이 있음)
+# 출력이 기존 엔진과 항상 같다고 보장하지 않습니다. 그래서 기본 엔진이 아니라 선택 사항입니다.
+
+RULED_SETTINGS = {"vertical_strategy": "lines", "horizontal_strategy": "lines"}
+MIN_COLUMNS = 5
+RULED_MAX_FAILURES = 2
+TEMPLATE_LIMIT = 64
+
+TIERS = ("ruled", "text")
+
+_TIMESTAMP = re.compile(r"~\s*\d{1,2}:\d{2}|\d{1,2}:\d{2}\s*~")
+
+class TierCache:
+    """페이지 간에 공유되는 단계 선택 기록.
+
+    templates: 서식 키 -> {"ruled": 통과한 페이지 수, "text": ruled 단계가 실패한 페이지 수}
+    tier_pages: 단계 -> 그 단계의 결과를 쓴 페이지 수 (적중률 보고용)
+    layout: text 단계에서 row_engine에 넘기는 table_layout.TableLayoutCache (없으면 None)
+    """
+
+    def __init__(self, layout=None):
+        self.layout = layout
+        self.templates = {}
+        self.tier_pages = dict.fromkeys(TIERS, 0)
+
+    def should_try_ruled(self, key):
+        seen = self.templates.get(key)
+        return seen is None or seen["ruled"] > 0 or seen["text"] < RULED_MAX_FAILURES
+
+    def known_good(self, key):
+        seen = self.templates.get(key)
+        return seen is not None and seen["ruled"] > 0
+
+    def record(self, key, tier):
+        if key not in self.templates and len(self.templates) >= TEMPLATE_LIMIT:
+            self.templates.clear()  # 그래프처럼 페이지마다 선 위치가 다른 문서에서 무한히 늘지 않도록
+        self.templates.setdefault(key, dict.fromkeys(TIERS, 0))[tier] += 1
+
+def _template_key(page, edges):
+    xs = sorted({round(e["x0"]) for e in edges if e["orientation"] == "v"})
+    return (round(page.width), round(page.height), tuple(xs))
+
+def _intersections_to_cells(intersections):
+    """pdfplumber.table.intersections_to_cells()와 같은 셀 목록.
+
+    교차점마다 닿은 선의 bbox 집합을 한 번만 만들고, 같은 열/행의 점 목록을 미리 묶어
+    점 쌍마다 집합을 새로 만드는 원래 구현보다 빠르게 같은 순서로 찾습니다.
+    """
+    points = sorted(intersections)
+    v_sets = {p: set(map(utils.obj_to_bbox, intersections[p]["v"])) for p in points}
+    h_sets = {p: set(map(utils.obj_to_bbox, intersections[p]["h"])) for p in points}
+    same_x, same_y = {}, {}
+    for p in points:
+        same_x.setdefault(p[0], []).append(p)  # y 오름차순
+        same_y.setdefault(p[1], []).append(p)  # x 오름차순
+
+    cells = []
+    for pt in points:
+        below = [p for p in same_x[pt[0]] if p[1] > pt[1]]
+        right = [p for p in same_y[pt[1]] if p[0] > pt[0]]
+        found = None
+        for below_pt in below:
+            if not v_sets[pt] & v_sets[below_pt]:
+                continue
+            for right_pt in right:
+                if not h_sets[pt] & h_sets[right_pt]:
+                    continue
+                bottom_right = (right_pt[0], below_pt[1])
+                if (bottom_right in intersections and v_sets[bottom_right] & v_sets[right_pt]
+                        and h_sets[bottom_right] & h_sets[below_pt]):
+                    found = (pt[0], pt[1], bottom_right[0], bottom_right[1])
+                    break
+            if found:
+                break
+        if found:
+            cells.append(found)
+    return cells
+
+def extract_ruled_tables(settings, chars, edges):
+    """그려진 선만으로 찾은 표 목록 (pdfplumber lines/lines 전략과 같은 셀/행 구성).
+
+    chars/edges는 row_engine._page_objects(page, horizontal=True)의 결과입니다.
+    셀마다 전체 글자를 훑는 대신 셀 경계로 만든 작은 격자에 글자를 한 번만 나눠 담습니다.
+    """
+    edges = merge_edges(edges, snap_x_tolerance=settings.snap_x_tolerance,
+                        snap_y_tolerance=settings.snap_y_tolerance,
+                        join_x_tolerance=settings.join_x_tolerance,
+                        join_y_tolerance=settings.join_y_tolerance)
+    edges = utils.filter_edges(edges, min_length=settings.edge_min_length)
+    intersections = edges_to_intersections(edges, settings.intersection_x_tolerance,
+                                           settings.intersection_y_tolerance)
+    if not intersections:
+        return []
+    x_tol = settings.text_settings["x_tolerance"]
+    y_tol = settings.text_settings["y_tolerance"]
+
+    tables = []
+    for cells in cells_to_tables(_intersections_to_cells(intersections)):
+        xs = sorted({c[0] for c in cells} | {c[2] for c in cells})
+        ys = sorted({c[1] for c in cells} | {c[3] for c in cells})
+        buckets = {}
+        for i, char in enumerate(chars):
+            r = bisect_right(ys, (char[_CHAR_TOP] + char[_CHAR_BOTTOM]) / 2) - 1
+            c = bisect_right(xs, (char[_CHAR_X0] + char[_CHAR_X1]) / 2) - 1
+            if 0 <= r < len(ys) - 1 and 0 <= c < len(xs) - 1:
+                buckets.setdefault((r, c), []).append(i)
+
+        def cell_text(cell):
+            r0, r1 = ys.index(cell[1]), ys.index(cell[3])
+            c0, c1 = xs.index(cell[0]), xs.index(cell[2])
+            found = sorted(i for r in range(r0, r1) for c in range(c0, c1) for i in buckets.get((r, c), ()))
+            return _extract_text([chars[i] for i in found], x_tol, y_tol) if found else ""
+
+        # Table.rows와 같은 행 구성: 셀을 top으로 묶고, 병합으로 빠진 칸은 None
+        col_x0s = sorted({c[0] for c in cells})
+        rows = []
+        for _, row_cells in groupby(sorted(cells, key=itemgetter(1, 0)), itemgetter(1)):
+            by_x0 = {c[0]: c for c in row_cells}
+            rows.append([cell_text(by_x0[x]) if x in by_x0 else None for x in col_x0s])
+        tables.append(rows)
+    return tables
+
+def _is_header_row(row_str):
+    return "공정" in row_str and ("작업" in row_str or "장소" in row_str)
+
+def _ruled_tables_ok(tables, known_good):
+    """ruled 단계의 결과를 그대로 써도 되는지 확인합니다 (모듈 주석의 조건)."""
+    if len(tables) != 1:
+        return False
+    rows = tables[0]
+    if not rows or len(rows[0]) < MIN_COLUMNS:
+        return False
+    if any(cell and "\n" in cell for row in rows for cell in row):
+        return False
+    row_strs = ["".join(cell for cell in row if cell) for row in rows]
+    if not known_good and not any(_is_header_row(s) for s in row_strs[:5]):
+        return False
+    for s in row_strs:
+        if not s or _is_header_row(s) or "측정시각" in s:
+            continue
+        if _TIMESTAMP.search(s) or "종료" in s or "시작" in s:
+            continue
+        if "측정방법" in s or "비고" in s or "평균치" in s:
+            continue
+        return True
+    return False
+
+def extract_tables(page, table_settings, cache=None):
+    """(테이블 목록, 사용한 단계)를 돌려줍니다. 단계는 TIERS 중 하나입니다.
+
+    table_settings는 text 단계에서 쓰는 설정(변환기의 TABLE_SETTINGS)입니다.
+    cache(TierCache)를 넘기면 서식별 단계 기록과 단계별 페이지 수가 누적됩니다.
+    """
+    if cache is None:
+        cache = TierCache()
+    settings = TableSettings.resolve(RULED_SETTINGS)
+    chars, edges = _page_objects(page, horizontal=True)
+    key = _template_key(page, edges)
+    if cache.should_try_ruled(key):
+        tables = extract_ruled_tables(settings, chars, edges)
+        if _ruled_tables_ok(tables, cache.known_good(key)):
+            cache.record(key, "ruled")
+            cache.tier_pages["ruled"] += 1
+            return tables, "ruled"
+        cache.record(key, "text")
+    cache.tier_pages["text"] += 1
+    return extract_tables_with_rows(page, table_settings, cache.layout), "text"